@@ -0,0 +1,102 @@
+"""대시보드 모듈 import 시간 벤치마크 (python -X importtime 기반)
+
+사용 예:
+    python benchmarks/import_time.py                      # 5회 측정 후 요약 출력
+    python benchmarks/import_time.py --output import.json # 결과 저장
+    python benchmarks/import_time.py --baseline import.json --tolerance 0.15
+"""
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 첫 화면 렌더 전에 로드되면 안 되는 무거운 모듈
+# (plotly.graph_objects 는 streamlit 이 자체적으로 지연 로드 형태로 import 하므로 제외)
+LAZY_MODULES = ('plotly.express', 'plotly.subplots')
+
+_LINE_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$')
+
+
+def profile_once(module):
+    """1회 측정 — {'total_us', 'direct': {모듈: 누적us}, 'loaded': [로드된 모듈]}"""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT_DIR, capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"'{module}' import 실패:\n{proc.stderr[-2000:]}")
+
+    total_us = None
+    direct = {}
+    loaded = set()
+    for line in proc.stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), len(match.group(3)) - 1, match.group(4)
+        depth = indent // 2
+        loaded.add(name)
+        if depth == 0 and name == module:
+            total_us = cumulative
+        elif depth == 1:
+            direct[name] = direct.get(name, 0) + cumulative
+    return {'total_us': total_us or 0, 'direct': direct, 'loaded': sorted(loaded)}
+
+
+def profile(module, runs):
+    samples = [profile_once(module) for _ in range(runs)]
+    names = set().union(*(s['direct'] for s in samples))
+    return {
+        'module': module,
+        'runs': runs,
+        'total_ms': statistics.median(s['total_us'] for s in samples) / 1000,
+        'direct_ms': {n: statistics.median(s['direct'].get(n, 0) for s in samples) / 1000 for n in names},
+        'lazy_loaded': sorted({m for s in samples for m in s['loaded'] if m in LAZY_MODULES}),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 import 시간 측정")
+    parser.add_argument('--module', default='dash_v2')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', help="비교 기준 JSON 경로")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="기준 대비 허용 증가율")
+    args = parser.parse_args()
+
+    result = profile(args.module, args.runs)
+
+    print(f"[{result['module']}] import 중앙값 {result['total_ms']:.1f} ms ({result['runs']}회)")
+    for name, ms in sorted(result['direct_ms'].items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    status = 0
+    if result['lazy_loaded']:
+        print(f"✗ 지연 로드 대상이 import 시점에 로드됨: {', '.join(result['lazy_loaded'])}")
+        status = 1
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            base = json.load(f)
+        limit = base['total_ms'] * (1 + args.tolerance)
+        change = (result['total_ms'] / base['total_ms'] - 1) * 100 if base['total_ms'] else 0.0
+        print(f"기준 {base['total_ms']:.1f} ms 대비 {change:+.1f}%")
+        if result['total_ms'] > limit:
+            print(f"✗ 허용 범위({args.tolerance:.0%}) 초과")
+            status = 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""동시 사용자 부하 테스트 (실행 중인 Streamlit 서버에 웹소켓 세션으로 접속)
+
+각 가상 사용자는 브라우저와 같은 방식으로 /_stcore/stream 웹소켓에 접속해 위젯 상태를 보내고,
+메인 대시보드 → 국가별 경쟁력 → 기술분야별 분석 화면을 실제 사용 흐름대로 조작한다.
+동시 사용자 수(단계)별로 rerun 지연시간 p50/p95/p99, 처리량, 서버 CPU 사용률, RSS를 기록한다.
+(CPU/RSS는 /proc 를 읽으므로 Linux에서만 기록)
+
+사용 예:
+    python benchmarks/load_test.py                          # 서버 기동 후 1,2,4,8명 단계 측정
+    python benchmarks/load_test.py --levels 1,4,16 --rounds 2 --output load.json
+    python benchmarks/load_test.py --baseline load.json --tolerance 0.2
+    python benchmarks/load_test.py --url http://localhost:8501 --pid 12345   # 이미 실행 중인 서버
+"""
+import os
+import sys
+import json
+import time
+import socket
+import random
+import asyncio
+import argparse
+import threading
+import tempfile
+import subprocess
+import statistics
+import urllib.request
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT_DIR, 'dash_v2.py')
+
+PAGE_SELECT_LABEL = "분석 유형을 선택하세요:"
+PAGES = ["🏠 메인 대시보드", "🌏 국가별 경쟁력", "🔬 기술분야별 분석"]
+SCOPES = ['전체', '감축기술', '적응기술']
+COUNTRIES = ['한국', '중국', '일본', '미국', 'EU']
+
+
+def session_steps(rng):
+    """가상 사용자 1명의 조작 순서 — [(설명, 위젯 key 또는 라벨, 값 선택 함수)], 조작마다 1회 rerun"""
+    def one_of(values=None):
+        return lambda options: rng.choice(values or options)
+
+    def some(k):
+        return lambda options: rng.sample(options, min(k, len(options)))
+
+    return [
+        ("메인: 범위", 'scope_v2', one_of(SCOPES)),
+        ("메인: 범위", 'scope_v2', one_of(SCOPES)),
+        ("국가별 경쟁력 이동", PAGE_SELECT_LABEL, one_of([PAGES[1]])),
+        ("국가별: 범위", 'scope_country_competition', one_of(SCOPES)),
+        ("국가별: 상위/하위 국가", 'topbottom_country', one_of(COUNTRIES)),
+        ("국가별: 분석 국가", 'prof_country_only', one_of(COUNTRIES)),
+        ("국가별: 비교 국가", 'cmp_countries_for_detail', some(rng.randint(2, 4))),
+        ("국가별: 레이더 중분류", 'radar_mid_single', one_of()),
+        ("기술분야별 이동", PAGE_SELECT_LABEL, one_of([PAGES[2]])),
+        ("기술분야별: 중분류", 'category_select_v2', one_of()),
+        ("기술분야별: 중분류", 'category_select_v2', one_of()),
+        ("메인 복귀", PAGE_SELECT_LABEL, one_of([PAGES[0]])),
+    ]
+
+
+class StreamlitSession:
+    """브라우저 1개에 해당하는 최소 웹소켓 클라이언트 (위젯 상태 유지 · rerun 요청)"""
+
+    def __init__(self, ws_url, timeout):
+        self.ws_url = ws_url
+        self.timeout = timeout
+        self.ws = None
+        self.page_script_hash = ''
+        self.widgets = {}   # 위젯 id → (종류, 라벨, 옵션)
+        self.states = {}    # 위젯 id → WidgetState
+
+    async def connect(self):
+        import websockets
+        self.ws = await websockets.connect(self.ws_url, subprotocols=['streamlit'], max_size=None,
+                                           open_timeout=self.timeout)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def find(self, target):
+        """위젯 key(id 접미사) 또는 라벨로 현재 화면의 위젯 찾기"""
+        for widget_id, (kind, label, options) in self.widgets.items():
+            if widget_id.endswith(f'-{target}') or label == target:
+                return widget_id, kind, options
+        raise KeyError(target)
+
+    def set_value(self, widget_id, kind, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        state = WidgetState(id=widget_id)
+        if kind == 'multiselect':
+            state.string_array_value.data.extend(value)
+        else:
+            state.string_value = value
+        self.states[widget_id] = state
+
+    async def rerun(self):
+        """현재 위젯 상태로 rerun 요청 → 스크립트 종료까지 (지연 ms, 예외 메시지 목록)"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ''
+        msg.rerun_script.page_script_hash = self.page_script_hash
+        msg.rerun_script.widget_states.widgets.extend(self.states.values())
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        widgets, exceptions = {}, []
+        while True:
+            fwd = ForwardMsg.FromString(await asyncio.wait_for(self.ws.recv(), timeout=self.timeout))
+            kind = fwd.WhichOneof('type')
+            if kind == 'new_session':
+                self.page_script_hash = self.page_script_hash or fwd.new_session.main_script_hash
+            elif kind == 'delta' and fwd.delta.WhichOneof('type') == 'new_element':
+                element = fwd.delta.new_element
+                name = element.WhichOneof('type')
+                if name == 'exception':
+                    exceptions.append(element.exception.message)
+                    continue
+                proto = getattr(element, name) if name else None
+                widget_id = getattr(proto, 'id', '') if proto is not None else ''
+                if widget_id:
+                    widgets[widget_id] = (name, getattr(proto, 'label', ''), list(getattr(proto, 'options', [])))
+            elif kind == 'script_finished':
+                if fwd.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                break
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        # 화면에서 사라진 위젯 상태는 버림 (브라우저와 동일)
+        self.widgets = widgets
+        self.states = {wid: state for wid, state in self.states.items() if wid in widgets}
+        return elapsed_ms, exceptions
+
+
+async def run_session(session_id, ws_url, rounds, think_ms, timeout, latencies, errors, seed):
+    """세션 1개 실행 — 각 rerun 지연시간(ms)을 latencies 에 추가"""
+    rng = random.Random(seed * 1000 + session_id)
+    session = StreamlitSession(ws_url, timeout)
+    try:
+        await session.connect()
+        elapsed, exceptions = await session.rerun()
+        latencies.append(('첫 화면', elapsed))
+        errors.extend(f"[{session_id}] 첫 화면: {e}" for e in exceptions)
+        for _ in range(rounds):
+            for label, target, choose in session_steps(rng):
+                if think_ms:
+                    await asyncio.sleep(rng.uniform(0.5, 1.5) * think_ms / 1000)
+                try:
+                    widget_id, kind, options = session.find(target)
+                except KeyError:
+                    errors.append(f"[{session_id}] {label}: 위젯 '{target}' 없음")
+                    break
+                session.set_value(widget_id, kind, choose(options))
+                elapsed, exceptions = await session.rerun()
+                latencies.append((label, elapsed))
+                errors.extend(f"[{session_id}] {label}: {e}" for e in exceptions)
+    except Exception as e:
+        errors.append(f"[{session_id}] {type(e).__name__}: {e}")
+    finally:
+        await session.close()
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def read_process_usage(pid):
+    """(누적 CPU 초, RSS 바이트) — /proc 미지원 환경은 (None, None)"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            fields = f.read().rsplit(')', 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+        with open(f'/proc/{pid}/statm') as f:
+            rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        return cpu, rss
+    except (OSError, ValueError, IndexError, TypeError):
+        return None, None
+
+
+class ResourceSampler(threading.Thread):
+    """측정 구간의 서버 프로세스 최대 RSS 샘플링"""
+
+    def __init__(self, pid, interval=0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            _, rss = read_process_usage(self.pid)
+            if rss is not None:
+                self.peak_rss = max(self.peak_rss or 0, rss)
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def run_level(ws_url, pid, users, rounds, think_ms, timeout, seed):
+    latencies, errors = [], []
+    sampler = ResourceSampler(pid)
+    sampler.start()
+    cpu_start, _ = read_process_usage(pid)
+    wall_start = time.perf_counter()
+
+    async def run_all():
+        await asyncio.gather(*(run_session(i, ws_url, rounds, think_ms, timeout, latencies, errors, seed)
+                               for i in range(users)))
+    asyncio.run(run_all())
+
+    wall = time.perf_counter() - wall_start
+    cpu_end, _ = read_process_usage(pid)
+    sampler.stop()
+
+    reruns = [ms for label, ms in latencies if label != '첫 화면']
+    first = [ms for label, ms in latencies if label == '첫 화면']
+    by_step = {}
+    for label, ms in latencies:
+        by_step.setdefault(label, []).append(ms)
+    return {
+        'users': users,
+        'reruns': len(reruns),
+        'errors': len(errors),
+        'error_samples': errors[:5],
+        'wall_s': wall,
+        'throughput_rps': len(latencies) / wall if wall else 0.0,
+        'p50_ms': _percentile(reruns, 50),
+        'p95_ms': _percentile(reruns, 95),
+        'p99_ms': _percentile(reruns, 99),
+        'first_render_p50_ms': statistics.median(first) if first else None,
+        'cpu_percent': (cpu_end - cpu_start) / wall * 100 if None not in (cpu_start, cpu_end) and wall else None,
+        'peak_rss_mb': sampler.peak_rss / 1024 / 1024 if sampler.peak_rss else None,
+        'step_p95_ms': {label: _percentile(v, 95) for label, v in by_step.items()},
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _log_tail(path, limit=2000):
+    try:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            return f.read()[-limit:]
+    except OSError:
+        return ''
+
+
+def start_server(port, startup_timeout, log_path):
+    """dash_v2.py 를 headless Streamlit 서버로 기동하고 health 응답까지 대기
+
+    서버 로그(stdout/stderr)는 log_path 파일로 보냄 — 파이프로 받으면 경고 · 워밍업 로그가 쌓여
+    버퍼가 차는 순간 서버가 쓰기에서 멈춤.
+    """
+    with open(log_path, 'w', encoding='utf-8') as log:
+        proc = subprocess.Popen(
+            [sys.executable, '-m', 'streamlit', 'run', APP_PATH, '--server.headless', 'true',
+             '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+            cwd=ROOT_DIR, stdout=log, stderr=subprocess.STDOUT
+        )
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"서버 기동 실패 (로그: {log_path}):\n{_log_tail(log_path)}")
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health', timeout=1) as resp:
+                if resp.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.3)
+    proc.terminate()
+    raise RuntimeError(f"서버가 {startup_timeout:.0f}초 안에 응답하지 않았습니다 (로그: {log_path}):\n"
+                       f"{_log_tail(log_path)}")
+
+
+def _fmt(value, unit):
+    return f"{value:>6.0f}{unit}" if value is not None else f"{'–':>6}{unit}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대시보드 동시 사용자 부하 테스트")
+    parser.add_argument('--levels', default='1,2,4,8', help="동시 사용자 수 단계 (쉼표 구분)")
+    parser.add_argument('--rounds', type=int, default=1, help="세션당 조작 시나리오 반복 횟수")
+    parser.add_argument('--think-ms', type=float, default=300.0, help="조작 간 평균 대기(ms)")
+    parser.add_argument('--timeout', type=float, default=120.0, help="rerun 1회 제한 시간(초)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help="이미 실행 중인 서버 주소 (미지정 시 dash_v2.py 서버를 직접 기동)")
+    parser.add_argument('--pid', type=int, help="--url 서버의 프로세스 ID (CPU/RSS 기록용)")
+    parser.add_argument('--server-log', help="직접 기동한 서버의 로그 파일 경로 (미지정 시 임시 파일)")
+    parser.add_argument('--no-warmup', action='store_true', help="측정 전 예열 세션 생략 (콜드 캐시 측정)")
+    parser.add_argument('--output', help="결과 JSON 저장 경로")
+    parser.add_argument('--baseline', help="비교 기준 JSON 경로")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="기준 대비 p95 허용 증가율")
+    args = parser.parse_args()
+
+    levels = [int(v) for v in args.levels.split(',') if v.strip()]
+    server = None
+    if args.url:
+        base_url, pid = args.url.rstrip('/'), args.pid
+    else:
+        port = _free_port()
+        log_path = args.server_log or os.path.join(tempfile.gettempdir(), f'load_test_server_{port}.log')
+        server = start_server(port, args.timeout, log_path)
+        base_url, pid = f'http://127.0.0.1:{port}', server.pid
+        print(f"서버 로그: {log_path}")
+    ws_url = base_url.replace('https://', 'wss://').replace('http://', 'ws://') + '/_stcore/stream'
+
+    results = []
+    try:
+        if not args.no_warmup:
+            print("예열 세션 실행 중...")
+            run_level(ws_url, pid, 1, 1, 0, args.timeout, args.seed)
+
+        print(f"{'사용자':>6} {'rerun':>6} {'오류':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'처리량':>8} {'CPU':>7} {'RSS':>8}")
+        for users in levels:
+            r = run_level(ws_url, pid, users, args.rounds, args.think_ms, args.timeout, args.seed)
+            results.append(r)
+            print(f"{r['users']:>6} {r['reruns']:>6} {r['errors']:>4} {_fmt(r['p50_ms'], 'ms')} "
+                  f"{_fmt(r['p95_ms'], 'ms')} {_fmt(r['p99_ms'], 'ms')} {r['throughput_rps']:>6.1f}/s "
+                  f"{_fmt(r['cpu_percent'], '%')} {_fmt(r['peak_rss_mb'], 'MB')}")
+            for sample in r['error_samples']:
+                print(f"    ✗ {sample}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report = {
+        'app': os.path.basename(APP_PATH),
+        'levels': results,
+        'rounds': args.rounds,
+        'think_ms': args.think_ms,
+        'cpu_count': os.cpu_count(),
+        'python': sys.version.split()[0],
+    }
+
+    status = 1 if any(r['errors'] for r in results) else 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            base = {r['users']: r for r in json.load(f)['levels']}
+        for r in results:
+            ref = base.get(r['users'])
+            if not ref or not ref.get('p95_ms') or r['p95_ms'] is None:
+                continue
+            change = (r['p95_ms'] / ref['p95_ms'] - 1) * 100
+            print(f"  {r['users']}명: p95 기준 {ref['p95_ms']:.0f}ms 대비 {change:+.1f}%")
+            if r['p95_ms'] > ref['p95_ms'] * (1 + args.tolerance):
+                print(f"  ✗ {r['users']}명 p95 허용 범위({args.tolerance:.0%}) 초과")
+                status = 1
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
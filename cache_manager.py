@@ -0,0 +1,200 @@
+import os
+import sys
+import time
+import pickle
+import threading
+import functools
+from collections import OrderedDict
+
+MB = 1024 * 1024
+
+# 이름 → BoundedCache (사이드바 진단 화면에서 조회)
+CACHE_REGISTRY = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 크기(바이트)"""
+    if value is None:
+        return 0
+    if hasattr(value, 'memory_usage') and hasattr(value, 'columns'):  # DataFrame
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, 'memory_usage') and hasattr(value, 'index'):  # Series
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, 'nbytes'):  # numpy 배열
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class BoundedCache:
+    """항목 수/바이트 한도를 갖는 LRU 캐시 (스레드 안전, 적중/미스/축출 카운터 포함)"""
+
+    def __init__(self, name, max_entries=None, max_bytes=None, ttl=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key → (value, size, stored_at)
+        self._lock = threading.RLock()
+        self._inflight = {}
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.monotonic() - stored_at > self.ttl
+
+    def _drop(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.current_bytes -= size
+
+    def get(self, key):
+        """(적중 여부, 값) 반환 — 적중 시 LRU 순서 갱신"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[2]):
+                self._drop(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def peek(self, key):
+        """카운터/LRU 순서 변경 없이 조회"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[2]):
+                return False, None
+            return True, entry[0]
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            # 단일 항목이 예산을 넘으면 저장하지 않음 (다른 항목 전부 축출 방지)
+            if self.max_bytes is not None and size > self.max_bytes:
+                self.evictions += 1
+                return
+            self._entries[key] = (value, size, time.monotonic())
+            self.current_bytes += size
+            while self._entries and (
+                    (self.max_entries is not None and len(self._entries) > self.max_entries) or
+                    (self.max_bytes is not None and self.current_bytes > self.max_bytes)):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def key_lock(self, key):
+        """같은 키의 동시 계산을 1회로 묶기 위한 키별 잠금"""
+        with self._lock:
+            lock = self._inflight.get(key)
+            if lock is None:
+                lock = self._inflight[key] = threading.Lock()
+            return lock
+
+    def release_key(self, key):
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'cache': self.name,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else None,
+            }
+
+
+def get_cache(name, max_entries=None, max_bytes=None, ttl=None):
+    """이름으로 캐시 조회 (없으면 생성) — 여러 함수가 같은 예산을 공유할 수 있음"""
+    with _REGISTRY_LOCK:
+        cache = CACHE_REGISTRY.get(name)
+        if cache is None:
+            cache = CACHE_REGISTRY[name] = BoundedCache(name, max_entries, max_bytes, ttl)
+        return cache
+
+
+def bounded_cache(name, max_entries=None, max_bytes=None, ttl=None):
+    """함수 결과를 이름 붙은 BoundedCache에 저장하는 데코레이터
+
+    인자는 해시 가능해야 하며, 반환값은 복사 없이 공유되므로 호출 측에서 수정하지 않는다.
+    """
+    cache = get_cache(name, max_entries, max_bytes, ttl)
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (func.__qualname__, args, tuple(sorted(kwargs.items())))
+            hit, value = cache.get(key)
+            if hit:
+                return value
+            with cache.key_lock(key):
+                # 대기 중 다른 스레드가 계산을 마쳤으면 그 결과 사용
+                done, value = cache.peek(key)
+                if done:
+                    return value
+                try:
+                    value = func(*args, **kwargs)
+                    cache.put(key, value)
+                finally:
+                    cache.release_key(key)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def cache_stats():
+    """전체 캐시 통계 목록 (이름순)"""
+    with _REGISTRY_LOCK:
+        caches = list(CACHE_REGISTRY.values())
+    return [cache.stats() for cache in sorted(caches, key=lambda c: c.name)]
+
+
+def clear_all_caches():
+    with _REGISTRY_LOCK:
+        caches = list(CACHE_REGISTRY.values())
+    for cache in caches:
+        cache.clear()
+
+
+def process_rss_bytes():
+    """현재 프로세스 RSS(바이트) — Linux는 /proc, 그 외는 최대 RSS로 대체"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except Exception:
+        return None
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from ingest import COUNTRY_CODES, SCOPE_TYPES
+
+# ===== 연구개발 역량 종합지수 (기초·응용 연구역량 가중 평균) =====
+# 연구역량(점)은 0~100 척도 — 종합지수도 같은 척도, 상대지수는 세부기술별 최고국 = 100
+CAPACITY_WEIGHTS = {'basic_research': 0.5, 'applied_research': 0.5}
+
+
+def capacity_columns(code):
+    return f'{code}_capacity', f'{code}_capacity_rel'
+
+
+def _composite(df):
+    """(행, 국가) 종합지수 배열 — 한쪽 역량만 있으면 있는 쪽 가중치로 재정규화"""
+    weights = np.array(list(CAPACITY_WEIGHTS.values()))
+    scores = np.stack([df[[f'{code}_{metric}' for metric in CAPACITY_WEIGHTS]].to_numpy(dtype='float64')
+                       for code in COUNTRY_CODES], axis=1)      # (행, 국가, 지표)
+    valid = ~np.isnan(scores)
+    weight_sum = (valid * weights).sum(axis=2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, scores, 0.0).dot(weights) / np.where(weight_sum > 0, weight_sum, np.nan)
+
+
+def _group_mean(values, idx, n_groups):
+    """(n, k) 배열의 그룹별 평균 (NaN 제외) — bincount 기반"""
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    out = np.empty((n_groups, values.shape[1]))
+    for j in range(values.shape[1]):
+        sums = np.bincount(idx, weights=filled[:, j], minlength=n_groups)
+        counts = np.bincount(idx, weights=valid[:, j], minlength=n_groups)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[:, j] = sums / counts
+    return out
+
+
+def _pearson(x, y):
+    """열별 Pearson 상관계수 (행 단위 쌍 결측 제외) — (r 배열, 유효 n 배열)"""
+    valid = ~np.isnan(x) & ~np.isnan(y)
+    n = valid.sum(axis=0)
+    x = np.where(valid, x, 0.0)
+    y = np.where(valid, y, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mx, my = x.sum(axis=0) / n, y.sum(axis=0) / n
+        cov = (x * y).sum(axis=0) / n - mx * my
+        vx = (x * x).sum(axis=0) / n - mx * mx
+        vy = (y * y).sum(axis=0) / n - my * my
+        r = cov / np.sqrt(vx * vy)
+    return np.where(n >= 3, r, np.nan), n
+
+
+def build_capacity_index(df):
+    """세부기술 DF → 세부기술 · 중분류 · 범위 · 국가 단위 연구개발 역량 지수 (데이터 버전당 1회)
+
+    반환: {'details': 세부기술 DF, 'categories': 중분류 DF, 'scopes': 범위 × 국가 DF,
+           'correlation': 국가별 기술수준과의 상관 DF}
+    details/categories 컬럼: {code}_capacity(점), {code}_capacity_rel(최고국=100), {code}_tech_level
+    """
+    capacity = _composite(df)
+    with np.errstate(invalid='ignore'):
+        best = np.nanmax(np.where(np.isnan(capacity), -np.inf, capacity), axis=1, keepdims=True)
+        relative = capacity / np.where(np.isfinite(best) & (best > 0), best, np.nan) * 100
+    level = df[[f'{code}_tech_level' for code in COUNTRY_CODES]].to_numpy(dtype='float64')
+
+    details = df[['type', 'tech_category', 'tech_detail']].reset_index(drop=True).copy()
+    for j, code in enumerate(COUNTRY_CODES):
+        cap_col, rel_col = capacity_columns(code)
+        details[cap_col] = capacity[:, j]
+        details[rel_col] = relative[:, j]
+        details[f'{code}_tech_level'] = level[:, j]
+
+    categories_arr, cat_idx = np.unique(details['tech_category'].astype(str).to_numpy(), return_inverse=True)
+    stacked = np.hstack([capacity, relative, level])
+    cat_means = _group_mean(stacked, cat_idx, len(categories_arr))
+    n = len(COUNTRY_CODES)
+    first_rows = np.unique(cat_idx, return_index=True)[1]
+    categories = pd.DataFrame({'tech_category': categories_arr,
+                               'type': details['type'].to_numpy()[first_rows],
+                               'detail_count': np.bincount(cat_idx, minlength=len(categories_arr))})
+    for j, code in enumerate(COUNTRY_CODES):
+        cap_col, rel_col = capacity_columns(code)
+        categories[cap_col] = cat_means[:, j]
+        categories[rel_col] = cat_means[:, n + j]
+        categories[f'{code}_tech_level'] = cat_means[:, 2 * n + j]
+
+    scope_rows = []
+    detail_type = details['type'].to_numpy()
+    for scope, type_value in SCOPE_TYPES.items():
+        mask = np.ones(len(details), dtype=bool) if type_value is None else detail_type == type_value
+        with np.errstate(invalid='ignore'):
+            means = np.nanmean(np.where(mask[:, None], stacked, np.nan), axis=0) if mask.any() \
+                else np.full(stacked.shape[1], np.nan)
+        for j, code in enumerate(COUNTRY_CODES):
+            scope_rows.append({'scope': scope, 'country': code, 'capacity': means[j],
+                               'capacity_rel': means[n + j], 'tech_level': means[2 * n + j]})
+    scopes = pd.DataFrame(scope_rows)
+
+    r_detail, n_detail = _pearson(capacity, level)
+    r_category, n_category = _pearson(cat_means[:, :n], cat_means[:, 2 * n:])
+    correlation = pd.DataFrame({'country': COUNTRY_CODES, 'r_detail': r_detail, 'n_detail': n_detail,
+                                'r_category': r_category, 'n_category': n_category})
+
+    return {'details': details, 'categories': categories, 'scopes': scopes, 'correlation': correlation}
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+
+from ingest import COUNTRY_CODES
+
+# ===== 5개국 역량 프로파일 기반 기술 군집화 =====
+PROFILE_METRICS = ('tech_level', 'tech_gap', 'basic_research', 'applied_research')
+PROFILE_COLUMNS = [f'{code}_{metric}' for code in COUNTRY_CODES for metric in PROFILE_METRICS]
+
+CLUSTER_METHODS = ('kmeans', 'ward')
+# 계층적(Ward) 군집은 거리행렬 O(n²) 메모리 — 중분류 수준 규모까지만 허용
+WARD_MAX_ROWS = 2000
+
+
+def prepare_features(frame, columns=PROFILE_COLUMNS):
+    """프로파일 행렬 (결측은 컬럼 평균 대체) + 표준화 행렬 반환"""
+    raw = frame[columns].to_numpy(dtype='float64')
+    col_mean = np.nanmean(np.where(np.isnan(raw).all(axis=0), 0.0, raw), axis=0)
+    raw = np.where(np.isnan(raw), col_mean, raw)
+    std = raw.std(axis=0)
+    std[std == 0] = 1.0
+    return raw, (raw - raw.mean(axis=0)) / std
+
+
+def _sq_distances(X, centroids):
+    """(n, k) 제곱거리 — ||x||² - 2x·c + ||c||² 행렬곱 형태"""
+    d = (X * X).sum(axis=1)[:, None] - 2.0 * X @ centroids.T + (centroids * centroids).sum(axis=1)[None, :]
+    return np.maximum(d, 0.0)
+
+
+def _cluster_means(X, labels, k):
+    counts = np.bincount(labels, minlength=k)
+    sums = np.stack([np.bincount(labels, weights=X[:, j], minlength=k) for j in range(X.shape[1])], axis=1)
+    return sums / np.maximum(counts, 1)[:, None], counts
+
+
+def _kmeans_pp(X, k, rng):
+    centroids = [X[rng.integers(len(X))]]
+    closest = _sq_distances(X, centroids[0][None, :])[:, 0]
+    for _ in range(1, k):
+        total = closest.sum()
+        idx = rng.choice(len(X), p=closest / total) if total > 0 else rng.integers(len(X))
+        centroids.append(X[idx])
+        closest = np.minimum(closest, _sq_distances(X, X[idx][None, :])[:, 0])
+    return np.array(centroids)
+
+
+def kmeans(X, k, n_init=4, max_iter=100, tol=1e-6, seed=0):
+    """k-means++ 초기화 + Lloyd 반복 (할당·갱신 모두 벡터 연산) — (labels, centroids, inertia)"""
+    rng = np.random.default_rng(seed)
+    best = None
+    for _ in range(n_init):
+        centroids = _kmeans_pp(X, k, rng)
+        for _ in range(max_iter):
+            labels = _sq_distances(X, centroids).argmin(axis=1)
+            updated, counts = _cluster_means(X, labels, k)
+            # 빈 군집은 현재 중심에서 가장 먼 점으로 재배치
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                far = _sq_distances(X, updated).min(axis=1).argsort()[::-1][:len(empty)]
+                updated[empty] = X[far]
+            shift = ((updated - centroids) ** 2).sum()
+            centroids = updated
+            if shift <= tol:
+                break
+        distances = _sq_distances(X, centroids)
+        labels = distances.argmin(axis=1)
+        inertia = float(distances[np.arange(len(X)), labels].sum())
+        if best is None or inertia < best[2]:
+            best = (labels, centroids, inertia)
+    return best
+
+
+def ward(X, k):
+    """Ward 병합 군집 (Lance–Williams 갱신) — k개 군집이 남을 때까지 병합한 labels"""
+    n = len(X)
+    if n > WARD_MAX_ROWS:
+        raise ValueError(f"Ward 군집은 {WARD_MAX_ROWS:,}행 이하에서만 지원합니다 (입력 {n:,}행)")
+    dist = _sq_distances(X, X)
+    np.fill_diagonal(dist, np.inf)
+    sizes = np.ones(n)
+    active = np.ones(n, dtype=bool)
+    members = np.arange(n)
+
+    for _ in range(n - k):
+        flat = dist.argmin()
+        i, j = divmod(flat, n)
+        if i > j:
+            i, j = j, i
+        # Ward: d(i∪j, m) = ((ni+nm)d(i,m) + (nj+nm)d(j,m) - nm·d(i,j)) / (ni+nj+nm)
+        nm = sizes
+        merged = ((sizes[i] + nm) * dist[i] + (sizes[j] + nm) * dist[j] - nm * dist[i, j]) / (sizes[i] + sizes[j] + nm)
+        merged[~active] = np.inf
+        dist[i, :] = merged
+        dist[:, i] = merged
+        dist[i, i] = np.inf
+        dist[j, :] = np.inf
+        dist[:, j] = np.inf
+        sizes[i] += sizes[j]
+        active[j] = False
+        members[members == j] = i
+
+    _, labels = np.unique(members, return_inverse=True)
+    return labels
+
+
+def cluster_profiles(frame, k, method='kmeans', name_col='tech_category', seed=0):
+    """프로파일 군집화 결과
+
+    반환: {'members': 행별 군집 DF, 'centroids': 군집 중심(원 단위) DF,
+           'centroids_z': 군집 중심(표준화) DF, 'projection': PCA 2차원 좌표, 'inertia'}
+    군집 번호는 중심의 한국 기술수준 내림차순(C1 = 가장 높음)으로 정렬해 재계산 간 안정적으로 유지.
+    """
+    if method not in CLUSTER_METHODS:
+        raise ValueError(f"지원하지 않는 군집 방법: {method}")
+    raw, X = prepare_features(frame)
+    k = max(1, min(int(k), len(X)))
+
+    if method == 'kmeans':
+        labels, _, _ = kmeans(X, k, seed=seed)
+    else:
+        labels = ward(X, k)
+
+    raw_centroids, counts = _cluster_means(raw, labels, k)
+    z_centroids, _ = _cluster_means(X, labels, k)
+    kr_level = PROFILE_COLUMNS.index('kr_tech_level')
+    order = np.argsort(-raw_centroids[:, kr_level], kind='stable')
+    remap = np.empty(k, dtype=np.int64)
+    remap[order] = np.arange(k)
+    labels = remap[labels]
+    cluster_names = np.array([f"C{i + 1}" for i in range(k)])
+
+    distances = _sq_distances(X, z_centroids[order])
+    inertia = float(distances[np.arange(len(X)), labels].sum())
+
+    # PCA 2차원 투영 (SVD)
+    _, _, vt = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)
+    coords = X @ vt[:2].T if X.shape[1] >= 2 else np.column_stack([X[:, 0], np.zeros(len(X))])
+
+    keep = [c for c in (name_col, 'tech_category', 'tech_detail', 'type') if c in frame.columns]
+    members = frame[list(dict.fromkeys(keep))].reset_index(drop=True).copy()
+    members['cluster'] = cluster_names[labels]
+    members['distance'] = np.sqrt(distances[np.arange(len(X)), labels])
+
+    centroids = pd.DataFrame(raw_centroids[order], columns=PROFILE_COLUMNS)
+    centroids.insert(0, 'size', counts[order])
+    centroids.insert(0, 'cluster', cluster_names)
+    centroids_z = pd.DataFrame(z_centroids[order], columns=PROFILE_COLUMNS, index=cluster_names)
+
+    projection = members[[name_col, 'cluster']].copy()
+    projection['pc1'] = coords[:, 0]
+    projection['pc2'] = coords[:, 1]
+
+    return {'members': members, 'centroids': centroids, 'centroids_z': centroids_z,
+            'projection': projection, 'inertia': inertia}
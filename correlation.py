@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+from ingest import COUNTRY_CODES
+
+# ===== 지표 × 국가 상관행렬 (세부기술 · 중분류 단위, Pearson · Spearman) =====
+CORRELATION_METRICS = ('tech_level', 'tech_gap', 'basic_research', 'applied_research')
+CORRELATION_COLUMNS = [f'{code}_{metric}' for code in COUNTRY_CODES for metric in CORRELATION_METRICS]
+CORRELATION_METHODS = ('pearson', 'spearman')
+MIN_PAIRS = 3  # 유효 쌍이 이보다 적으면 NaN
+
+
+def _pairwise_pearson(values):
+    """(행, 열) 배열 → 쌍별 완전 관측 기준 Pearson 행렬 · 유효 쌍 수 행렬 (행렬곱 한 번씩으로 전 쌍 계산)"""
+    valid = ~np.isnan(values)
+    x = np.where(valid, values, 0.0)
+    w = valid.astype('float64')
+    n = w.T @ w
+    sum_x = x.T @ w                  # [i, j] = 열 j 도 유효한 행에서 열 i 의 합
+    sum_xx = (x * x).T @ w
+    sum_xy = x.T @ x
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_i, mean_j = sum_x / n, sum_x.T / n
+        cov = sum_xy / n - mean_i * mean_j
+        var_i = sum_xx / n - mean_i ** 2
+        var_j = sum_xx.T / n - mean_j ** 2
+        r = cov / np.sqrt(var_i * var_j)
+    r = np.clip(np.where(n >= MIN_PAIRS, r, np.nan), -1.0, 1.0)
+    np.fill_diagonal(r, np.where(np.diag(n) >= MIN_PAIRS, 1.0, np.nan))
+    return r, n.astype('int64')
+
+
+def _matrices(frame):
+    values = frame[CORRELATION_COLUMNS].to_numpy(dtype='float64')
+    # Spearman: 열별 평균 순위의 Pearson (순위는 열 전체 기준 — 결측 위치가 다른 쌍은 근사값)
+    ranks = frame[CORRELATION_COLUMNS].rank(method='average').to_numpy(dtype='float64')
+    pearson, counts = _pairwise_pearson(values)
+    spearman, _ = _pairwise_pearson(ranks)
+    as_frame = lambda m: pd.DataFrame(m, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS)
+    return {'pearson': as_frame(pearson), 'spearman': as_frame(spearman), 'counts': as_frame(counts)}
+
+
+def build_correlations(df):
+    """세부기술 DF(범위 적용) → 세부기술 · 중분류 단위 상관행렬 (데이터 버전 · 범위당 1회)
+
+    반환: {level: {'frame': 산점도용 DF, 'pearson', 'spearman', 'counts': 20×20 DF}} — level 은 'detail' 또는 'category'
+    """
+    details = df[['type', 'tech_category', 'tech_detail'] + CORRELATION_COLUMNS].reset_index(drop=True)
+    grouped = details.groupby(details['tech_category'].astype(str), sort=True)
+    categories = grouped[CORRELATION_COLUMNS].mean()
+    categories.insert(0, 'detail_count', grouped.size())
+    categories = categories.reset_index()
+    categories.insert(0, 'type', grouped['type'].first().to_numpy())
+
+    return {'detail': {'frame': details, **_matrices(details)},
+            'category': {'frame': categories, **_matrices(categories)}}
+
+
+def top_pairs(matrices, method, limit=15, columns=None):
+    """|r| 상위 열 쌍 DF (대각 · 중복 제외) — columns 로 대상 열 제한"""
+    corr, counts = matrices[method], matrices['counts']
+    cols = list(columns) if columns is not None else CORRELATION_COLUMNS
+    i, j = np.triu_indices(len(cols), k=1)
+    r = corr.loc[cols, cols].to_numpy()[i, j]
+    pairs = pd.DataFrame({'x': np.array(cols)[i], 'y': np.array(cols)[j], 'r': r,
+                          'n': counts.loc[cols, cols].to_numpy()[i, j]}).dropna(subset=['r'])
+    order = np.argsort(-pairs['r'].abs().to_numpy(), kind='stable')
+    return pairs.iloc[order[:limit]].reset_index(drop=True)
@@ -1,13 +1,15 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import numpy as np
 import io
+import os
+import time
+import logging
+import threading
 from datetime import datetime
 import warnings
 
+# plotly는 차트를 그리는 화면에서만 지연 import (콜드 스타트 첫 화면 단축)
+# → 모듈 import 비용은 benchmarks/import_time.py 로 측정
+
 warnings.filterwarnings('ignore')
 
 # ===== 44대 중분류 고정 순서(사용자 지정 정렬 및 레이더용) =====
@@ -21,6 +23,37 @@ CATEGORY_ORDER = [
 ]
 CATEGORY_INDEX = {cat: i+1 for i, cat in enumerate(CATEGORY_ORDER)}  # 순위 고정용
 
+# 국가 표시명 ↔ 컬럼 코드
+COUNTRY_CODE_MAP = {'한국': 'kr', '중국': 'cn', '일본': 'jp', '미국': 'us', 'EU': 'eu'}
+COUNTRY_LABELS = {code: name for name, code in COUNTRY_CODE_MAP.items()}
+
+# 캐시별 한도 (항목 수 · 바이트, TTL 초) — 초과 시 가장 오래 안 쓴 항목부터 축출
+CACHE_BUDGETS = {
+    'dataset': dict(max_entries=4, max_bytes=256 * 1024 * 1024, ttl=3600),
+    'derived': dict(max_entries=64, max_bytes=32 * 1024 * 1024, ttl=3600),
+    'figures': dict(max_entries=256, max_bytes=64 * 1024 * 1024, ttl=3600),
+    'partitions': dict(max_entries=64, max_bytes=128 * 1024 * 1024, ttl=3600),
+    'edition_diff': dict(max_entries=16, max_bytes=64 * 1024 * 1024, ttl=3600),
+}
+
+# 분석 범위 표시 문구
+SCOPE_CONTEXT = {'전체': "전체 기후기술", '감축기술': "감축기술", '적응기술': "적응기술"}
+
+# 서버 기동 시 미리 계산할 화면 (쉼표 구분 / 빈 값·none 이면 비활성)
+# main, country, multiples, cluster, capacity, pair, correlation, hierarchy
+WARMUP_VIEWS = tuple(
+    v.strip() for v in os.environ.get('TRACKER_WARMUP_VIEWS',
+                                      'main,country,multiples,cluster,capacity,pair,correlation,hierarchy').split(',')
+    if v.strip() and v.strip().lower() != 'none'
+)
+
+warmup_logger = logging.getLogger("climatetechtracker.warmup")
+if not warmup_logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s [%(name)s] %(message)s"))
+    warmup_logger.addHandler(_handler)
+    warmup_logger.setLevel(logging.INFO)
+
 # 페이지 설정
 st.set_page_config(
     page_title="🌍 기후기술 수준조사 통계정보 대시보드",
@@ -77,6 +110,33 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# 데이터 계층 import — 페이지 설정/CSS 전송 이후 로드
+import pandas as pd
+
+from ingest import (SCOPE_TYPES, build_category_data, data_quality_report, detect_anomalies, ANOMALY_LABELS,
+                    ROBUST_Z_THRESHOLD, RESIDUAL_Z_THRESHOLD)
+from datasource import get_data_source, filter_frame
+from shared_dataset import attach_or_publish
+from uncertainty import bootstrap_category_ci, ci_columns
+from capacity import build_capacity_index, capacity_columns
+from pairwise import build_pair_tensor, pair_comparison, METRIC_DIRECTION
+from correlation import build_correlations, top_pairs, CORRELATION_COLUMNS, CORRELATION_METHODS
+from hierarchy import build_aggregation_tree, subtree, node_path, count_column, HIERARCHY_LEVELS
+from clustering import cluster_profiles, CLUSTER_METHODS, PROFILE_COLUMNS, WARD_MAX_ROWS
+from projection import (project_gap_closure, assumption_key, TREND_LABELS, DEFAULT_TREND_PACE,
+                        DEFAULT_CATCHUP, HORIZON_CAP, RIVALS)
+from pivot import (run_pivot, query_signature, result_column, label_columns, PIVOT_DIMENSIONS, PIVOT_METRICS,
+                   PIVOT_AGGREGATIONS, AGGREGATION_NAMES, PIVOT_ENGINES)
+from scenario import (build_scenario_base, apply_scenario, scenario_kpis, target_options,
+                      save_scenario, list_scenarios, load_scenario)
+from history import write_year_partitions, read_year_partitions, build_trend_frame, build_yoy_table
+from edition_diff import list_editions, select_edition, diff_editions, export_diff_xlsx
+from figure_payload import figure_payload, RENDER_MODES
+from paging import PAGE_SIZES, numeric_range, ordered_rows, page_count, page_rows
+from cache_manager import bounded_cache, cache_stats, process_rss_bytes
+from profiler import (run_profiled, resolve_engine, snapshot_state, list_profiles, top_functions,
+                      PROFILER_ENGINES, PROFILE_QUERY_PARAM, PROFILE_DIR)
+
 # 기술 설명 데이터 (예시, 실제 데이터로 추후 교체 예정)
 TECH_DESCRIPTIONS = {
     "원자력발전": {
@@ -97,113 +157,124 @@ TECH_DESCRIPTIONS = {
 }
 
 # 데이터 로딩 함수
-@st.cache_data(ttl=3600)
+@bounded_cache('dataset', **CACHE_BUDGETS['dataset'])
+def load_survey_dataset():
+    """데이터 소스(Excel/SQLite/DuckDB/Parquet)의 전체 조사 데이터 로드 (연도·시트 태그 포함)
+
+    같은 데이터 버전을 이미 다른 워커가 게시했으면 파싱 없이 공유 파일을 매핑한다.
+    """
+    source = get_data_source()
+    data_version = source.version()
+    full_df = attach_or_publish(data_version, 'dataset', source.load)
+    return full_df, data_version
+
+
+@bounded_cache('dataset', **CACHE_BUDGETS['dataset'])
+def load_latest_edition():
+    """최신 조사연도 세부기술 DF + 중분류 집계 DF"""
+    full_df, data_version = load_survey_dataset()
+
+    # 기존 화면은 최신 조사 회차 기준 (연도 미상 시트만 있는 경우 전체 사용)
+    def select_latest():
+        years = full_df['survey_year'].dropna()
+        if len(years) > 0:
+            return full_df[full_df['survey_year'] == years.max()].reset_index(drop=True)
+        return full_df
+
+    # 최신 회차/중분류 집계도 공유 파일로 게시 → 추가 워커는 재계산·복사 없이 매핑
+    df = attach_or_publish(data_version, 'latest', select_latest)
+    category_data = attach_or_publish(data_version, 'category', lambda: build_category_data(df))
+
+    df.attrs['data_version'] = data_version
+    category_data.attrs['data_version'] = data_version
+    return df, category_data
+
+
 def load_climate_tech_data():
-    """기후기술 데이터 로드 및 전처리"""
+    """기후기술 데이터 로드 및 전처리 (최신 조사연도 기준)"""
     try:
-        # Excel 파일 읽기
-        df = pd.read_excel('tracker2020.xlsx', sheet_name=0)
-
-        # 컬럼명 정리
-        column_mapping = {
-            '세부기술': 'tech_detail',
-            '중분류': 'tech_category',
-            '감축/적응': 'type',
-            '최고 기술 보유국': 'leading_country',
-            '한국-기술 수준 (%)': 'kr_tech_level',
-            '한국-기술 격차 (년)': 'kr_tech_gap',
-            '한국-기술 수준 그룹': 'kr_tech_group',
-            '중국-기술 수준 (%)': 'cn_tech_level',
-            '중국-기술 격차 (년)': 'cn_tech_gap',
-            '일본-기술 수준 (%)': 'jp_tech_level',
-            '일본-기술 격차 (년)': 'jp_tech_gap',
-            '미국-기술 수준 (%)': 'us_tech_level',
-            '미국-기술 격차 (년)': 'us_tech_gap',
-            'EU-기술 수준 (%)': 'eu_tech_level',
-            'EU-기술 격차 (년)': 'eu_tech_gap',
-            '한국-연구 개발 활동 경향': 'kr_rd_trend',
-            '한국-기초 연구 역량(점)': 'kr_basic_research',
-            '한국-응용 개발 연구 역량(점)': 'kr_applied_research',
-            '중국-연구 개발 활동 경향': 'cn_rd_trend',
-            '중국-기초 연구 역량(점)': 'cn_basic_research',
-            '중국-응용 개발 연구 역량(점)': 'cn_applied_research',
-            '일본-연구 개발 활동 경향': 'jp_rd_trend',
-            '일본-기초 연구 역량(점)': 'jp_basic_research',
-            '일본-응용 개발 연구 역량(점)': 'jp_applied_research',
-            '미국-연구 개발 활동 경향': 'us_rd_trend',
-            '미국-기초 연구 역량(점)': 'us_basic_research',
-            '미국-응용 개발 연구 역량(점)': 'us_applied_research',
-            'EU-연구 개발 활동 경향': 'eu_rd_trend',
-            'EU-기초 연구 역량(점)': 'eu_basic_research',
-            'EU-응용 개발 연구 역량(점)': 'eu_applied_research'
-        }
-
-        df = df.rename(columns=column_mapping)
-
-        # 숫자 컬럼 변환
-        numeric_cols = [col for col in df.columns if 'tech_level' in col or 'tech_gap' in col or 'research' in col]
-        for col in numeric_cols:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        # 중분류별 데이터 집계 (평균값 사용)
-        category_data = df.groupby('tech_category').agg({
-            'type': 'first',
-            'kr_tech_level': 'mean',
-            'kr_tech_gap': 'mean',
-            'kr_tech_group': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
-            'cn_tech_level': 'mean',
-            'cn_tech_gap': 'mean',
-            'jp_tech_level': 'mean',
-            'jp_tech_gap': 'mean',
-            'us_tech_level': 'mean',
-            'us_tech_gap': 'mean',
-            'eu_tech_level': 'mean',
-            'eu_tech_gap': 'mean',
-            'kr_rd_trend': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
-            'kr_basic_research': 'mean',
-            'kr_applied_research': 'mean',
-            'cn_basic_research': 'mean',
-            'cn_applied_research': 'mean',
-            'jp_basic_research': 'mean',
-            'jp_applied_research': 'mean',
-            'us_basic_research': 'mean',
-            'us_applied_research': 'mean',
-            'eu_basic_research': 'mean',
-            'eu_applied_research': 'mean',
-            'leading_country': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
-            'tech_detail': 'count'
-        }).reset_index()
-
-        # 컬럼명 변경
-        category_data = category_data.rename(columns={'tech_detail': 'detail_count'})
-
-        return df, category_data
+        return load_latest_edition()
 
     except Exception as e:
         st.error(f"데이터 로드 오류: {str(e)}")
         return None, None
 
 
+@bounded_cache('partitions', **CACHE_BUDGETS['partitions'])
+def get_survey_years(data_version):
+    """연도 파티션 준비(최초 1회 기록) 후 조사연도 목록 반환"""
+    full_df, _ = load_survey_dataset()
+    return write_year_partitions(full_df, data_version)
+
+
+@bounded_cache('partitions', **CACHE_BUDGETS['partitions'])
+def load_year_partitions(data_version, years, kind, columns):
+    """선택 연도·컬럼만 파티션에서 로드"""
+    return read_year_partitions(data_version, years, kind=kind, columns=columns)
+
+
+@bounded_cache('edition_diff', **CACHE_BUDGETS['edition_diff'])
+def get_editions(data_version):
+    full_df, _ = load_survey_dataset()
+    return list_editions(full_df)
+
+
+@bounded_cache('edition_diff', **CACHE_BUDGETS['edition_diff'])
+def compute_edition_diff(data_version, old_key, new_key):
+    """회차 쌍별 비교 결과 (데이터 버전 + 회차 쌍 기준 캐시)"""
+    full_df, _ = load_survey_dataset()
+    return diff_editions(select_edition(full_df, old_key), select_edition(full_df, new_key))
+
+
+@bounded_cache('edition_diff', **CACHE_BUDGETS['edition_diff'])
+def get_edition_diff_export(data_version, old_key, new_key):
+    return export_diff_xlsx(compute_edition_diff(data_version, old_key, new_key))
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_category_ci(data_version):
+    """중분류·범위별 부트스트랩 신뢰구간 (데이터 버전당 1회 재표본)"""
+    df, _ = load_climate_tech_data()
+    return bootstrap_category_ci(df)
+
+
+def format_ci(low, high, unit):
+    if pd.isna(low) or pd.isna(high):
+        return "–"
+    return f"{low:.1f}–{high:.1f}{unit}"
+
+
 # 경량화된 시각화 함수들
-def create_simple_bar_comparison(data, title, metric_col, countries=['한국', '중국', '일본', '미국', 'EU']):
-    """단순하고 빠른 막대그래프"""
+def create_simple_bar_comparison(data, title, metric_col, countries=['한국', '중국', '일본', '미국', 'EU'], ci=None):
+    """단순하고 빠른 막대그래프 (ci: 신뢰구간 행 — 있으면 오차막대 표시)"""
+    import plotly.graph_objects as go
     country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
     values = [data[f'{code}_{metric_col}'].mean() for code in country_codes]
 
+    error_y = None
+    upper = values
+    if ci is not None:
+        bounds = [[ci.get(col) for col in ci_columns(code, metric_col)] for code in country_codes]
+        error_y = dict(type='data', symmetric=False, color='#555', thickness=1.5, width=6,
+                       array=[max(high - val, 0) if pd.notna(high) else 0 for (_, high), val in zip(bounds, values)],
+                       arrayminus=[max(val - low, 0) if pd.notna(low) else 0 for (low, _), val in zip(bounds, values)])
+        upper = [high if pd.notna(high) else val for (_, high), val in zip(bounds, values)]
+
     fig = go.Figure(data=[
         go.Bar(
             x=countries,
             y=values,
             marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'],
             text=[f"{val:.1f}%" if 'level' in metric_col else f"{val:.1f}년" for val in values],
-            textposition='outside'
+            textposition='outside',
+            error_y=error_y
         )
     ])
 
     fig.update_layout(
         title=title,
         height=300,
-        yaxis=dict(range=[0, max(values) * 1.2])
+        yaxis=dict(range=[0, max(upper) * 1.2])
     )
 
     return fig
@@ -211,6 +282,7 @@ def create_simple_bar_comparison(data, title, metric_col, countries=['한국', '
 
 def create_enhanced_heatmap(data, title="기술수준 히트맵"):
     """향상된 가시성의 히트맵"""
+    import plotly.graph_objects as go
     countries = ['한국', '중국', '일본', '미국', 'EU']
     country_codes = ['kr', 'cn', 'jp', 'us', 'eu']
 
@@ -253,6 +325,7 @@ def create_enhanced_heatmap(data, title="기술수준 히트맵"):
 
 def create_radar_chart(data, selected_type='전체', selected_countries=['한국', '중국', '일본', '미국', 'EU']):
     """국가별 기술경쟁력 레이더 차트"""
+    import plotly.graph_objects as go
 
     if selected_type != '전체':
         filtered_data = data[data['type'] == selected_type]
@@ -314,7 +387,1706 @@ def create_radar_chart(data, selected_type='전체', selected_countries=['한국
 
     return fig
 
+# ===== 화면별 캐시 (범위 슬라이스 · 그래프) — 워밍업 대상 =====
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_scope_slice(data_version, scope):
+    """범위(전체/감축기술/적응기술)별 중분류 DF"""
+    _, category_data = load_climate_tech_data()
+    type_value = SCOPE_TYPES[scope]
+    if type_value is None:
+        return category_data.copy()
+    return category_data[category_data['type'] == type_value].copy()
+
+
+@bounded_cache('figures', **CACHE_BUDGETS['figures'])
+def get_main_dashboard_figures(data_version, scope):
+    """메인 대시보드 그래프 3종 (국가별 수준/격차 막대, 히트맵)"""
+    filtered_data = get_scope_slice(data_version, scope)
+    scope_ci = get_category_ci(data_version)['scope'].loc[scope]
+    return {
+        'levels': create_simple_bar_comparison(filtered_data, "기술수준 비교(%)", "tech_level", ci=scope_ci),
+        'gaps': create_simple_bar_comparison(filtered_data, "기술격차 비교(년)", "tech_gap", ci=scope_ci),
+        'heatmap': create_enhanced_heatmap(filtered_data, f"{SCOPE_CONTEXT[scope]} 기술수준 히트맵"),
+    }
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_top_bottom_tables(data_version, country):
+    """국가별 상위/하위 10개 중분류 표"""
+    _, category_data = load_climate_tech_data()
+    col_code = COUNTRY_CODE_MAP[country]
+    level_col = f"{col_code}_tech_level"
+    gap_col = f"{col_code}_tech_gap" if f"{col_code}_tech_gap" in category_data.columns else None
+    ci_by_category = get_category_ci(data_version)['category'].set_index('tech_category')
+    ci_low, ci_high = ci_columns(col_code, 'tech_level')
+
+    tables = []
+    for ascending in (False, True):
+        tbl = (
+            category_data[['type', 'tech_category', level_col] + ([gap_col] if gap_col else [])]
+            .dropna(subset=[level_col])
+            .sort_values(level_col, ascending=ascending)
+            .head(10)
+            .rename(columns={'type': '구분', 'tech_category': '중분류', level_col: '기술수준(%)'})
+        )
+        if gap_col: tbl = tbl.rename(columns={gap_col: '기술격차(년)'})
+        tbl['구분'] = tbl['구분'].map({'감축': '⚡ 감축', '적응': '🛡️ 적응'})
+        tbl['기술수준(%)'] = tbl['기술수준(%)'].map(lambda x: f"{x:.1f}%")
+        tbl.insert(3, '95% CI', [format_ci(ci_by_category.at[c, ci_low], ci_by_category.at[c, ci_high], "%")
+                                 for c in tbl['중분류']])
+        if gap_col: tbl['기술격차(년)'] = tbl['기술격차(년)'].map(lambda x: f"{x:.1f}년")
+        tables.append(tbl)
+    return tables[0], tables[1]
+
+
+# 세부기술 화면(레이더/막대/상세표/히트맵)이 그리는 컬럼
+DETAIL_VIEW_COLUMNS = ('type', 'tech_category', 'tech_detail', 'kr_tech_gap', 'kr_tech_group', 'leading_country') + \
+                      tuple(f'{code}_tech_level' for code in COUNTRY_LABELS)
+
+
+@bounded_cache('partitions', **CACHE_BUDGETS['partitions'])
+def get_latest_survey_year(data_version):
+    full_df, _ = load_survey_dataset()
+    years = full_df['survey_year'].dropna()
+    return int(years.max()) if len(years) > 0 else None
+
+
+@bounded_cache('partitions', **CACHE_BUDGETS['partitions'])
+def query_latest_details(data_version, columns, filters):
+    """최신 회차 세부기술 중 화면에 필요한 컬럼·행만 조회
+
+    DB/Parquet 소스는 컬럼 선택과 필터를 소스에서 실행하고, Excel 소스는 메모리 DF를 슬라이스한다.
+    """
+    source = get_data_source()
+    if not source.supports_pushdown:
+        df, _ = load_climate_tech_data()
+        return filter_frame(df, columns, filters)
+    year = get_latest_survey_year(data_version)
+    if year is not None:
+        filters = filters + (('survey_year', (year,)),)
+    return source.load(columns=columns, filters=filters)
+
+
+def get_scoped_details(data_version, scope, selected_mid):
+    """분석범위 + 중분류 필터를 적용한 세부기술 DF"""
+    filters = (('tech_category', (selected_mid,)),)
+    type_value = SCOPE_TYPES[scope]
+    if type_value is not None:
+        filters += (('type', (type_value,)),)
+    return query_latest_details(data_version, DETAIL_VIEW_COLUMNS, filters)
+
+
+@bounded_cache('figures', **CACHE_BUDGETS['figures'])
+def build_detail_radar(data_version, scope, selected_mid, compare_countries):
+    """선택 중분류의 세부기술 레이더 (데이터 없으면 None)"""
+    import plotly.graph_objects as go
+    det_src = get_scoped_details(data_version, scope, selected_mid)
+
+    theta = det_src['tech_detail'].tolist()
+    if len(theta) == 0:
+        return None
+
+    fig_rad = go.Figure()
+    for ctry in compare_countries:
+        code = COUNTRY_CODE_MAP[ctry]  # {'한국':'kr',...}
+        col = f"{code}_tech_level"
+        r_vals = det_src[col].fillna(0.0).astype(float).tolist()
+        fig_rad.add_trace(go.Scatterpolar(
+            r=r_vals, theta=theta, fill='toself', name=ctry, opacity=0.6
+        ))
+    fig_rad.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
+        showlegend=True, height=560,
+        title=f"{selected_mid} — 세부기술 레이더(범위: {scope})"
+    )
+    return fig_rad
+
+
+@bounded_cache('figures', **CACHE_BUDGETS['figures'])
+def build_detail_bar(data_version, scope, selected_mid, compare_countries):
+    """선택 중분류의 세부기술별 국가 비교 그룹 막대 (데이터 없으면 None)"""
+    import plotly.express as px
+    det_src = get_scoped_details(data_version, scope, selected_mid)
+
+    # Long 변환
+    recs = []
+    for _, r in det_src.iterrows():
+        for c in compare_countries:
+            col = f"{COUNTRY_CODE_MAP[c]}_tech_level"
+            if col in det_src.columns:
+                v = float(r.get(col, float('nan')))
+                recs.append({"세부기술": r['tech_detail'], "국가": c, "기술수준(%)": v})
+    df_bar = pd.DataFrame(recs, columns=["세부기술", "국가", "기술수준(%)"]).dropna(subset=["기술수준(%)"])
+    if df_bar.empty:
+        return None
+
+    fig_bar = px.bar(
+        df_bar,
+        x="세부기술",
+        y="기술수준(%)",
+        color="국가",
+        barmode="group",
+        text=df_bar["기술수준(%)"].map(lambda x: f"{x:.1f}%")
+    )
+    fig_bar.update_traces(textposition='outside', cliponaxis=False)
+    fig_bar.update_layout(
+        yaxis=dict(range=[0, 100]),
+        height=560,
+        margin=dict(t=60, r=20, b=40, l=40),
+        title=f"{selected_mid} — 세부기술별 국가 비교(범위: {scope})"
+    )
+    return fig_bar
+
+
+# 중분류 스몰 멀티플 (격자 열 수 · 정렬 기준)
+MULTIPLES_COLUMNS = 6
+MULTIPLES_SORTS = {'order': "기본 순서", 'korea': "한국 우수 순", 'deficit': "한국 열세 큰 순"}
+
+
+@bounded_cache('figures', **CACHE_BUDGETS['figures'])
+def build_category_multiples(data_version, scope, metric, sort):
+    """범위 내 전 중분류의 5개국 비교를 하나의 서브플롯 격자 그림으로 (중분류 행렬에서 한 번에 생성)"""
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    frame = get_scope_slice(data_version, scope)
+    cols = [f"{code}_{metric}" for code in COUNTRY_CODE_MAP.values()]
+    # 유리한 방향으로 부호를 맞춘 값 (수준은 높을수록, 격차는 작을수록 우수)
+    signed = frame[cols] * METRIC_DIRECTION[metric]
+    sort_keys = {
+        'order': frame['tech_category'].map(CATEGORY_INDEX).fillna(len(CATEGORY_INDEX) + 1),
+        'korea': -signed[cols[0]],
+        'deficit': signed[cols[0]] - signed.max(axis=1),
+    }
+    frame = frame.assign(sort_key=sort_keys[sort]).sort_values(['sort_key', 'tech_category'], kind='stable')
+
+    n = len(frame)
+    n_rows = max(1, -(-n // MULTIPLES_COLUMNS))
+    names = frame['tech_category'].astype(str).tolist()
+    fig = make_subplots(rows=n_rows, cols=MULTIPLES_COLUMNS, shared_xaxes='all', shared_yaxes='all',
+                        subplot_titles=[name if len(name) <= 12 else name[:11] + "…" for name in names],
+                        horizontal_spacing=0.015, vertical_spacing=min(0.08, 0.35 / n_rows))
+
+    unit = "%" if metric == 'tech_level' else "년"
+    countries = list(COUNTRY_CODE_MAP)
+    traces = [
+        go.Bar(x=countries, y=values, marker_color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FECA57'],
+               name=name, showlegend=False,
+               hovertemplate=f"<b>{name}</b><br>%{{x}}: %{{y:.1f}}{unit}<extra></extra>")
+        for name, values in zip(names, frame[cols].to_numpy())
+    ]
+    fig.add_traces(traces, rows=[i // MULTIPLES_COLUMNS + 1 for i in range(n)],
+                   cols=[i % MULTIPLES_COLUMNS + 1 for i in range(n)])
+
+    values = frame[cols].stack()
+    if metric == 'tech_level':
+        y_range = [max(0, (values.min() // 10) * 10 - 10), 100] if len(values) else [0, 100]
+    else:
+        y_range = [0, values.max() * 1.1 if len(values) else 1]
+    fig.update_yaxes(range=y_range, tickfont=dict(size=9), nticks=4)
+    fig.update_xaxes(tickfont=dict(size=9), tickangle=0)
+    fig.update_annotations(font=dict(size=11))
+    fig.update_layout(height=60 + 150 * n_rows, margin=dict(t=40, l=30, r=10, b=20), bargap=0.15)
+    return fig
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_scenario_base(data_version):
+    """시나리오 재계산용 배열 묶음 (데이터 버전당 1회 생성)"""
+    df, _ = load_climate_tech_data()
+    return build_scenario_base(df)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_scenario_baseline(data_version):
+    return apply_scenario(get_scenario_base(data_version), [])[0]
+
+
+# 군집 단위 → 이름 컬럼
+CLUSTER_LEVELS = {'중분류': 'tech_category', '세부기술': 'tech_detail'}
+CLUSTER_DEFAULT_K = 4
+CLUSTER_K_RANGE = (2, 8)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_clusters(data_version, level, method, k):
+    """역량 프로파일 군집 결과 (데이터 버전 · 단위 · 방법 · k 기준 캐시)"""
+    df, category_data = load_climate_tech_data()
+    frame = category_data if level == '중분류' else df
+    return cluster_profiles(frame, k, method=method, name_col=CLUSTER_LEVELS[level])
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_capacity_index(data_version):
+    """연구개발 역량 종합지수 (데이터 버전 기준 캐시 — 화면 rerun 에서는 조회만)"""
+    df, _ = load_climate_tech_data()
+    return build_capacity_index(df)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_pair_tensor(data_version):
+    """5개국 전 순서쌍 차이 텐서 (데이터 버전 기준 캐시 — 국가 쌍 전환은 조회만)"""
+    df, _ = load_climate_tech_data()
+    return build_pair_tensor(df)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_hierarchy_tree(data_version):
+    """구분 → 중분류 → 세부기술 집계 트리 (데이터 버전 기준 캐시 — 하위 트리는 슬라이스 조회)"""
+    df, _ = load_climate_tech_data()
+    return build_aggregation_tree(df)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_correlations(data_version, scope):
+    """범위별 지표 × 국가 상관행렬 (세부기술 · 중분류 단위, Pearson · Spearman 한 번에 계산)"""
+    df, _ = load_climate_tech_data()
+    type_value = SCOPE_TYPES[scope]
+    return build_correlations(df if type_value is None else df[df['type'] == type_value])
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_gap_projection(data_version, paces, catchup, cap):
+    """격차 해소 전망 (데이터 버전 + 가정 집합 기준 캐시, paces 는 (경향, 속도) 튜플)"""
+    df, _ = load_climate_tech_data()
+    return project_gap_closure(df, paces, catchup, cap)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_pivot(data_version, signature, engine):
+    """피벗 결과 (데이터 버전 + 질의 시그니처 + 엔진 기준 캐시, 전 조사연도 데이터 대상)"""
+    full_df, _ = load_survey_dataset()
+    rows, metrics, aggregations, years, column = signature
+    return run_pivot(full_df, rows, metrics, aggregations, years=years, column=column, engine=engine)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_data_quality(data_version):
+    """전 조사연도 데이터 품질 보고서 (데이터 버전 기준 캐시)"""
+    full_df, _ = load_survey_dataset()
+    return data_quality_report(full_df, known_categories=CATEGORY_ORDER)
+
+
+@bounded_cache('derived', **CACHE_BUDGETS['derived'])
+def get_anomalies(data_version):
+    """전 조사연도 이상치 · 불일치 판정 (데이터 버전 기준 캐시)"""
+    full_df, _ = load_survey_dataset()
+    return detect_anomalies(full_df)
+
+
+# ===== 서버 기동 시 백그라운드 캐시 워밍업 =====
+def warm_caches(views=WARMUP_VIEWS):
+    """데이터셋 · 범위 슬라이스 · 주요 화면 그래프를 미리 계산해 캐시에 적재"""
+    started = time.perf_counter()
+    # 세션 없는 백그라운드 스레드 — st.error 를 쓰는 load_climate_tech_data 대신 로더를 직접 호출
+    try:
+        df, category_data = load_latest_edition()
+    except Exception:
+        warmup_logger.exception("워밍업 중단: 데이터 로드 실패")
+        return
+    data_version = category_data.attrs.get('data_version', '')
+    warmup_logger.info("워밍업: 데이터셋 로드 완료 (%.2fs, version=%s)", time.perf_counter() - started, data_version)
+
+    for scope in SCOPE_TYPES:
+        get_scope_slice(data_version, scope)
+
+    if 'main' in views:
+        for scope in SCOPE_TYPES:
+            get_main_dashboard_figures(data_version, scope)
+            warmup_logger.info("워밍업: 메인 대시보드 [%s] 완료 (%.2fs)", scope, time.perf_counter() - started)
+
+    if 'country' in views:
+        for country in COUNTRY_CODE_MAP:
+            get_top_bottom_tables(data_version, country)
+            # 국가별 경쟁력 화면 기본 상태(범위 전체 · 첫 번째 중분류 · 해당 국가 단독 비교)
+            scoped_cats = set(get_scope_slice(data_version, '전체')['tech_category'])
+            first_mid = next((c for c in CATEGORY_ORDER if c in scoped_cats), None)
+            if first_mid:
+                build_detail_radar(data_version, '전체', first_mid, (country,))
+                build_detail_bar(data_version, '전체', first_mid, (country,))
+            warmup_logger.info("워밍업: 국가별 경쟁력 [%s] 완료 (%.2fs)", country, time.perf_counter() - started)
+
+    if 'multiples' in views:
+        for scope in SCOPE_TYPES:
+            build_category_multiples(data_version, scope, 'tech_level', 'order')
+        warmup_logger.info("워밍업: 중분류 스몰 멀티플 완료 (%.2fs)", time.perf_counter() - started)
+
+    if 'cluster' in views:
+        for level in CLUSTER_LEVELS:
+            get_clusters(data_version, level, 'kmeans', CLUSTER_DEFAULT_K)
+        warmup_logger.info("워밍업: 기술 군집 완료 (%.2fs)", time.perf_counter() - started)
+
+    if 'capacity' in views:
+        get_capacity_index(data_version)
+        warmup_logger.info("워밍업: 연구개발 역량지수 완료 (%.2fs)", time.perf_counter() - started)
+
+    if 'pair' in views:
+        get_pair_tensor(data_version)
+        warmup_logger.info("워밍업: 국가 쌍 비교 완료 (%.2fs)", time.perf_counter() - started)
+
+    if 'correlation' in views:
+        for scope in SCOPE_TYPES:
+            get_correlations(data_version, scope)
+        warmup_logger.info("워밍업: 지표 상관행렬 완료 (%.2fs)", time.perf_counter() - started)
+
+    if 'hierarchy' in views:
+        get_hierarchy_tree(data_version)
+        warmup_logger.info("워밍업: 집계 트리 완료 (%.2fs)", time.perf_counter() - started)
+
+    warmup_logger.info("워밍업 완료: %s (총 %.2fs)", ', '.join(views) or '데이터셋만', time.perf_counter() - started)
+
+
+def _run_warmup(views):
+    try:
+        warm_caches(views)
+    except Exception:
+        warmup_logger.exception("워밍업 실패")
+
+
+@st.cache_resource(show_spinner=False)
+def start_cache_warmup(views):
+    """프로세스당 1회 워밍업 스레드 시작 (첫 스크립트 실행 시점 = 서버 기동 직후)"""
+    thread = threading.Thread(target=_run_warmup, args=(views,), name="cache-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+# 캐시 진단 (사이드바)
+def render_cache_diagnostics():
+    rss = process_rss_bytes()
+    stats = cache_stats()
+    total_bytes = sum(s['bytes'] for s in stats)
+    c1, c2 = st.columns(2)
+    c1.metric("프로세스 RSS", f"{rss / 1024 / 1024:.0f} MB" if rss else "–")
+    c2.metric("캐시 합계", f"{total_bytes / 1024 / 1024:.1f} MB")
+
+    rows = []
+    for s in stats:
+        rows.append({
+            '캐시': s['cache'],
+            '항목': f"{s['entries']}/{s['max_entries'] or '∞'}",
+            '사용(MB)': round(s['bytes'] / 1024 / 1024, 2),
+            '한도(MB)': round(s['max_bytes'] / 1024 / 1024) if s['max_bytes'] else None,
+            '적중': s['hits'],
+            '미스': s['misses'],
+            '축출': s['evictions'],
+            '적중률': f"{s['hit_rate']:.0%}" if s['hit_rate'] is not None else "–",
+        })
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
+    source = get_data_source()
+    pool = getattr(source, 'pool', None)
+    pool_txt = f" · 커넥션 {pool.stats()['created']}/{pool.max_size}" if pool else ""
+    st.caption(f"데이터 소스: {source.describe()}{pool_txt}")
+
+
+# 그림 전송 모드 — 느린 네트워크용 라이트 JSON(반올림 · 텍스트 템플릿 · 테마 축소) 또는 서버 렌더링 PNG
+RENDER_MODE_LABELS = {'full': "전체", 'lite': "라이트", 'image': "정적 이미지"}
+
+
+def show_figure(fig):
+    """plotly 그림 표시 (사이드바 전송 모드 적용, 이번 실행의 전송량 기록)"""
+    mode = st.session_state.get('render_mode', 'full')
+    payload, size, full_size = figure_payload(fig, mode)
+    st.session_state.setdefault('_figure_payloads', []).append((size, full_size))
+    if mode == 'image':
+        st.image(payload, use_container_width=True)
+    else:
+        st.plotly_chart(payload, use_container_width=True, config={'displayModeBar': False})
+
+
+def render_payload_summary():
+    """이번 실행에서 보낸 그림 전송량 (라이트 · 이미지 모드는 전체 모드 대비)"""
+    sizes = st.session_state.get('_figure_payloads', [])
+    if not sizes:
+        return
+    sent, full = sum(s for s, _ in sizes), sum(f for _, f in sizes)
+    mode = st.session_state.get('render_mode', 'full')
+    if mode == 'full':
+        st.sidebar.caption(f"📦 이 화면 그림 {len(sizes)}개 · 전송 {full / 1024:,.1f} KB")
+    else:
+        st.sidebar.caption(f"📦 이 화면 그림 {len(sizes)}개 · {RENDER_MODE_LABELS[mode]} {sent / 1024:,.1f} KB "
+                           f"(전체 모드 {full / 1024:,.1f} KB 대비 {1 - sent / full:.0%} 감소)")
+
+
+# 서버 측 페이지 분할 표 — 캐시된 원본 DF를 숫자 키로 필터·정렬하고, 현재 페이지 행만 표시용으로 변환해 전송
+def render_paged_table(frame, key, format_rows, sort_options, default_sort=None, ascending=False):
+    """sort_options: {숫자 컬럼: 표시명} (정렬·필터 키), format_rows: 페이지 DF → 표시 DF"""
+    names = list(sort_options)
+    ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([2, 1, 2, 1])
+    with ctrl1:
+        sort_col = st.selectbox("정렬 기준", names, index=names.index(default_sort) if default_sort in names else 0,
+                                format_func=sort_options.get, key=f"{key}_sort")
+    with ctrl2:
+        direction = st.radio("순서", ["내림차순", "오름차순"], index=1 if ascending else 0,
+                             horizontal=True, key=f"{key}_order")
+    with ctrl3:
+        filter_col = st.selectbox("범위 필터", [None] + names, key=f"{key}_filter_col",
+                                  format_func=lambda c: "없음" if c is None else sort_options[c])
+    with ctrl4:
+        page_size = st.selectbox("페이지당 행", PAGE_SIZES, key=f"{key}_page_size")
+
+    filters = {}
+    bounds = numeric_range(frame, filter_col) if filter_col else None
+    if bounds and bounds[0] < bounds[1]:
+        filters[filter_col] = st.slider(f"{sort_options[filter_col]} 범위", bounds[0], bounds[1], bounds,
+                                        key=f"{key}_range_{filter_col}")
+
+    rows = ordered_rows(frame, sort_col, direction == "오름차순", filters)
+    n_pages = page_count(len(rows), page_size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = 1
+    visible, start = page_rows(rows, st.session_state.get(page_key, 1), page_size)
+
+    st.dataframe(format_rows(frame.iloc[visible]), use_container_width=True, hide_index=True)
+    info_col, page_col = st.columns([3, 1])
+    with page_col:
+        st.number_input("페이지", min_value=1, max_value=n_pages, step=1, key=page_key, label_visibility="collapsed")
+    info_col.caption(f"총 {len(rows):,}행 중 {start + 1 if len(rows) else 0:,}–{start + len(visible):,} "
+                     f"· {st.session_state.get(page_key, 1)}/{n_pages} 페이지 (전체 {len(frame):,}행)")
+
+
+# 상세현황 표 정렬·필터 키
+OVERVIEW_SORT_OPTIONS = {'kr_tech_level': "한국 기술수준(%)", 'kr_tech_gap': "한국 기술격차(년)",
+                         'detail_count': "세부기술 수", **{f'{c}_tech_level': f"{COUNTRY_LABELS[c]} 기술수준(%)"
+                                                          for c in ('cn', 'jp', 'us', 'eu')}}
+DETAIL_SORT_OPTIONS = {key: label for key, label in OVERVIEW_SORT_OPTIONS.items() if key in DETAIL_VIEW_COLUMNS}
+
+
+# What-if 시나리오 화면
+SCENARIO_COLUMNS = ['대상', '국가', '기술수준 Δ(%p)', '기술격차 Δ(년)']
+
+
+def _rows_to_adjustments(rows):
+    adjustments = []
+    for _, r in rows.iterrows():
+        if not isinstance(r['대상'], str) or not r['대상']:
+            continue
+        adjustments.append({
+            'target': r['대상'],
+            'country': COUNTRY_CODE_MAP.get(r['국가'], 'kr'),
+            'level_delta': float(r['기술수준 Δ(%p)']) if pd.notna(r['기술수준 Δ(%p)']) else 0.0,
+            'gap_delta': float(r['기술격차 Δ(년)']) if pd.notna(r['기술격차 Δ(년)']) else 0.0,
+        })
+    return adjustments
+
+
+def _adjustments_to_rows(adjustments):
+    return pd.DataFrame([{
+        '대상': a['target'],
+        '국가': COUNTRY_LABELS.get(a.get('country', 'kr'), '한국'),
+        '기술수준 Δ(%p)': float(a.get('level_delta') or 0.0),
+        '기술격차 Δ(년)': float(a.get('gap_delta') or 0.0),
+    } for a in adjustments], columns=SCENARIO_COLUMNS)
+
+
+def render_scenario_view(data_version):
+    st.subheader("🎛️ What-if 시나리오 — 기술수준·격차 조정 시뮬레이션")
+    st.markdown("""
+    <div class="story-box">
+        <p>범위·중분류·세부기술 단위로 국가별 기술수준(%p)과 기술격차(년)를 조정하면
+        메인 대시보드의 평균, 선도 분야 수, 순위, 그래프가 즉시 재계산됩니다.
+        한국 기술수준이 실제로 바뀐 세부기술만 기술그룹을 다시 판정합니다 — 올리면 상위 그룹의 (조사연도별) 수준
+        중앙값을 넘을 때 승격, 내리면 하위 그룹 중앙값 아래로 내려갈 때 강등, 그 밖에는 원래 그룹을 유지합니다.
+        최고보유국도 최고 수준 국가 구성이 바뀐 세부기술만 갱신하며, 공동 보유는 '미국 EU' 처럼 함께 표기합니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    base = get_scenario_base(data_version)
+    baseline = get_scenario_baseline(data_version)
+
+    if 'scenario_rows' not in st.session_state:
+        st.session_state['scenario_rows'] = _adjustments_to_rows([])
+
+    # ----- 저장/불러오기 -----
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 2, 2])
+    with ctrl1:
+        scope = st.selectbox("📊 분석 범위", list(SCOPE_TYPES), key="scenario_scope")
+    with ctrl2:
+        saved = list_scenarios()
+        load_col, load_btn = st.columns([3, 1])
+        sel_saved = load_col.selectbox("저장된 시나리오", options=saved, index=None,
+                                       placeholder="불러올 시나리오 선택", key="scenario_saved")
+        load_btn.markdown("<br>", unsafe_allow_html=True)
+        if load_btn.button("불러오기", disabled=sel_saved is None, key="scenario_load"):
+            st.session_state['scenario_rows'] = _adjustments_to_rows(load_scenario(sel_saved))
+            st.session_state.pop('scenario_editor', None)
+            st.rerun()
+    with ctrl3:
+        name_col, save_btn = st.columns([3, 1])
+        scenario_name = name_col.text_input("시나리오 이름", key="scenario_name",
+                                            placeholder="예: 수소·전력저장 격차 1년 단축")
+
+    rows = st.data_editor(
+        st.session_state['scenario_rows'],
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        key="scenario_editor",
+        column_config={
+            '대상': st.column_config.SelectboxColumn("대상", options=target_options(base), required=True, width="large"),
+            '국가': st.column_config.SelectboxColumn("국가", options=list(COUNTRY_CODE_MAP), default='한국', required=True),
+            '기술수준 Δ(%p)': st.column_config.NumberColumn("기술수준 Δ(%p)", step=0.5, default=0.0, format="%+.1f"),
+            '기술격차 Δ(년)': st.column_config.NumberColumn("기술격차 Δ(년)", step=0.5, default=0.0, format="%+.1f"),
+        },
+    )
+    adjustments = _rows_to_adjustments(rows)
+
+    save_btn.markdown("<br>", unsafe_allow_html=True)
+    if save_btn.button("저장", disabled=not scenario_name or not adjustments, key="scenario_save"):
+        save_scenario(scenario_name, adjustments)
+        st.success(f"'{scenario_name}' 시나리오를 저장했습니다.")
+
+    # ----- 재계산 (벡터 연산) -----
+    started = time.perf_counter()
+    scenario_cat, _ = apply_scenario(base, adjustments)
+    kpi = scenario_kpis(scenario_cat, scope)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    base_kpi = scenario_kpis(baseline, scope)
+    st.caption(f"⏱️ 재계산 {elapsed_ms:.1f} ms · 조정 {len(adjustments)}건")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("🇰🇷 평균 기술수준", f"{kpi['avg_kr_level']:.1f}%",
+              delta=f"{kpi['avg_kr_level'] - base_kpi['avg_kr_level']:+.2f}%p")
+    c2.metric("⏱️ 평균 기술격차", f"{kpi['avg_kr_gap']:.2f}년",
+              delta=f"{kpi['avg_kr_gap'] - base_kpi['avg_kr_gap']:+.2f}년", delta_color="inverse")
+    c3.metric("🥇 선도 기술분야", f"{kpi['leading_count']}개",
+              delta=f"{kpi['leading_count'] - base_kpi['leading_count']:+d}개")
+    c4.metric("🏅 5개국 중 순위", f"{kpi['kr_rank']}위",
+              delta=f"{base_kpi['kr_rank'] - kpi['kr_rank']:+d}")
+
+    type_value = SCOPE_TYPES[scope]
+    scoped = scenario_cat if type_value is None else scenario_cat[scenario_cat['type'] == type_value]
+
+    left_col, center_col, right_col = st.columns([1, 2, 1], gap="large")
+    with left_col:
+        st.markdown("### 📊 시나리오 국가 비교")
+        show_figure(create_simple_bar_comparison(scoped, "기술수준 비교(%)", "tech_level"))
+        show_figure(create_simple_bar_comparison(scoped, "기술격차 비교(년)", "tech_gap"))
+
+    with center_col:
+        st.markdown("### 📋 변동 중분류")
+        merged = baseline.merge(scenario_cat, on=['tech_category', 'type'], suffixes=('_base', '_sc'))
+        if type_value is not None:
+            merged = merged[merged['type'] == type_value]
+        changed = merged[
+            (merged['kr_tech_level_sc'] - merged['kr_tech_level_base']).abs().gt(1e-9) |
+            (merged['kr_tech_gap_sc'] - merged['kr_tech_gap_base']).abs().gt(1e-9) |
+            (merged['kr_tech_group_sc'] != merged['kr_tech_group_base']) |
+            (merged['kr_rank_sc'] != merged['kr_rank_base'])
+        ]
+        if changed.empty:
+            st.info("조정 항목을 추가하면 변동된 중분류가 표시됩니다.")
+        else:
+            view = pd.DataFrame({
+                '중분류': changed['tech_category'],
+                '기술수준(기준)': changed['kr_tech_level_base'],
+                '기술수준(시나리오)': changed['kr_tech_level_sc'],
+                '기술격차(기준)': changed['kr_tech_gap_base'],
+                '기술격차(시나리오)': changed['kr_tech_gap_sc'],
+                '그룹': changed['kr_tech_group_base'] + " → " + changed['kr_tech_group_sc'],
+                '순위': changed['kr_rank_base'].astype(str) + "위 → " + changed['kr_rank_sc'].astype(str) + "위",
+                '최고보유국': changed['leading_country_base'] + " → " + changed['leading_country_sc'],
+            })
+            st.dataframe(view.style.format({c: "{:.1f}" for c in view.columns if '(' in c}, na_rep="-"),
+                         use_container_width=True, hide_index=True, height=520)
+
+    with right_col:
+        st.markdown("### 🔥 시나리오 히트맵 (상위 15)")
+        show_figure(create_enhanced_heatmap(scoped, f"{SCOPE_CONTEXT[scope]} 시나리오 히트맵"))
+
+
+# 기술 군집 화면
+CLUSTER_METRIC_LABELS = {'tech_level': '수준', 'tech_gap': '격차', 'basic_research': '기초연구', 'applied_research': '응용연구'}
+CLUSTER_METHOD_LABELS = {'kmeans': 'k-means', 'ward': '계층적 (Ward)'}
+
+
+def profile_label(col):
+    code, metric = col.split('_', 1)
+    return f"{COUNTRY_LABELS[code]} {CLUSTER_METRIC_LABELS[metric]}"
+
+
+def render_cluster_view(data_version):
+    import plotly.express as px
+    import plotly.graph_objects as go
+    st.subheader("🧩 기술 군집 — 5개국 역량 프로파일 기반")
+    st.markdown("""
+    <div class="story-box">
+        <p>한국 기술수준 하나가 아니라 5개국의 기술수준·기술격차·기초/응용 연구역량(20개 지표)을 표준화해
+        유사한 프로파일의 기술끼리 묶습니다. 군집 번호는 중심의 한국 기술수준이 높은 순(C1)입니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    df, _ = load_climate_tech_data()
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 2])
+    with ctrl1:
+        level = st.radio("군집 단위", list(CLUSTER_LEVELS), horizontal=True, key="cluster_level")
+    with ctrl2:
+        n_rows = len(get_scope_slice(data_version, '전체')) if level == "중분류" else len(df)
+        methods = [m for m in CLUSTER_METHODS if m == 'kmeans' or n_rows <= WARD_MAX_ROWS]
+        method = st.selectbox("군집 방법", methods, format_func=CLUSTER_METHOD_LABELS.get, key="cluster_method")
+    with ctrl3:
+        k = st.slider("군집 수 (k)", *CLUSTER_K_RANGE, value=CLUSTER_DEFAULT_K, key="cluster_k")
+
+    started = time.perf_counter()
+    result = get_clusters(data_version, level, method, k)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    name_col = CLUSTER_LEVELS[level]
+    st.caption(f"{n_rows:,}개 {level} · {CLUSTER_METHOD_LABELS[method]} · 군집 내 제곱거리 합 {result['inertia']:.1f}"
+               f" · 조회 {elapsed_ms:.1f} ms")
+
+    left_col, right_col = st.columns([3, 2], gap="large")
+    with left_col:
+        st.markdown("### 🗺️ 군집 분포 (PCA 2차원 투영)")
+        fig = px.scatter(result['projection'], x='pc1', y='pc2', color='cluster', hover_name=name_col,
+                         category_orders={'cluster': list(result['centroids']['cluster'])},
+                         labels={'pc1': '주성분 1', 'pc2': '주성분 2', 'cluster': '군집'})
+        fig.update_traces(marker=dict(size=9 if level == "중분류" else 6, opacity=0.8))
+        fig.update_layout(height=480)
+        show_figure(fig)
+
+        st.markdown("### 🎯 군집 중심 (표준화 점수)")
+        z = result['centroids_z']
+        raw = result['centroids'].set_index('cluster')[PROFILE_COLUMNS]
+        heat = go.Figure(data=go.Heatmap(
+            z=z.to_numpy(),
+            x=[profile_label(c) for c in PROFILE_COLUMNS],
+            y=[f"{c} ({n}개)" for c, n in zip(result['centroids']['cluster'], result['centroids']['size'])],
+            colorscale='RdBu', zmid=0,
+            text=raw.to_numpy().round(1), texttemplate="%{text}",
+            colorbar=dict(title=dict(text="z"))
+        ))
+        heat.update_layout(height=max(300, 60 * len(z) + 120), xaxis=dict(tickangle=-45))
+        show_figure(heat)
+
+    with right_col:
+        st.markdown("### 📋 군집 구성")
+        clusters = list(result['centroids']['cluster'])
+        sel_cluster = st.selectbox("군집 선택", clusters, key="cluster_pick")
+        centroid = result['centroids'].set_index('cluster').loc[sel_cluster]
+        m1, m2, m3 = st.columns(3)
+        m1.metric("구성 수", f"{int(centroid['size'])}개")
+        m2.metric("🇰🇷 평균 기술수준", f"{centroid['kr_tech_level']:.1f}%")
+        m3.metric("⏱️ 평균 기술격차", f"{centroid['kr_tech_gap']:.1f}년")
+
+        members = result['members']
+        members = members[members['cluster'] == sel_cluster].sort_values('distance')
+        view = members.drop(columns='cluster').rename(columns={
+            'tech_category': '중분류', 'tech_detail': '세부기술', 'type': '구분', 'distance': '중심 거리'})
+        st.dataframe(view.style.format({'중심 거리': "{:.2f}"}), use_container_width=True,
+                     hide_index=True, height=420)
+
+        st.markdown("### 📐 군집 중심 (원 단위)")
+        table = result['centroids'].rename(columns={'cluster': '군집', 'size': '구성 수'})
+        table = table.rename(columns={c: profile_label(c) for c in PROFILE_COLUMNS})
+        st.dataframe(table.style.format({profile_label(c): "{:.1f}" for c in PROFILE_COLUMNS}),
+                     use_container_width=True, hide_index=True)
+
+
+# 연구개발 역량지수 화면
+CAPACITY_MEASURES = {'capacity': "종합지수(점)", 'capacity_rel': "상대지수(최고국=100)"}
+
+
+def render_capacity_view(data_version):
+    import plotly.express as px
+    import plotly.graph_objects as go
+    st.subheader("🧪 연구개발 역량지수 — 기초·응용 연구역량 종합")
+    st.markdown("""
+    <div class="story-box">
+        <p>국가별 기초 연구역량과 응용 개발 연구역량(점)을 같은 비중으로 합친 종합지수입니다.
+        상대지수는 세부기술마다 최고 역량 국가를 100으로 둔 값으로, 기술수준(%)과 같은 눈금에서 비교할 수 있습니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    index = get_capacity_index(data_version)
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 1])
+    with ctrl1:
+        scope = st.selectbox("📊 분석 범위", list(SCOPE_TYPES), key="capacity_scope")
+    with ctrl2:
+        measure = st.radio("지수", list(CAPACITY_MEASURES), format_func=CAPACITY_MEASURES.get,
+                           horizontal=True, key="capacity_measure")
+    with ctrl3:
+        country_name = st.selectbox("상관 분석 국가", list(COUNTRY_CODE_MAP), key="capacity_country")
+    code = COUNTRY_CODE_MAP[country_name]
+    measure_label = CAPACITY_MEASURES[measure]
+    unit = "점" if measure == 'capacity' else ""
+
+    scopes = index['scopes'][index['scopes']['scope'] == scope].set_index('country')
+    cols = st.columns(len(COUNTRY_CODE_MAP))
+    for col, (name, c) in zip(cols, COUNTRY_CODE_MAP.items()):
+        col.metric(f"{name} {measure_label}", f"{scopes.loc[c, measure]:.1f}{unit}",
+                   help=f"기술수준 {scopes.loc[c, 'tech_level']:.1f}%")
+
+    type_value = SCOPE_TYPES[scope]
+    categories = index['categories']
+    details = index['details']
+    if type_value is not None:
+        categories = categories[categories['type'] == type_value]
+        details = details[details['type'] == type_value]
+
+    left_col, right_col = st.columns([3, 2], gap="large")
+    with left_col:
+        st.markdown(f"### 📊 국가별 {measure_label} · 기술수준")
+        bars = pd.DataFrame({
+            '국가': [COUNTRY_LABELS[c] for c in scopes.index] * 2,
+            '지표': [measure_label] * len(scopes) + ["기술수준(%)"] * len(scopes),
+            '값': list(scopes[measure]) + list(scopes['tech_level']),
+        })
+        fig = px.bar(bars, x='국가', y='값', color='지표', barmode='group', text_auto='.1f')
+        fig.update_layout(height=380, legend=dict(orientation='h', y=1.1))
+        show_figure(fig)
+
+        st.markdown(f"### 🔥 중분류 × 국가 {measure_label}")
+        order = [c for c in CATEGORY_ORDER if c in set(categories['tech_category'])]
+        order += sorted(set(categories['tech_category']) - set(order))
+        heat_df = categories.set_index('tech_category').loc[order]
+        value_cols = [capacity_columns(c)[0 if measure == 'capacity' else 1] for c in COUNTRY_CODE_MAP.values()]
+        heat = go.Figure(data=go.Heatmap(
+            z=heat_df[value_cols].to_numpy(), x=list(COUNTRY_CODE_MAP), y=order,
+            colorscale='RdYlGn', text=heat_df[value_cols].to_numpy().round(1), texttemplate="%{text}",
+            colorbar=dict(title=dict(text=unit or "지수"))
+        ))
+        heat.update_layout(height=max(360, 22 * len(order) + 120), yaxis=dict(autorange='reversed'))
+        show_figure(heat)
+
+    with right_col:
+        corr = index['correlation'].set_index('country')
+        st.markdown(f"### 🔗 {country_name} 역량지수 ↔ 기술수준")
+        cap_col, rel_col = capacity_columns(code)
+        x_col = cap_col if measure == 'capacity' else rel_col
+        scatter = px.scatter(details, x=x_col, y=f'{code}_tech_level', color='type', hover_name='tech_detail',
+                             hover_data={'tech_category': True, 'type': False},
+                             labels={x_col: measure_label, f'{code}_tech_level': "기술수준(%)",
+                                     'type': '구분', 'tech_category': '중분류'})
+        scatter.update_traces(marker=dict(size=7, opacity=0.75))
+        scatter.update_layout(height=380, legend=dict(orientation='h', y=1.1))
+        show_figure(scatter)
+        st.caption(f"전체 세부기술 기준 종합지수-기술수준 Pearson r = {corr.loc[code, 'r_detail']:.2f} "
+                   f"(n={int(corr.loc[code, 'n_detail'])}) · 중분류 평균 기준 r = {corr.loc[code, 'r_category']:.2f}")
+
+        st.markdown("### 📐 국가별 상관계수")
+        st.dataframe(pd.DataFrame({
+            '국가': [COUNTRY_LABELS[c] for c in corr.index],
+            '세부기술 r': corr['r_detail'].to_numpy(),
+            '중분류 r': corr['r_category'].to_numpy(),
+        }).style.format({'세부기술 r': "{:.2f}", '중분류 r': "{:.2f}"}), use_container_width=True, hide_index=True)
+
+        # 기술수준에 비해 연구역량이 약한 분야 (상대지수 기준, 같은 눈금)
+        st.markdown(f"### ⚠️ {country_name} 수준 대비 역량 약세 분야")
+        gap = categories.assign(diff=categories[f'{code}_tech_level'] - categories[rel_col])
+        weak = gap.nlargest(10, 'diff')[['tech_category', f'{code}_tech_level', rel_col, 'diff']]
+        st.dataframe(weak.rename(columns={'tech_category': '중분류', f'{code}_tech_level': '기술수준(%)',
+                                          rel_col: '상대 역량지수', 'diff': '괴리'})
+                     .style.format({'기술수준(%)': "{:.1f}", '상대 역량지수': "{:.1f}", '괴리': "{:+.1f}"}),
+                     use_container_width=True, hide_index=True)
+
+
+# 국가 쌍 비교 화면
+def render_pair_view(data_version):
+    import plotly.express as px
+    st.subheader("🤼 국가 쌍 비교 — 두 나라만 맞대어 보기")
+
+    names = list(COUNTRY_CODE_MAP)
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 1])
+    with ctrl1:
+        name_a = st.selectbox("기준 국가", names, index=names.index('한국'), key="pair_a")
+    with ctrl2:
+        name_b = st.selectbox("상대 국가", names, index=names.index('일본'), key="pair_b")
+    with ctrl3:
+        scope = st.selectbox("📊 분석 범위", list(SCOPE_TYPES), key="pair_scope")
+    if name_a == name_b:
+        st.info("서로 다른 두 국가를 선택하세요.")
+        return
+
+    started = time.perf_counter()
+    result = pair_comparison(get_pair_tensor(data_version), COUNTRY_CODE_MAP[name_a], COUNTRY_CODE_MAP[name_b], scope)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    details, categories, counts = result['details'], result['categories'], result['counts']
+    st.caption(f"{SCOPE_CONTEXT[scope]} · 세부기술 {len(details)}개 · 중분류 {len(categories)}개 · "
+               f"조회 {elapsed_ms:.1f} ms (20개 국가 쌍 사전 계산)")
+
+    def record(outcome):
+        wins, losses, ties = outcome
+        return f"{wins}승 {losses}패" + (f" {ties}무" if ties else "")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("기술수준 우위 (세부기술)", record(counts['detail']['tech_level']))
+    c2.metric("기술격차 우위 (세부기술)", record(counts['detail']['tech_gap']), help="격차가 작은 쪽이 우위")
+    c3.metric("평균 기술수준 차이", f"{details['tech_level_diff'].mean():+.1f}%p",
+              help=f"{name_a} − {name_b} · 중분류 기준 {record(counts['category']['tech_level'])}")
+    c4.metric("평균 기술격차 차이", f"{details['tech_gap_diff'].mean():+.2f}년",
+              help=f"{name_a} − {name_b} · 중분류 기준 {record(counts['category']['tech_gap'])}")
+
+    left_col, right_col = st.columns([3, 2], gap="large")
+    with left_col:
+        st.markdown(f"### 📊 중분류별 기술수준 차이 ({name_a} − {name_b})")
+        ordered = categories.sort_values('tech_level_diff')
+        fig = px.bar(ordered, x='tech_level_diff', y='tech_category', orientation='h',
+                     color=ordered['tech_level_diff'] >= 0,
+                     color_discrete_map={True: '#2E86AB', False: '#E74C3C'},
+                     hover_data={'tech_gap_diff': ':.2f', 'detail_count': True},
+                     labels={'tech_level_diff': '기술수준 차이(%p)', 'tech_category': '중분류',
+                             'tech_gap_diff': '기술격차 차이(년)', 'detail_count': '세부기술 수'})
+        fig.update_layout(height=max(360, 22 * len(ordered) + 100), showlegend=False)
+        show_figure(fig)
+
+    with right_col:
+        detail_cols = {'tech_category': '중분류', 'tech_detail': '세부기술',
+                       'tech_level_diff': '수준 차이(%p)', 'tech_gap_diff': '격차 차이(년)'}
+        fmt = {'수준 차이(%p)': "{:+.1f}", '격차 차이(년)': "{:+.2f}"}
+        st.markdown(f"### 🥇 {name_a} 최대 우위")
+        st.dataframe(result['advantages'][list(detail_cols)].rename(columns=detail_cols).style.format(fmt),
+                     use_container_width=True, hide_index=True)
+        st.markdown(f"### 🔻 {name_a} 최대 열위")
+        st.dataframe(result['deficits'][list(detail_cols)].rename(columns=detail_cols).style.format(fmt),
+                     use_container_width=True, hide_index=True)
+
+    tab_cat, tab_detail = st.tabs(["중분류 비교", "세부기술 비교"])
+    outcome = {1.0: f"{name_a} 우위", -1.0: f"{name_b} 우위"}
+    with tab_cat:
+        table = categories.assign(advantage=categories['advantage'].map(outcome).fillna("혼재"))
+        st.dataframe(table.rename(columns={'tech_category': '중분류', 'type': '구분', 'detail_count': '세부기술 수',
+                                           'tech_level_diff': '수준 차이(%p)', 'tech_gap_diff': '격차 차이(년)',
+                                           'advantage': '판정'}).style.format(fmt),
+                     use_container_width=True, hide_index=True)
+    with tab_detail:
+        table = details.assign(advantage=details['advantage'].map(outcome).fillna("혼재"))
+        st.dataframe(table.rename(columns={'type': '구분', 'advantage': '판정', **detail_cols}).style.format(fmt),
+                     use_container_width=True, hide_index=True, height=520)
+
+
+HIERARCHY_CHARTS = ["선버스트", "트리맵"]
+HIERARCHY_DEPTH_RANGE = (1, 3)
+
+
+# 계층 탐색 화면 (선버스트/트리맵)
+def render_hierarchy_view(data_version):
+    import plotly.graph_objects as go
+    st.subheader("🌳 계층 탐색 — 구분 → 중분류 → 세부기술")
+
+    tree = get_hierarchy_tree(data_version)
+    ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([1, 1, 1, 1])
+    with ctrl1:
+        chart = st.radio("차트", HIERARCHY_CHARTS, horizontal=True, key="hier_chart")
+    with ctrl2:
+        country_name = st.selectbox("국가", list(COUNTRY_CODE_MAP), key="hier_country")
+    with ctrl3:
+        metric = st.selectbox("색상 지표", list(CLUSTER_METRIC_LABELS), format_func=CLUSTER_METRIC_LABELS.get,
+                              key="hier_metric")
+    with ctrl4:
+        depth = st.slider("표시 깊이", *HIERARCHY_DEPTH_RANGE, value=2, key="hier_depth")
+
+    branches = tree[tree['level'] < 3]
+    root_node = st.selectbox("시작 노드", branches['node'].tolist(), format_func=lambda n: node_path(tree, n),
+                             key="hier_root")
+    col = f"{COUNTRY_CODE_MAP[country_name]}_{metric}"
+    label = profile_label(col)
+
+    started = time.perf_counter()
+    sub = subtree(tree, root_node, max_depth=depth)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    st.caption(f"{node_path(tree, root_node)} · 노드 {len(sub):,}개 · 조회 {elapsed_ms:.1f} ms (데이터 버전별 트리 1회 집계)")
+
+    ids = sub['node'].astype(str)
+    parents = sub['parent'].astype(str).where(sub['node'] != root_node, "")
+    colorscale = 'RdYlGn_r' if metric == 'tech_gap' else 'RdYlGn'
+    common = dict(
+        ids=ids, labels=sub['label'], parents=parents, values=sub['detail_count'], branchvalues='total',
+        marker=dict(colors=sub[col], colorscale=colorscale, showscale=True, colorbar=dict(title=dict(text=label))),
+        customdata=sub[[col, count_column(col)]].round(2).to_numpy(),
+        hovertemplate="<b>%{label}</b><br>세부기술 %{value}개<br>" + label + " %{customdata[0]}"
+                      "<br>유효 값 %{customdata[1]}개<extra></extra>",
+    )
+    trace = go.Sunburst(**common) if chart == "선버스트" else go.Treemap(**common)
+    fig = go.Figure(trace)
+    fig.update_layout(height=640, margin=dict(t=10, l=10, r=10, b=10))
+    show_figure(fig)
+
+    # 시작 노드의 바로 아래 단계 5개국 비교
+    children = sub[sub['parent'] == root_node]
+    if not children.empty:
+        st.markdown(f"### 📋 하위 {HIERARCHY_LEVELS[int(children['level'].iloc[0])]} — 5개국 {CLUSTER_METRIC_LABELS[metric]}")
+        cols = [f"{code}_{metric}" for code in COUNTRY_CODE_MAP.values()]
+        table = children[['label', 'detail_count'] + cols].rename(
+            columns={'label': '이름', 'detail_count': '세부기술 수', **{c: COUNTRY_LABELS[c.split('_', 1)[0]] for c in cols}})
+        st.dataframe(table.style.format({COUNTRY_LABELS[c.split('_', 1)[0]]: "{:.1f}" for c in cols}, na_rep="-"),
+                     use_container_width=True, hide_index=True)
+
+
+# 중분류 스몰 멀티플 화면
+def render_multiples_view(data_version):
+    st.subheader("🔲 중분류 한눈에 보기 — 전 중분류 5개국 비교")
+
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 1])
+    with ctrl1:
+        scope = st.selectbox("분석 범위", list(SCOPE_TYPES), key="multi_scope")
+    with ctrl2:
+        metric = st.radio("지표", ['tech_level', 'tech_gap'], horizontal=True, key="multi_metric",
+                          format_func={'tech_level': "기술수준(%)", 'tech_gap': "기술격차(년)"}.get)
+    with ctrl3:
+        sort = st.selectbox("정렬", list(MULTIPLES_SORTS), format_func=MULTIPLES_SORTS.get, key="multi_sort")
+
+    n_categories = len(get_scope_slice(data_version, scope))
+    st.caption(f"{SCOPE_CONTEXT[scope]} 중분류 {n_categories}개 · 막대 색: 한국·중국·일본·미국·EU · "
+               f"모든 칸이 같은 세로축 범위를 사용 (범위·지표·정렬별 그림 1개 캐시)")
+    show_figure(build_category_multiples(data_version, scope, metric, sort))
+    st.caption("세부기술 단위 비교는 🔬 기술분야별 분석 화면에서 중분류를 선택해 확인하세요.")
+
+
+# 지표 상관 분석 화면
+CORRELATION_LEVELS = {'detail': "세부기술", 'category': "중분류"}
+CORRELATION_METHOD_LABELS = {'pearson': "Pearson", 'spearman': "Spearman (순위)"}
+
+
+def render_correlation_view(data_version):
+    import plotly.express as px
+    import plotly.graph_objects as go
+    st.subheader("🔗 지표 상관 분석 — 국가 × 지표 상관행렬")
+    st.caption("기술수준 · 기술격차 · 기초연구 · 응용연구 × 5개국 20개 지표의 상관관계. "
+               "결측은 쌍별로 제외하며 유효 쌍이 3개 미만이면 빈 칸으로 표시합니다.")
+
+    ctrl1, ctrl2, ctrl3 = st.columns([1, 1, 1])
+    with ctrl1:
+        scope = st.selectbox("분석 범위", list(SCOPE_TYPES), key="corr_scope")
+    with ctrl2:
+        level = st.radio("분석 단위", list(CORRELATION_LEVELS), format_func=CORRELATION_LEVELS.get,
+                         horizontal=True, key="corr_level")
+    with ctrl3:
+        method = st.radio("상관계수", list(CORRELATION_METHODS), format_func=CORRELATION_METHOD_LABELS.get,
+                          horizontal=True, key="corr_method")
+    sel1, sel2 = st.columns([1, 1])
+    with sel1:
+        countries = st.multiselect("국가", list(COUNTRY_CODE_MAP), default=list(COUNTRY_CODE_MAP), key="corr_countries")
+    with sel2:
+        metrics = st.multiselect("지표", list(CLUSTER_METRIC_LABELS), default=list(CLUSTER_METRIC_LABELS),
+                                 format_func=CLUSTER_METRIC_LABELS.get, key="corr_metrics")
+
+    codes = {COUNTRY_CODE_MAP[c] for c in countries}
+    cols = [c for c in CORRELATION_COLUMNS if c.split('_', 1)[0] in codes and c.split('_', 1)[1] in metrics]
+    if len(cols) < 2:
+        st.info("국가 · 지표를 조합해 2개 이상의 지표를 선택하세요.")
+        return
+
+    result = get_correlations(data_version, scope)[level]
+    corr = result[method].loc[cols, cols]
+    counts = result['counts'].loc[cols, cols]
+    labels = [profile_label(c) for c in cols]
+
+    heat = go.Figure(go.Heatmap(
+        z=corr.round(2).to_numpy(), x=labels, y=labels, zmin=-1, zmax=1, zmid=0, colorscale='RdBu',
+        customdata=counts.to_numpy(), texttemplate="%{z:.2f}" if len(cols) <= 12 else None,
+        hovertemplate="%{y} × %{x}<br>r = %{z:.2f}<br>유효 쌍 %{customdata}개<extra></extra>",
+        colorbar=dict(title=dict(text="r")),
+    ))
+    heat.update_layout(height=max(420, 26 * len(cols) + 160), yaxis=dict(autorange='reversed'),
+                       margin=dict(t=20, l=10, r=10, b=10))
+    show_figure(heat)
+
+    # 드릴다운: 상관 상위 쌍 → 임의 두 지표 산점도
+    pairs = top_pairs(result, method, columns=cols)
+    list_col, scatter_col = st.columns([1, 2], gap="large")
+    with list_col:
+        st.markdown(f"### 📋 상관 상위 쌍 ({CORRELATION_METHOD_LABELS[method]})")
+        st.dataframe(pd.DataFrame({'지표 X': pairs['x'].map(profile_label), '지표 Y': pairs['y'].map(profile_label),
+                                   'r': pairs['r'].round(3), '유효 쌍': pairs['n']}),
+                     use_container_width=True, hide_index=True)
+
+    with scatter_col:
+        st.markdown("### 🔍 두 지표 산점도")
+        default_x, default_y = (pairs.at[0, 'x'], pairs.at[0, 'y']) if len(pairs) else (cols[0], cols[1])
+        pick1, pick2 = st.columns(2)
+        x_col = pick1.selectbox("X 지표", cols, index=cols.index(default_x), format_func=profile_label, key="corr_x")
+        y_col = pick2.selectbox("Y 지표", cols, index=cols.index(default_y), format_func=profile_label, key="corr_y")
+        if x_col == y_col:
+            st.info("서로 다른 두 지표를 선택하세요.")
+            return
+
+        frame = result['frame']
+        name_col = 'tech_detail' if level == 'detail' else 'tech_category'
+        points = frame[[name_col, 'type', x_col, y_col]].dropna(subset=[x_col, y_col])
+        st.caption(f"Pearson r = {result['pearson'].at[x_col, y_col]:.2f} · "
+                   f"Spearman ρ = {result['spearman'].at[x_col, y_col]:.2f} · "
+                   f"{CORRELATION_LEVELS[level]} {int(result['counts'].at[x_col, y_col])}개")
+        scatter = px.scatter(points, x=x_col, y=y_col, color='type', hover_name=name_col,
+                             labels={x_col: profile_label(x_col), y_col: profile_label(y_col), 'type': '구분'})
+        # 최소제곱 직선 (유효 쌍 기준)
+        if len(points) >= 2 and points[x_col].var() > 0:
+            slope = points[x_col].cov(points[y_col]) / points[x_col].var()
+            intercept = points[y_col].mean() - slope * points[x_col].mean()
+            x_line = [points[x_col].min(), points[x_col].max()]
+            scatter.add_trace(go.Scatter(x=x_line, y=[intercept + slope * x for x in x_line], mode='lines',
+                                         name="추세선", line=dict(color='#555', dash='dash')))
+        scatter.update_layout(height=480, margin=dict(t=20, l=10, r=10, b=10))
+        show_figure(scatter)
+
+
+# 전망 가정 입력 범위 (최소, 최대)
+PROJECTION_PACE_RANGE = (0.0, 3.0)
+PROJECTION_CATCHUP_RANGE = (0.0, 1.0)
+PROJECTION_CAP_RANGE = (10, 100)
+
+
+# 격차 해소 전망 화면
+def render_projection_view(data_version):
+    import plotly.express as px
+    st.subheader("⏳ 격차 해소 전망 — 연구개발 경향 기반 동등 수준 도달 기간")
+    st.markdown("""
+    <div class="story-box">
+        <p>각 국가의 연구개발 활동 경향(급상승·상승·유지·하강)을 연간 기술 진척 속도로 가정하고,
+        한국이 상대국별 격차를 따라잡는 기간과 최고기술국 수준(격차 0년)에 도달하는 기간을 추정합니다.
+        가정을 바꾸면 전 세부기술 × 국가 조합을 한 번에 다시 계산합니다.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    with st.expander("⚙️ 전망 가정", expanded=False):
+        cols = st.columns(len(TREND_LABELS) + 2)
+        paces = {}
+        for col, label in zip(cols, TREND_LABELS):
+            paces[label] = col.number_input(f"'{label}' 속도(년/년)", *PROJECTION_PACE_RANGE,
+                                            value=DEFAULT_TREND_PACE[label], step=0.05, key=f"proj_pace_{label}")
+        catchup = cols[-2].number_input("후발 추격 효과(년/년)", *PROJECTION_CATCHUP_RANGE,
+                                        value=DEFAULT_CATCHUP, step=0.05, key="proj_catchup")
+        cap = cols[-1].slider("전망 한도(년)", *PROJECTION_CAP_RANGE, value=int(HORIZON_CAP), step=5,
+                              key="proj_cap")
+
+    started = time.perf_counter()
+    result = get_gap_projection(data_version, *assumption_key(paces, catchup, cap))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    df, _ = load_climate_tech_data()
+    base_year = df['survey_year'].max() if 'survey_year' in df.columns else None
+    base_year = int(base_year) if pd.notna(base_year) else None
+
+    scope = st.selectbox("📊 분석 범위", list(SCOPE_TYPES), key="proj_scope")
+    type_value = SCOPE_TYPES[scope]
+    details = result['details']
+    categories = result['categories']
+    if type_value is not None:
+        details = details[details['type'] == type_value]
+        categories = categories[categories['type'] == type_value]
+
+    reached = details[details['reachable']]
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("✅ 이미 최고 수준", f"{int((details['horizon'] == 0).sum())}개")
+    c2.metric("⏳ 도달 기간 중앙값", f"{reached['horizon'].median():.1f}년" if len(reached) else "–")
+    c3.metric(f"🎯 {cap}년 내 도달", f"{len(reached)}개 / {len(details)}개")
+    c4.metric("⛔ 도달 불가", f"{int((~details['reachable']).sum())}개")
+    st.caption(f"기준 조사연도 {base_year or '미상'} · 계산 {elapsed_ms:.1f} ms (가정 집합별 캐시)")
+
+    tab_cat, tab_detail = st.tabs(["📋 중분류별 전망", "🔎 세부기술별 전망"])
+    with tab_cat:
+        chart = categories.dropna(subset=['median_horizon']).sort_values('median_horizon')
+        if not chart.empty:
+            fig = px.bar(chart, x='median_horizon', y='tech_category', orientation='h',
+                         color='reachable_share', color_continuous_scale='RdYlGn', range_color=[0, 1],
+                         labels={'median_horizon': '도달 기간 중앙값(년)', 'tech_category': '중분류',
+                                 'reachable_share': '도달 비율'})
+            fig.update_layout(height=max(400, 22 * len(chart)), yaxis=dict(autorange='reversed'))
+            show_figure(fig)
+
+        table = pd.DataFrame({
+            '구분': categories['type'],
+            '중분류': categories['tech_category'],
+            '세부기술 수': categories['detail_count'],
+            '한국 평균 격차(년)': categories['kr_tech_gap'],
+            '도달 기간 중앙값(년)': categories['median_horizon'],
+            '전 세부기술 도달(년)': categories['max_horizon'].replace(float('inf'), float('nan')),
+            '이미 최고 수준': categories['reached_now'],
+            '도달 불가': categories['unreachable'],
+            '도달 비율': categories['reachable_share'],
+        }).sort_values('도달 기간 중앙값(년)')
+        st.dataframe(
+            table.style.format({'한국 평균 격차(년)': "{:.1f}", '도달 기간 중앙값(년)': "{:.1f}",
+                                '전 세부기술 도달(년)': "{:.1f}", '도달 비율': "{:.0%}"}, na_rep="도달 불가"),
+            use_container_width=True, hide_index=True, height=520)
+
+    with tab_detail:
+        table = pd.DataFrame({
+            '중분류': details['tech_category'],
+            '세부기술': details['tech_detail'],
+            '한국 격차(년)': details['kr_tech_gap'],
+            '한국 경향': details['kr_rd_trend'],
+            **{f"{COUNTRY_LABELS[code]} 추월(년)": details[f'horizon_{code}'].replace(float('inf'), float('nan'))
+               for code in RIVALS},
+            '최고 수준 도달(년)': details['horizon'].replace(float('inf'), float('nan')),
+            '도달 예상연도': (base_year + details['horizon'].replace(float('inf'), float('nan'))).round()
+                              if base_year else None,
+            '마지막 상대국': details['bottleneck'].map(COUNTRY_LABELS),
+        }).sort_values('최고 수준 도달(년)')
+        num_cols = [c for c in table.columns if c.endswith('(년)')]
+        st.dataframe(
+            table.style.format({**{c: "{:.1f}" for c in num_cols}, '도달 예상연도': "{:.0f}"}, na_rep="도달 불가"),
+            use_container_width=True, hide_index=True, height=620)
+        st.caption("※ 표 머리글을 누르면 해당 기간 기준으로 정렬됩니다. '도달 불가'는 전망 한도 내 격차가 줄지 않는 경우입니다.")
+
+
+# 피벗 탐색기 화면
+def render_pivot_view(data_version):
+    import plotly.express as px
+    st.subheader("🧮 피벗 탐색기 — 차원·지표를 골라 바로 집계")
+
+    full_df, _ = load_survey_dataset()
+    years = sorted(int(y) for y in full_df['survey_year'].dropna().unique())
+
+    ctrl1, ctrl2, ctrl3 = st.columns([2, 1, 1])
+    with ctrl1:
+        rows = st.multiselect("행 차원", list(PIVOT_DIMENSIONS), default=['type', 'tech_category'],
+                              format_func=PIVOT_DIMENSIONS.get, key="pivot_rows")
+    with ctrl2:
+        column = st.selectbox("열 차원 (선택)", [None] + [d for d in PIVOT_DIMENSIONS if d not in rows],
+                              format_func=lambda d: "없음" if d is None else PIVOT_DIMENSIONS[d], key="pivot_column")
+    with ctrl3:
+        sel_years = st.multiselect("조사연도", years, default=years, key="pivot_years")
+
+    ctrl4, ctrl5, ctrl6 = st.columns([2, 1, 1])
+    with ctrl4:
+        metrics = st.multiselect("지표", list(PIVOT_METRICS), default=['kr_tech_level', 'kr_tech_gap'],
+                                 format_func=PIVOT_METRICS.get, key="pivot_metrics")
+    with ctrl5:
+        aggregations = st.multiselect("집계", list(PIVOT_AGGREGATIONS), default=['mean'],
+                                      format_func=AGGREGATION_NAMES.get, key="pivot_aggs")
+    with ctrl6:
+        engine = st.radio("쿼리 엔진", PIVOT_ENGINES, horizontal=True, key="pivot_engine",
+                          help="DuckDB(인프로세스 컬럼형 엔진)가 설치되어 있지 않으면 pandas로 실행합니다.")
+
+    if not metrics or not aggregations:
+        st.info("지표와 집계 방법을 1개 이상 선택하세요.")
+        return
+
+    # 전체 연도 선택은 필터 없음과 같은 질의로 취급 (캐시 공유)
+    year_filter = None if not sel_years or len(sel_years) == len(years) else sel_years
+    signature = query_signature(rows, metrics, aggregations, year_filter, column)
+    started = time.perf_counter()
+    result = get_pivot(data_version, signature, engine)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    table = result['table']
+
+    st.caption(f"엔진 {result['engine']} · 결과 {len(table):,}행 · {elapsed_ms:.1f} ms (질의 조건별 캐시)")
+    labeled = label_columns(table)
+    num_cols = [c for c in labeled.columns if pd.api.types.is_float_dtype(labeled[c])]
+    st.dataframe(labeled.style.format({c: "{:.2f}" for c in num_cols}, na_rep="-"),
+                 use_container_width=True, hide_index=True, height=520)
+    st.download_button("📥 CSV 내보내기", labeled.to_csv(index=False).encode('utf-8-sig'),
+                       file_name="pivot.csv", mime="text/csv", key="pivot_download")
+
+    # 행 차원 1개 · 열 차원 없음이면 첫 지표 막대그래프
+    if len(rows) == 1 and column is None and len(table) > 1:
+        first = result_column(metrics[0], aggregations[0])
+        fig = px.bar(table, x=rows[0], y=first,
+                     labels={rows[0]: PIVOT_DIMENSIONS[rows[0]],
+                             first: f"{PIVOT_METRICS[metrics[0]]} {AGGREGATION_NAMES[aggregations[0]]}"})
+        fig.update_layout(height=420)
+        show_figure(fig)
+
+
+# 관리자 화면 — rerun 프로파일 · 데이터 품질
+def _toggle_session_profiling():
+    # 위젯 상태는 화면을 떠나면 지워지므로 일반 세션 키로 보관
+    enabled = st.session_state.get('admin_profile_toggle')
+    st.session_state['profile_engine'] = st.session_state.get('admin_profile_engine') if enabled else None
+
+
+def render_admin_view(data_version):
+    st.subheader("🛠️ 관리자")
+    profile_tab, quality_tab, anomaly_tab = st.tabs(["⏱️ rerun 프로파일", "🧪 데이터 품질", "🚨 이상치 탐지"])
+    with profile_tab:
+        render_profile_admin()
+    with quality_tab:
+        render_data_quality(data_version)
+    with anomaly_tab:
+        render_anomalies(data_version)
+
+
+def render_profile_admin():
+    st.caption(f"켜진 세션의 rerun 마다 호출 트리를 `{PROFILE_DIR}/` 에 저장합니다 (위젯 상태 포함). "
+               f"URL에 `?{PROFILE_QUERY_PARAM}=1` (또는 엔진명)을 붙여도 켜집니다. 꺼져 있으면 추가 비용이 없습니다.")
+
+    ctrl1, ctrl2 = st.columns([1, 3])
+    with ctrl2:
+        st.selectbox("프로파일러", PROFILER_ENGINES, key="admin_profile_engine",
+                     help="cprofile: 결정적 호출 트리(pstats) · pyinstrument: 샘플링(speedscope JSON, 설치 시)",
+                     on_change=_toggle_session_profiling)
+    with ctrl1:
+        st.toggle("이 세션 프로파일링", value=st.session_state.get('profile_engine') is not None,
+                  key="admin_profile_toggle", on_change=_toggle_session_profiling)
+
+    profiles = list_profiles()
+    if not profiles:
+        st.info("저장된 프로파일이 없습니다.")
+        return
+
+    listing = pd.DataFrame([{
+        '시각': p['started_at'],
+        '엔진': p['engine'],
+        '화면': p.get('page') or '-',
+        '소요(ms)': p['elapsed_ms'],
+        '결과': p['outcome'],
+        '크기(KB)': round(p['size'] / 1024, 1),
+        '파일': p['file'],
+    } for p in profiles])
+    st.dataframe(listing, use_container_width=True, hide_index=True, height=260)
+
+    selected = st.selectbox("프로파일 선택", range(len(profiles)), key="admin_profile_file",
+                            format_func=lambda i: f"{profiles[i]['started_at']} · {profiles[i].get('page') or '-'} "
+                                                  f"· {profiles[i]['elapsed_ms']:.0f} ms")
+    meta = profiles[selected]
+    with open(meta['path'], 'rb') as f:
+        st.download_button("📥 프로파일 내려받기", f.read(), file_name=meta['file'],
+                           mime="application/octet-stream", key="admin_profile_download")
+
+    if meta['engine'] == 'cprofile':
+        sort = st.radio("정렬", ['cumulative', 'tottime'], horizontal=True, key="admin_profile_sort",
+                        format_func={'cumulative': "누적 시간", 'tottime': "자체 시간"}.get)
+        top = top_functions(meta['path'], sort=sort)
+        st.dataframe(top.style.format({'tottime_ms': "{:.1f}", 'cumtime_ms': "{:.1f}"}),
+                     use_container_width=True, hide_index=True)
+    else:
+        st.caption("speedscope JSON 은 https://www.speedscope.app 에서 열어 보세요.")
+
+    with st.expander("위젯 상태 · 쿼리 파라미터"):
+        st.json({'query_params': meta.get('query_params', {}), 'widget_state': meta.get('widget_state', {})})
+
+
+def render_data_quality(data_version):
+    report = get_data_quality(data_version)
+    summary = report['summary']
+    st.caption(f"데이터 버전 {data_version} · 전 조사연도 {summary['rows']:,}행 기준 (데이터 버전별 1회 계산)")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("숫자 변환 실패 셀", f"{summary['coerced_cells']:,}" if summary['tracked'] else "–",
+              help="값이 있었지만 숫자로 읽지 못해 결측 처리된 셀 (워크북 소스에서만 추적)")
+    c2.metric("결측 셀", f"{summary['missing_cells']:,}")
+    c3.metric("결측 있는 중분류", f"{summary['categories_with_missing']}개",
+              help=f"결측 지표가 있는 세부기술 {summary['details_with_missing']:,}개")
+    c4.metric("미등록 중분류", f"{summary['unknown_categories']}개", help="CATEGORY_ORDER 에 없는 중분류")
+    if not summary['tracked']:
+        st.info("현재 데이터 소스는 이미 숫자형으로 저장되어 있어 변환 실패 셀을 추적할 수 없습니다. 워크북 소스로 확인하세요.")
+
+    left, right = st.columns(2)
+    with left:
+        st.markdown("#### 컬럼별 변환 실패 · 결측")
+        columns = report['columns'].assign(country=lambda d: d['country'].map(COUNTRY_LABELS))
+        st.dataframe(columns.rename(columns={'column': '컬럼', 'country': '국가', 'metric': '지표',
+                                             'coerced': '변환 실패', 'missing': '결측', 'missing_share': '결측 비율'})
+                     .style.format({'결측 비율': "{:.1%}"}),
+                     use_container_width=True, hide_index=True, height=420)
+    with right:
+        st.markdown("#### 국가 × 지표 결측 셀")
+        st.dataframe(report['missing'].rename(index=COUNTRY_LABELS), use_container_width=True)
+        if not report['sources'].empty:
+            st.markdown("#### 변환 실패가 있는 시트")
+            st.dataframe(report['sources'].rename(columns={'source_file': '파일', 'source_sheet': '시트',
+                                                           'coerced_cells': '변환 실패'}),
+                         use_container_width=True, hide_index=True)
+
+    st.markdown("#### 결측 세부기술이 있는 중분류")
+    if report['categories'].empty:
+        st.success("결측 지표가 있는 세부기술이 없습니다.")
+    else:
+        st.dataframe(report['categories'].rename(columns={
+            'survey_year': '조사연도', 'tech_category': '중분류', 'details': '세부기술 수',
+            'details_with_missing': '결측 세부기술', 'missing_cells': '결측 셀', 'coerced_cells': '변환 실패'}),
+            use_container_width=True, hide_index=True)
+
+    st.markdown("#### 미등록 중분류 (CATEGORY_ORDER 외)")
+    if report['unknown_categories'].empty:
+        st.success("모든 중분류가 기준 목록에 있습니다.")
+    else:
+        st.dataframe(report['unknown_categories'].rename(columns={
+            'tech_category': '중분류', 'survey_year': '조사연도', 'details': '세부기술 수'}),
+            use_container_width=True, hide_index=True)
+
+
+ANOMALY_SORT_OPTIONS = {'abs_z': "최대 |z|", 'abs_residual': "수준-격차 잔차 |z|", 'kr_tech_level': "한국 기술수준(%)"}
+
+
+def render_anomalies(data_version):
+    report = get_anomalies(data_version)
+    summary = report['summary']
+    st.caption(f"데이터 버전 {data_version} · 전 조사연도 {summary['rows']:,}행 기준 (데이터 버전별 1회 계산) · "
+               f"조사연도별로 수정 z 점수 |z| > {ROBUST_Z_THRESHOLD}, 수준→격차 회귀 잔차 |z| > {RESIDUAL_Z_THRESHOLD}, "
+               f"한국 기술그룹이 인접 그룹 중앙값을 넘어선 수준이면 표시합니다. 값의 절반 이상이 같은 지표(최고기술국 100 등)는 z 판정에서 제외됩니다.")
+
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("판정 행", f"{summary['flagged_rows']:,}",
+              help=f"전체 {summary['rows']:,}행 중 {summary['flagged_rows'] / max(summary['rows'], 1):.1%}")
+    for col, kind in zip((c2, c3, c4), ANOMALY_LABELS):
+        col.metric(ANOMALY_LABELS[kind], f"{summary[kind]:,}")
+    if not summary['flagged_rows']:
+        st.success("이상치 · 불일치로 판정된 행이 없습니다.")
+        return
+
+    kinds = st.multiselect("판정 유형", list(ANOMALY_LABELS), default=list(ANOMALY_LABELS),
+                           format_func=ANOMALY_LABELS.get, key="admin_anomaly_kinds")
+    flags = report['flags']
+    flags = flags[flags[kinds].any(axis=1)] if kinds else flags.iloc[:0]
+    flags = flags.assign(abs_z=flags['max_z'].abs(), abs_residual=flags['residual_z'].abs())
+
+    st.markdown("#### 중분류별 판정 건수")
+    categories = report['categories']
+    st.dataframe(categories.rename(columns={'survey_year': '조사연도', 'tech_category': '중분류', 'details': '세부기술 수',
+                                            'flagged': '판정 행', **ANOMALY_LABELS}),
+                 use_container_width=True, hide_index=True, height=280)
+
+    st.markdown("#### 판정 행")
+
+    def format_flags(page_df):
+        return pd.DataFrame({
+            '조사연도': page_df['survey_year'], '중분류': page_df['tech_category'], '세부기술': page_df['tech_detail'],
+            '판정': page_df['reasons'], '한국 그룹': page_df['kr_tech_group'],
+            '한국 수준(%)': page_df['kr_tech_level'].round(1), '한국 격차(년)': page_df['kr_tech_gap'].round(1),
+            '최대 z 지표': page_df['max_z_column'].map(profile_label), '최대 z': page_df['max_z'].round(2),
+            '잔차 최대 국가': page_df['residual_country'].map(COUNTRY_LABELS), '잔차 z': page_df['residual_z'].round(2),
+        })
+
+    render_paged_table(flags, "anomaly_table", format_flags, ANOMALY_SORT_OPTIONS, default_sort='abs_z')
+
+
+TREND_LEVELS = ["중분류", "세부기술"]
+TREND_METRIC_LABELS = ["기술수준(%)", "기술격차(년)"]
+
+
+# 연도별 추이 화면
+def render_trend_view(data_version):
+    import plotly.express as px
+    st.subheader("📈 연도별 추이 — 조사 회차별 기술수준·격차 변화")
+
+    years = get_survey_years(data_version)
+    if not years:
+        st.info("조사연도가 확인되는 워크북이 없습니다. 파일명 또는 시트명에 연도(예: tracker2022.xlsx)를 포함해 주세요.")
+        return
+    if len(years) < 2:
+        st.info(f"현재 조사 회차는 {years[0]}년 1개입니다. 새 회차 워크북을 데이터 폴더에 추가하면 추이가 표시됩니다.")
+
+    # ----- 상단 컨트롤 -----
+    ctrl1, ctrl2, ctrl3, ctrl4 = st.columns([1, 1, 1, 2])
+    with ctrl1:
+        scope = st.selectbox("📊 분석 범위", list(SCOPE_TYPES), key="trend_scope")
+    with ctrl2:
+        level = st.radio("집계 단위", TREND_LEVELS, horizontal=True, key="trend_level")
+    with ctrl3:
+        metric_label = st.radio("지표", TREND_METRIC_LABELS, horizontal=True, key="trend_metric")
+    with ctrl4:
+        sel_years = st.multiselect("조사연도", options=years, default=years, key="trend_years")
+
+    countries = st.multiselect("🌍 국가", options=list(COUNTRY_CODE_MAP.keys()), default=['한국'],
+                               key="trend_countries")
+    if not sel_years or not countries:
+        st.info("조사연도와 국가를 1개 이상 선택하세요.")
+        return
+
+    metric = 'tech_level' if metric_label.startswith("기술수준") else 'tech_gap'
+    unit = "%" if metric == 'tech_level' else "년"
+    value_cols = [f"{COUNTRY_CODE_MAP[c]}_{metric}" for c in countries]
+    scope_type = {'감축기술': '감축', '적응기술': '적응'}.get(scope)
+
+    # ----- 범위 요약: 연도별 사전 집계(scope 파티션)만 읽음 -----
+    summary = load_year_partitions(data_version, tuple(sel_years), 'scope',
+                                   tuple(['scope', 'leading_count'] + value_cols))
+    summary = summary[summary['scope'] == scope].sort_values('survey_year')
+    if not summary.empty:
+        cols = st.columns(len(countries))
+        for col, ctry, vcol in zip(cols, countries, value_cols):
+            last = summary.iloc[-1]
+            delta = None
+            if len(summary) > 1:
+                delta = f"{last[vcol] - summary.iloc[-2][vcol]:+.1f}{unit} (전 회차 대비)"
+            col.metric(f"{ctry} 평균 {metric_label} — {int(last['survey_year'])}년",
+                       f"{last[vcol]:.1f}{unit}", delta=delta,
+                       delta_color="normal" if metric == 'tech_level' else "inverse")
+
+    # ----- 파티션 로드 (필요 연도/컬럼만) -----
+    if level == "중분류":
+        keys = ['tech_category']
+        part = load_year_partitions(data_version, tuple(sel_years), 'category',
+                                    tuple(['tech_category', 'type'] + value_cols))
+        if scope_type:
+            part = part[part['type'] == scope_type]
+        present = set(part['tech_category'].unique())
+        options = [c for c in CATEGORY_ORDER if c in present] + sorted(present - set(CATEGORY_ORDER))
+        selected = st.multiselect("📋 중분류 선택", options=options, default=options[:3], key="trend_categories")
+        part = part[part['tech_category'].isin(selected)]
+    else:
+        keys = ['tech_category', 'tech_detail']
+        part = load_year_partitions(data_version, tuple(sel_years), 'detail',
+                                    tuple(['tech_category', 'tech_detail', 'type'] + value_cols))
+        if scope_type:
+            part = part[part['type'] == scope_type]
+        present = set(part['tech_category'].unique())
+        options = [c for c in CATEGORY_ORDER if c in present] + sorted(present - set(CATEGORY_ORDER))
+        sel_cat = st.selectbox("📋 중분류 선택", options=options, key="trend_detail_category")
+        part = part[part['tech_category'] == sel_cat]
+        detail_opts = sorted(part['tech_detail'].unique())
+        selected = st.multiselect("🔎 세부기술 선택", options=detail_opts, default=detail_opts[:5],
+                                  key="trend_details")
+        part = part[part['tech_detail'].isin(selected)]
+
+    if part.empty:
+        st.warning("선택한 조건에 해당하는 데이터가 없습니다.")
+        return
+
+    label_col = keys[-1]
+    label_name = "중분류" if level == "중분류" else "세부기술"
+
+    # ----- 라인 차트 -----
+    trend_df = build_trend_frame(part, keys, value_cols, COUNTRY_LABELS)
+    trend_df = trend_df.rename(columns={label_col: label_name, 'survey_year': '조사연도', 'value': metric_label})
+    fig_line = px.line(
+        trend_df.sort_values('조사연도'),
+        x='조사연도', y=metric_label, color=label_name, line_dash='국가', markers=True
+    )
+    fig_line.update_xaxes(tickmode='array', tickvals=sorted(sel_years))
+    fig_line.update_layout(height=480, title=f"{label_name}별 {metric_label} 추이 (범위: {scope})",
+                           margin=dict(t=60, r=20, b=40, l=40))
+    show_figure(fig_line)
+
+    # ----- 전 회차 대비 증감 테이블 -----
+    st.markdown("### 📋 전 회차 대비 증감")
+    tabs = st.tabs(countries)
+    for tab, ctry, vcol in zip(tabs, countries, value_cols):
+        with tab:
+            yoy = build_yoy_table(part, keys, vcol)
+            yoy = yoy.rename(columns={'tech_category': '중분류', 'tech_detail': '세부기술'})
+            num_cols = [c for c in yoy.columns if c not in ('중분류', '세부기술')]
+            st.dataframe(
+                yoy.style.format({c: "{:+.1f}" if c.startswith("Δ") else "{:.1f}" for c in num_cols}, na_rep="-"),
+                use_container_width=True,
+                hide_index=True
+            )
+
+
+DIFF_THRESHOLD_RANGE = (0.0, 20.0)
+
+
+# 회차 비교 화면
+def render_edition_diff_view(data_version):
+    import plotly.graph_objects as go
+    st.subheader("🆚 회차 비교 — 조사 에디션 간 변동 분석")
+
+    editions = get_editions(data_version)
+    if len(editions) < 2:
+        st.info("비교하려면 조사 회차가 2개 이상 필요합니다. 새 회차 워크북을 데이터 폴더에 추가해 주세요.")
+        return
+
+    labels = dict(editions)
+    keys = [k for k, _ in editions]
+    ctrl1, ctrl2 = st.columns(2)
+    with ctrl1:
+        old_key = st.selectbox("기준 회차", options=keys, index=len(keys) - 2,
+                               format_func=labels.get, key="diff_old")
+    with ctrl2:
+        new_key = st.selectbox("비교 회차", options=keys, index=len(keys) - 1,
+                               format_func=labels.get, key="diff_new")
+    if old_key == new_key:
+        st.warning("서로 다른 두 회차를 선택하세요.")
+        return
+
+    result = compute_edition_diff(data_version, old_key, new_key)
+    changes = result['changes']
+
+    # ----- 핵심 지표 -----
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("공통 세부기술", f"{len(changes)}개")
+    c2.metric("🇰🇷 평균 기술수준 변화", f"{changes['kr_tech_level_delta'].mean():+.1f}%p")
+    c3.metric("🔁 그룹 전환", f"{int(changes['group_changed'].sum())}건")
+    c4.metric("🏆 최고보유국 변화", f"{int(changes['leader_changed'].sum())}건")
+    c5.metric("➕ 추가 / ➖ 삭제", f"{len(result['added'])} / {len(result['removed'])}")
+
+    # ----- 내보내기 -----
+    stamp = datetime.now().strftime('%Y%m%d')
+    dl1, dl2 = st.columns(2)
+    with dl1:
+        st.download_button("📥 Excel 내보내기", data=get_edition_diff_export(data_version, old_key, new_key),
+                           file_name=f"edition_diff_{stamp}.xlsx",
+                           mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+    with dl2:
+        st.download_button("📥 CSV 내보내기 (변동 상세)",
+                           data=changes.to_csv(index=False).encode('utf-8-sig'),
+                           file_name=f"edition_diff_changes_{stamp}.csv", mime="text/csv")
+
+    tab_cat, tab_detail, tab_group, tab_leader, tab_add = st.tabs(
+        ["📊 중분류 요약", "📋 변동 상세", "🔁 그룹 전환", "🏆 최고보유국 변화", "➕➖ 추가/삭제"])
+
+    with tab_cat:
+        summary = result['category_summary'].copy()
+        summary['순위'] = summary['tech_category'].map(CATEGORY_INDEX).fillna(9999).astype(int)
+        summary = summary.sort_values(['순위', 'tech_category'])
+        plot_df = summary.dropna(subset=['kr_tech_level_delta'])
+        fig = go.Figure(go.Bar(
+            x=plot_df['tech_category'], y=plot_df['kr_tech_level_delta'],
+            marker_color=['#4ECDC4' if v >= 0 else '#FF6B6B' for v in plot_df['kr_tech_level_delta']]
+        ))
+        fig.update_layout(title="중분류별 한국 기술수준 평균 변화(%p)", height=380,
+                          margin=dict(t=60, r=20, b=120, l=40))
+        show_figure(fig)
+
+        view = summary.rename(columns={
+            'tech_category': '중분류', 'matched': '공통', 'added': '추가', 'removed': '삭제',
+            'group_changes': '그룹 전환', 'leader_changes': '보유국 변화',
+            **{f'{code}_{m}_delta': f"Δ{name} {'수준' if m == 'tech_level' else '격차'}"
+               for name, code in COUNTRY_CODE_MAP.items() for m in ('tech_level', 'tech_gap')}
+        }).drop(columns='순위')
+        delta_names = [c for c in view.columns if c.startswith('Δ')]
+        st.dataframe(view.style.format({c: "{:+.1f}" for c in delta_names}, na_rep="-"),
+                     use_container_width=True, hide_index=True, height=500)
+
+    with tab_detail:
+        threshold = st.slider("한국 기술수준 |Δ| 최소값(%p)", *DIFF_THRESHOLD_RANGE, 0.0, 0.5, key="diff_threshold")
+        detail = changes[changes['kr_tech_level_delta'].abs() >= threshold]
+        detail_view = detail[['tech_category', 'tech_detail', 'kr_tech_level_old', 'kr_tech_level_new',
+                              'kr_tech_level_delta', 'kr_tech_gap_old', 'kr_tech_gap_new', 'kr_tech_gap_delta',
+                              'kr_tech_group_old', 'kr_tech_group_new']].rename(columns={
+            'tech_category': '중분류', 'tech_detail': '세부기술',
+            'kr_tech_level_old': '기술수준(기준)', 'kr_tech_level_new': '기술수준(비교)', 'kr_tech_level_delta': 'Δ기술수준',
+            'kr_tech_gap_old': '기술격차(기준)', 'kr_tech_gap_new': '기술격차(비교)', 'kr_tech_gap_delta': 'Δ기술격차',
+            'kr_tech_group_old': '그룹(기준)', 'kr_tech_group_new': '그룹(비교)'})
+        st.dataframe(
+            detail_view.sort_values('Δ기술수준', key=lambda s: s.abs(), ascending=False)
+            .style.format({'기술수준(기준)': "{:.1f}", '기술수준(비교)': "{:.1f}", 'Δ기술수준': "{:+.1f}",
+                           '기술격차(기준)': "{:.1f}", '기술격차(비교)': "{:.1f}", 'Δ기술격차': "{:+.1f}"}, na_rep="-"),
+            use_container_width=True, hide_index=True, height=560)
+
+    with tab_group:
+        st.markdown("**한국 기술그룹 전환 행렬 (행: 기준 → 열: 비교)**")
+        st.dataframe(result['group_matrix'], use_container_width=True)
+        moved = changes[changes['group_changed']]
+        st.dataframe(moved[['tech_category', 'tech_detail', 'kr_tech_group_old', 'kr_tech_group_new']].rename(
+            columns={'tech_category': '중분류', 'tech_detail': '세부기술',
+                     'kr_tech_group_old': '그룹(기준)', 'kr_tech_group_new': '그룹(비교)'}),
+            use_container_width=True, hide_index=True)
+
+    with tab_leader:
+        moved = changes[changes['leader_changed']]
+        st.dataframe(moved[['tech_category', 'tech_detail', 'leading_country_old', 'leading_country_new']].rename(
+            columns={'tech_category': '중분류', 'tech_detail': '세부기술',
+                     'leading_country_old': '최고보유국(기준)', 'leading_country_new': '최고보유국(비교)'}),
+            use_container_width=True, hide_index=True)
+
+    with tab_add:
+        a_col, r_col = st.columns(2)
+        with a_col:
+            st.markdown(f"**➕ 추가된 세부기술 ({len(result['added'])})**")
+            st.dataframe(result['added'].rename(columns={
+                'tech_category': '중분류', 'tech_detail': '세부기술', 'type_new': '구분',
+                'kr_tech_level_new': '한국 기술수준(%)', 'kr_tech_group_new': '한국 기술그룹',
+                'leading_country_new': '최고보유국'}), use_container_width=True, hide_index=True)
+        with r_col:
+            st.markdown(f"**➖ 삭제된 세부기술 ({len(result['removed'])})**")
+            st.dataframe(result['removed'].rename(columns={
+                'tech_category': '중분류', 'tech_detail': '세부기술', 'type_old': '구분',
+                'kr_tech_level_old': '한국 기술수준(%)', 'kr_tech_group_old': '한국 기술그룹',
+                'leading_country_old': '최고보유국'}), use_container_width=True, hide_index=True)
+
+
 # 메인 애플리케이션
+# ===== 공유 URL 상태 =====
+# 화면 → URL 값 (?view=country&scope_country_competition=감축기술 ...)
+PAGE_SLUGS = {
+    "🏠 메인 대시보드": 'main', "🌏 국가별 경쟁력": 'country', "🔬 기술분야별 분석": 'category',
+    "🔲 중분류 한눈에 보기": 'multiples', "📈 연도별 추이": 'trend', "🆚 회차 비교": 'diff',
+    "🎛️ What-if 시나리오": 'scenario', "🧩 기술 군집": 'cluster', "🧪 연구개발 역량": 'capacity',
+    "🤼 국가 쌍 비교": 'pair', "🔗 지표 상관 분석": 'correlation', "🌳 계층 탐색": 'hierarchy',
+    "⏳ 격차 해소 전망": 'projection', "🧮 피벗 탐색기": 'pivot', "🛠️ 관리자": 'admin',
+}
+URL_VIEW_PARAM = 'view'
+# 화면별 URL 에 담을 위젯 key → 값 종류 또는 (종류, 허용 범위) — 버튼·편집기·관리자 설정은 제외
+#   목록 위젯은 [종류] / 허용 범위: 숫자는 (최소, 최대), 문자열은 선택지 목록
+#   범위 없이 종류만 둔 key 는 데이터에 따라 선택지가 바뀌는 위젯 (목록에 없는 값은 위젯이 기본값으로 되돌림)
+SCOPE_NAMES = list(SCOPE_TYPES)
+COUNTRY_NAMES = list(COUNTRY_CODE_MAP)
+URL_STATE_KEYS = {
+    'main': {'scope_v2': (str, SCOPE_NAMES)},
+    'country': {'scope_country_competition': (str, SCOPE_NAMES), 'topbottom_country': (str, COUNTRY_NAMES),
+                'prof_country_only': (str, COUNTRY_NAMES), 'cmp_countries_for_detail': ([str], COUNTRY_NAMES),
+                'radar_mid_single': str},
+    'category': {'category_select_v2': str},
+    'multiples': {'multi_scope': (str, SCOPE_NAMES), 'multi_metric': (str, ['tech_level', 'tech_gap']),
+                  'multi_sort': (str, list(MULTIPLES_SORTS))},
+    'trend': {'trend_scope': (str, SCOPE_NAMES), 'trend_level': (str, TREND_LEVELS),
+              'trend_metric': (str, TREND_METRIC_LABELS), 'trend_years': [int], 'trend_countries': ([str], COUNTRY_NAMES),
+              'trend_categories': [str], 'trend_detail_category': str, 'trend_details': [str]},
+    'diff': {'diff_old': str, 'diff_new': str, 'diff_threshold': (float, DIFF_THRESHOLD_RANGE)},
+    'scenario': {'scenario_scope': (str, SCOPE_NAMES)},
+    'cluster': {'cluster_level': (str, list(CLUSTER_LEVELS)), 'cluster_method': (str, list(CLUSTER_METHODS)),
+                'cluster_k': (int, CLUSTER_K_RANGE), 'cluster_pick': str},
+    'capacity': {'capacity_scope': (str, SCOPE_NAMES), 'capacity_measure': (str, list(CAPACITY_MEASURES)),
+                 'capacity_country': (str, COUNTRY_NAMES)},
+    'pair': {'pair_a': (str, COUNTRY_NAMES), 'pair_b': (str, COUNTRY_NAMES), 'pair_scope': (str, SCOPE_NAMES)},
+    'correlation': {'corr_scope': (str, SCOPE_NAMES), 'corr_level': (str, list(CORRELATION_LEVELS)),
+                    'corr_method': (str, list(CORRELATION_METHODS)), 'corr_countries': ([str], COUNTRY_NAMES),
+                    'corr_metrics': ([str], list(CLUSTER_METRIC_LABELS)), 'corr_x': (str, CORRELATION_COLUMNS),
+                    'corr_y': (str, CORRELATION_COLUMNS)},
+    'hierarchy': {'hier_chart': (str, HIERARCHY_CHARTS), 'hier_country': (str, COUNTRY_NAMES),
+                  'hier_metric': (str, list(CLUSTER_METRIC_LABELS)), 'hier_depth': (int, HIERARCHY_DEPTH_RANGE),
+                  'hier_root': int},
+    'projection': {**{f'proj_pace_{label}': (float, PROJECTION_PACE_RANGE) for label in TREND_LABELS},
+                   'proj_catchup': (float, PROJECTION_CATCHUP_RANGE), 'proj_cap': (int, PROJECTION_CAP_RANGE),
+                   'proj_scope': (str, SCOPE_NAMES)},
+    'pivot': {'pivot_rows': ([str], list(PIVOT_DIMENSIONS)), 'pivot_column': (str, list(PIVOT_DIMENSIONS)),
+              'pivot_years': [int], 'pivot_metrics': ([str], list(PIVOT_METRICS)),
+              'pivot_aggs': ([str], list(PIVOT_AGGREGATIONS)), 'pivot_engine': (str, list(PIVOT_ENGINES))},
+    'admin': {},
+}
+
+
+def _encode_url_value(value):
+    if isinstance(value, (list, tuple)):
+        return [_encode_url_value(v) for v in value]
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def restore_url_state():
+    """세션 첫 실행에서 URL 쿼리 파라미터 → 위젯 상태 (위젯 생성 전에 호출, 잘못된 값은 무시)"""
+    if st.session_state.get('_url_state_restored'):
+        return
+    st.session_state['_url_state_restored'] = True
+    pages = {slug: page for page, slug in PAGE_SLUGS.items()}
+    slug = st.query_params.get(URL_VIEW_PARAM)
+    if slug not in pages:
+        return
+    st.session_state['analysis_type'] = pages[slug]
+    for key, spec in URL_STATE_KEYS[slug].items():
+        if key not in st.query_params:
+            continue
+        kind, allowed = spec if isinstance(spec, tuple) else (spec, None)
+        try:
+            if isinstance(kind, list):
+                values = [kind[0](v) for v in st.query_params.get_all(key)]
+            else:
+                values = [kind(st.query_params[key])]
+        except ValueError:
+            continue
+        # 범위 밖 값은 위젯 생성 시 예외가 나므로 버림 (목록 위젯은 허용 값만 남김)
+        if allowed is not None:
+            if isinstance(kind, list) or kind is str:
+                values = [v for v in values if v in allowed]
+            else:
+                values = [v for v in values if allowed[0] <= v <= allowed[1]]
+        if isinstance(kind, list):
+            st.session_state[key] = values
+        elif values:
+            st.session_state[key] = values[0]
+
+
+def sync_url_state(page):
+    """현재 화면 · 위젯 값 → URL (바뀐 경우만 갱신, 프로파일 파라미터는 유지)"""
+    slug = PAGE_SLUGS[page]
+    target = {URL_VIEW_PARAM: slug}
+    for key in URL_STATE_KEYS[slug]:
+        value = st.session_state.get(key)
+        if value is None or (isinstance(value, (list, tuple)) and not value):
+            continue
+        target[key] = _encode_url_value(value)
+    if PROFILE_QUERY_PARAM in st.query_params:
+        target[PROFILE_QUERY_PARAM] = st.query_params[PROFILE_QUERY_PARAM]
+
+    current = {k: (st.query_params.get_all(k) if isinstance(v, list) else st.query_params.get(k))
+               for k, v in target.items()}
+    if current != target or set(st.query_params) != set(target):
+        st.query_params.from_dict(target)
+
+
 def main():
     # 헤더
     st.markdown("""
@@ -331,13 +2103,26 @@ def main():
     if df is None or category_data is None:
         st.stop()
 
+    data_version = category_data.attrs.get('data_version', '')
+
+    # 나머지 화면 캐시는 백그라운드에서 채움 (프로세스당 1회)
+    if WARMUP_VIEWS:
+        start_cache_warmup(WARMUP_VIEWS)
+
     # 사이드바
     st.sidebar.title("📊 분석 메뉴")
 
+    # 공유 링크로 들어온 경우 화면 · 위젯 상태 복원 → 첫 실행에서 바로 해당 화면 렌더링 (결과는 상태별 캐시 적중)
+    restore_url_state()
+
     analysis_type = st.sidebar.selectbox(
         "분석 유형을 선택하세요:",
-        ["🏠 메인 대시보드", "🌏 국가별 경쟁력", "🔬 기술분야별 분석"]
+        list(PAGE_SLUGS),
+        key="analysis_type"
     )
+    st.sidebar.radio("그림 전송 모드", RENDER_MODES, format_func=RENDER_MODE_LABELS.get, horizontal=True,
+                     key="render_mode", help="느린 네트워크에서는 라이트 모드가 그림 데이터를 크게 줄입니다.")
+    st.session_state['_figure_payloads'] = []
 
     # 메인 대시보드 - 2안(3패널 레이아웃)
     if analysis_type == "🏠 메인 대시보드":
@@ -360,16 +2145,13 @@ def main():
             key="scope_v2"
         )
 
-        # 선택 데이터 필터
-        if scope == '전체':
-            filtered_data = category_data.copy()
-            story_context = "전체 기후기술"
-        elif scope == '감축기술':
-            filtered_data = category_data[category_data['type'] == '감축']
-            story_context = "감축기술"
-        else:
-            filtered_data = category_data[category_data['type'] == '적응']
-            story_context = "적응기술"
+        # 선택 데이터 필터 (범위별 슬라이스/그래프는 캐시에서 조회)
+        filtered_data = get_scope_slice(data_version, scope)
+        story_context = SCOPE_CONTEXT[scope]
+        main_figs = get_main_dashboard_figures(data_version, scope)
+        ci_result = get_category_ci(data_version)
+        ci_by_category = ci_result['category'].set_index('tech_category')
+        ci_caption = f"오차막대: {ci_result['level']:.0%} 부트스트랩 신뢰구간 (재표본 {ci_result['n_resamples']:,}회)"
 
         # 공통 지표 계산
         avg_kr_level = float(filtered_data['kr_tech_level'].mean())
@@ -384,12 +2166,9 @@ def main():
         # ---- 왼쪽 패널: 핵심지표 + 그래프 2개 ----
         with left_col:
             st.markdown("### 📊 한국 vs 주요국 기술수준 비교")
-            st.caption(f"{story_context} 기준, 평균값 비교")
-            fig_levels = create_simple_bar_comparison(filtered_data, "기술수준 비교(%)", "tech_level")
-            st.plotly_chart(fig_levels, use_container_width=True, config={'displayModeBar': False})
-
-            fig_gaps = create_simple_bar_comparison(filtered_data, "기술격차 비교(년)", "tech_gap")
-            st.plotly_chart(fig_gaps, use_container_width=True, config={'displayModeBar': False})
+            st.caption(f"{story_context} 기준, 평균값 비교 · {ci_caption}")
+            show_figure(main_figs['levels'])
+            show_figure(main_figs['gaps'])
 
         # ---- 중앙 패널(메인): 📋 상세현황 테이블 ----
         with center_col:
@@ -408,35 +2187,36 @@ def main():
                           best_category[:12] + "..." if len(str(best_category)) > 12 else best_category)
                 
             st.markdown("### 📋 전체 기후기술 상세현황")
-            display_rows = []
-            for _, row in filtered_data.iterrows():
-                level_emoji = "🟢" if row['kr_tech_level'] >= 85 else "🟡" if row['kr_tech_level'] >= 70 else "🔴"
-                gap_emoji = "🟢" if row['kr_tech_gap'] <= 2 else "🟡" if row['kr_tech_gap'] <= 4 else "🔴"
-                group_emoji = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}.get(row['kr_tech_group'], "❓")
-                type_emoji = "⚡" if row['type'] == '감축' else "🛡️"
-
-                display_rows.append({
-                    '구분': f"{type_emoji} {row['type']}",
-                    '중분류': row['tech_category'],
-                    '한국 기술수준(%)': f"{level_emoji} {row['kr_tech_level']:.1f}%",
-                    '한국 기술격차(년)': f"{gap_emoji} {row['kr_tech_gap']:.1f}년",
-                    '한국 기술그룹': f"{group_emoji} {row['kr_tech_group']}",
-                    '최고보유국': row['leading_country']
-                })
 
-            display_df = pd.DataFrame(display_rows)
-            st.dataframe(
-                display_df.sort_values('한국 기술수준(%)', ascending=False),
-                use_container_width=True,
-                hide_index=True,
-                height=620
-            )
+            def format_overview(page_df):
+                display_rows = []
+                for _, row in page_df.iterrows():
+                    level_emoji = "🟢" if row['kr_tech_level'] >= 85 else "🟡" if row['kr_tech_level'] >= 70 else "🔴"
+                    gap_emoji = "🟢" if row['kr_tech_gap'] <= 2 else "🟡" if row['kr_tech_gap'] <= 4 else "🔴"
+                    group_emoji = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}.get(row['kr_tech_group'], "❓")
+                    type_emoji = "⚡" if row['type'] == '감축' else "🛡️"
+                    ci_row = ci_by_category.loc[row['tech_category']]
+
+                    display_rows.append({
+                        '구분': f"{type_emoji} {row['type']}",
+                        '중분류': row['tech_category'],
+                        '한국 기술수준(%)': f"{level_emoji} {row['kr_tech_level']:.1f}%",
+                        '수준 95% CI': format_ci(*ci_row[list(ci_columns('kr', 'tech_level'))], "%"),
+                        '한국 기술격차(년)': f"{gap_emoji} {row['kr_tech_gap']:.1f}년",
+                        '격차 95% CI': format_ci(*ci_row[list(ci_columns('kr', 'tech_gap'))], "년"),
+                        '세부기술 수': int(ci_row['detail_count']),
+                        '한국 기술그룹': f"{group_emoji} {row['kr_tech_group']}",
+                        '최고보유국': row['leading_country']
+                    })
+                return pd.DataFrame(display_rows)
+
+            render_paged_table(filtered_data, "overview_table", format_overview, OVERVIEW_SORT_OPTIONS,
+                               default_sort='kr_tech_level')
 
         # ---- 오른쪽 패널: 히트맵 → 인사이트 ----
         with right_col:
             st.markdown("### 🔥 기술수준 히트맵 (상위 15)")
-            fig_heatmap = create_enhanced_heatmap(filtered_data, f"{story_context} 기술수준 히트맵")
-            st.plotly_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False})
+            show_figure(main_figs['heatmap'])
 
             st.markdown("### 💡 핵심 인사이트")
             st.markdown(f"""
@@ -460,15 +2240,7 @@ def main():
         )
 
         # 중분류 레벨 DF(=category_data)에서 범위 필터
-        if scope == '전체':
-            scoped_cat = category_data.copy()
-        elif scope == '감축기술':
-            scoped_cat = category_data[category_data['type'] == '감축'].copy()
-        else:
-            scoped_cat = category_data[category_data['type'] == '적응'].copy()
-
-        # 세부기술 레벨 DF 별칭 (df가 세부기술 단위임)
-        detail_data = df  # 레이더/막대에서 참조하기 위해 명시적 별칭
+        scoped_cat = get_scope_slice(data_version, scope)
 
         # ─── 스토리보드(유지) ───
         st.markdown("""
@@ -549,38 +2321,14 @@ def main():
         with narrow_right:
             st.markdown("#### 🏆 국가별 상위/하위 기술분야")
             sel_country_tb = st.selectbox("국가 선택", all_countries, index=0, key="topbottom_country")
-            col_code = {'한국': 'kr', '중국': 'cn', '일본': 'jp', '미국': 'us', 'EU': 'eu'}[sel_country_tb]
-            level_col = f"{col_code}_tech_level"
-            gap_col = f"{col_code}_tech_gap" if f"{col_code}_tech_gap" in category_data.columns else None
+            top_tbl, bot_tbl = get_top_bottom_tables(data_version, sel_country_tb)
 
             # Top 10
             st.markdown("**상위 10 (기술수준 높은 순)**")
-            top_tbl = (
-                category_data[['type', 'tech_category', level_col] + ([gap_col] if gap_col else [])]
-                .dropna(subset=[level_col])
-                .sort_values(level_col, ascending=False)
-                .head(10)
-                .rename(columns={'type': '구분', 'tech_category': '중분류', level_col: '기술수준(%)'})
-            )
-            if gap_col: top_tbl = top_tbl.rename(columns={gap_col: '기술격차(년)'})
-            top_tbl['구분'] = top_tbl['구분'].map({'감축': '⚡ 감축', '적응': '🛡️ 적응'})
-            top_tbl['기술수준(%)'] = top_tbl['기술수준(%)'].map(lambda x: f"{x:.1f}%")
-            if gap_col: top_tbl['기술격차(년)'] = top_tbl['기술격차(년)'].map(lambda x: f"{x:.1f}년")
             st.dataframe(top_tbl, hide_index=True, height=260)
 
             # Bottom 10
             st.markdown("**개선 필요 10 (기술수준 낮은 순)**")
-            bot_tbl = (
-                category_data[['type', 'tech_category', level_col] + ([gap_col] if gap_col else [])]
-                .dropna(subset=[level_col])
-                .sort_values(level_col, ascending=True)
-                .head(10)
-                .rename(columns={'type': '구분', 'tech_category': '중분류', level_col: '기술수준(%)'})
-            )
-            if gap_col: bot_tbl = bot_tbl.rename(columns={gap_col: '기술격차(년)'})
-            bot_tbl['구분'] = bot_tbl['구분'].map({'감축': '⚡ 감축', '적응': '🛡️ 적응'})
-            bot_tbl['기술수준(%)'] = bot_tbl['기술수준(%)'].map(lambda x: f"{x:.1f}%")
-            if gap_col: bot_tbl['기술격차(년)'] = bot_tbl['기술격차(년)'].map(lambda x: f"{x:.1f}년")
             st.dataframe(bot_tbl, hide_index=True, height=260)
 
         # ─────────────────────────────────────────
@@ -649,85 +2397,25 @@ def main():
             if not selected_mid:
                 st.info("중분류를 선택하세요.")
             else:
-                # 분석범위 + 중분류 필터
-                if scope == '전체':
-                    det_src = detail_data[detail_data['tech_category'] == selected_mid].copy()
-                elif scope == '감축기술':
-                    det_src = detail_data[
-                        (detail_data['tech_category'] == selected_mid) & (detail_data['type'] == '감축')].copy()
-                else:
-                    det_src = detail_data[
-                        (detail_data['tech_category'] == selected_mid) & (detail_data['type'] == '적응')].copy()
-
-                theta = det_src['tech_detail'].tolist()
-
-                if len(theta) == 0:
+                fig_rad = build_detail_radar(data_version, scope, selected_mid, tuple(compare_countries))
+                if fig_rad is None:
                     st.warning("선택한 중분류에 해당 범위의 세부기술 데이터가 없습니다.")
                 else:
-                    fig_rad = go.Figure()
-                    for ctry in compare_countries:
-                        code = country_codes[ctry]  # {'한국':'kr',...}
-                        col = f"{code}_tech_level"
-                        r_vals = det_src[col].fillna(0.0).astype(float).tolist()
-                        fig_rad.add_trace(go.Scatterpolar(
-                            r=r_vals, theta=theta, fill='toself', name=ctry, opacity=0.6
-                        ))
-                    fig_rad.update_layout(
-                        polar=dict(radialaxis=dict(visible=True, range=[0, 100])),
-                        showlegend=True, height=560,
-                        title=f"{selected_mid} — 세부기술 레이더(범위: {scope})"
-                    )
-                    st.plotly_chart(fig_rad, use_container_width=True, config={'displayModeBar': False})
+                    show_figure(fig_rad)
 
         # -----------------------------------------------------------------------------------------------------------------------
 
         with right_col:
-            import plotly.express as px
             st.markdown("### 📊 세부기술별 국가 비교 — 그룹 막대")
 
             if not selected_mid:
                 st.info("중분류를 선택하세요.")
             else:
-                # 동일 소스 재사용
-                if scope == '전체':
-                    det_src = detail_data[detail_data['tech_category'] == selected_mid].copy()
-                elif scope == '감축기술':
-                    det_src = detail_data[
-                        (detail_data['tech_category'] == selected_mid) & (detail_data['type'] == '감축')].copy()
-                else:
-                    det_src = detail_data[
-                        (detail_data['tech_category'] == selected_mid) & (detail_data['type'] == '적응')].copy()
-
-                # Long 변환
-                recs = []
-                code_map = {'한국': 'kr', '중국': 'cn', '일본': 'jp', '미국': 'us', 'EU': 'eu'}
-                for _, r in det_src.iterrows():
-                    for c in compare_countries:
-                        col = f"{code_map[c]}_tech_level"
-                        if col in det_src.columns:
-                            v = float(r.get(col, float('nan')))
-                            recs.append({"세부기술": r['tech_detail'], "국가": c, "기술수준(%)": v})
-                df_bar = pd.DataFrame(recs).dropna(subset=["기술수준(%)"])
-
-                if df_bar.empty:
+                fig_bar = build_detail_bar(data_version, scope, selected_mid, tuple(compare_countries))
+                if fig_bar is None:
                     st.warning("선택한 국가들의 세부기술 데이터가 없습니다.")
                 else:
-                    fig_bar = px.bar(
-                        df_bar,
-                        x="세부기술",
-                        y="기술수준(%)",
-                        color="국가",
-                        barmode="group",
-                        text=df_bar["기술수준(%)"].map(lambda x: f"{x:.1f}%")
-                    )
-                    fig_bar.update_traces(textposition='outside', cliponaxis=False)
-                    fig_bar.update_layout(
-                        yaxis=dict(range=[0, 100]),
-                        height=560,
-                        margin=dict(t=60, r=20, b=40, l=40),
-                        title=f"{selected_mid} — 세부기술별 국가 비교(범위: {scope})"
-                    )
-                    st.plotly_chart(fig_bar, use_container_width=True, config={'displayModeBar': False})
+                    show_figure(fig_bar)
 
     #-----------------------------------------------------------------------------------------------------------------------
     # 기술분야별 분석 - 2안(3패널 레이아웃)
@@ -756,7 +2444,7 @@ def main():
             st.stop()
 
         # 세부 기술(=df, 같은 중분류에 속한 하위 항목들)
-        detail_df = df[df['tech_category'] == selected_category].copy()
+        detail_df = get_scoped_details(data_version, '전체', selected_category)
 
         # 공통 지표 계산 (한국 기준)
         avg_kr_level = float(cat_row_df['kr_tech_level'].mean())
@@ -774,15 +2462,17 @@ def main():
         # ---- 왼쪽 패널: (1) 핵심지표 → (2) 한국 vs 주요국 비교 ----
         with left_col:
             st.markdown("### 📊 한국 vs 주요국 기술수준 비교")
-            st.caption(f"중분류: {selected_category} 기준, 평균값 비교")
+            ci_frame = get_category_ci(data_version)['category'].set_index('tech_category')
+            cat_ci = ci_frame.loc[selected_category] if selected_category in ci_frame.index else None
+            st.caption(f"중분류: {selected_category} 기준, 평균값 비교 · 오차막대: 세부기술 부트스트랩 95% 신뢰구간")
             # 기존 헬퍼 재사용: 단일 중분류(row) 전달해도 국가 막대 비교가 생성되도록 설계됨
-            fig_levels = create_simple_bar_comparison(cat_row_df, "기술수준 비교(%)", "tech_level")
-            st.plotly_chart(fig_levels, use_container_width=True, config={'displayModeBar': False})
+            fig_levels = create_simple_bar_comparison(cat_row_df, "기술수준 비교(%)", "tech_level", ci=cat_ci)
+            show_figure(fig_levels)
 
             # (데이터가 있는 경우) 국가별 기술격차 비교
             try:
-                fig_gaps = create_simple_bar_comparison(cat_row_df, "기술격차 비교(년)", "tech_gap")
-                st.plotly_chart(fig_gaps, use_container_width=True, config={'displayModeBar': False})
+                fig_gaps = create_simple_bar_comparison(cat_row_df, "기술격차 비교(년)", "tech_gap", ci=cat_ci)
+                show_figure(fig_gaps)
             except Exception:
                 st.caption("※ 국가별 기술격차 데이터 컬럼이 없는 경우 자동으로 생략됩니다.")
 
@@ -804,28 +2494,26 @@ def main():
             if detail_df.empty:
                 st.info("해당 중분류에 속한 세부기술 데이터가 없습니다.")
             else:
-                rows = []
-                for _, row in detail_df.iterrows():
-                    level_emoji = "🟢" if row.get('kr_tech_level', 0) >= 85 else "🟡" if row.get('kr_tech_level', 0) >= 70 else "🔴"
-                    gap_val = float(row.get('kr_tech_gap', 0)) if pd.notnull(row.get('kr_tech_gap', None)) else None
-                    gap_emoji = "🟢" if (gap_val is not None and gap_val <= 2) else ("🟡" if (gap_val is not None and gap_val <= 4) else "🔴")
-                    group_val = row.get('kr_tech_group', '–')
-                    group_emoji = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}.get(group_val, "❓")
-
-                    rows.append({
-                        '세부기술': row.get('tech_detail', '–'),
-                        '한국 기술수준(%)': f"{level_emoji} {row.get('kr_tech_level', float('nan')):.1f}%",
-                        '한국 기술격차(년)': f"{gap_emoji} {gap_val:.1f}년" if gap_val is not None else "–",
-                        '한국 기술그룹': f"{group_emoji} {group_val}",
-                        '최고보유국': row.get('leading_country', '–')
-                    })
-                display_df = pd.DataFrame(rows)
-                st.dataframe(
-                    display_df.sort_values('한국 기술수준(%)', ascending=False),
-                    use_container_width=True,
-                    hide_index=True,
-                    height=620
-                )
+                def format_details(page_df):
+                    rows = []
+                    for _, row in page_df.iterrows():
+                        level_emoji = "🟢" if row.get('kr_tech_level', 0) >= 85 else "🟡" if row.get('kr_tech_level', 0) >= 70 else "🔴"
+                        gap_val = float(row.get('kr_tech_gap', 0)) if pd.notnull(row.get('kr_tech_gap', None)) else None
+                        gap_emoji = "🟢" if (gap_val is not None and gap_val <= 2) else ("🟡" if (gap_val is not None and gap_val <= 4) else "🔴")
+                        group_val = row.get('kr_tech_group', '–')
+                        group_emoji = {"선도": "🥇", "추격": "🥈", "후발": "🥉"}.get(group_val, "❓")
+
+                        rows.append({
+                            '세부기술': row.get('tech_detail', '–'),
+                            '한국 기술수준(%)': f"{level_emoji} {row.get('kr_tech_level', float('nan')):.1f}%",
+                            '한국 기술격차(년)': f"{gap_emoji} {gap_val:.1f}년" if gap_val is not None else "–",
+                            '한국 기술그룹': f"{group_emoji} {group_val}",
+                            '최고보유국': row.get('leading_country', '–')
+                        })
+                    return pd.DataFrame(rows)
+
+                render_paged_table(detail_df, "detail_table", format_details, DETAIL_SORT_OPTIONS,
+                                   default_sort='kr_tech_level')
 
         # ---- 오른쪽 패널: 히트맵 → 인사이트 ----
         with right_col:
@@ -834,7 +2522,7 @@ def main():
                 # 세부기술 단위 히트맵 (가능하면 detail_df 기반)
                 fig_heatmap = create_enhanced_heatmap(detail_df if not detail_df.empty else cat_row_df,
                                                       f"{selected_category} 기술수준 히트맵")
-                st.plotly_chart(fig_heatmap, use_container_width=True, config={'displayModeBar': False})
+                show_figure(fig_heatmap)
             except Exception:
                 st.caption("※ 히트맵 생성에 필요한 컬럼이 부족하여 기본 형태로 대체되거나 생략될 수 있습니다.")
 
@@ -847,6 +2535,54 @@ def main():
             </div>
             """, unsafe_allow_html=True)
 
+    # 중분류 스몰 멀티플
+    elif analysis_type == "🔲 중분류 한눈에 보기":
+        render_multiples_view(data_version)
+
+    # 연도별 추이
+    elif analysis_type == "📈 연도별 추이":
+        render_trend_view(data_version)
+
+    # 회차 비교
+    elif analysis_type == "🆚 회차 비교":
+        render_edition_diff_view(data_version)
+
+    # What-if 시나리오
+    elif analysis_type == "🎛️ What-if 시나리오":
+        render_scenario_view(data_version)
+
+    # 기술 군집
+    elif analysis_type == "🧩 기술 군집":
+        render_cluster_view(data_version)
+
+    # 연구개발 역량지수
+    elif analysis_type == "🧪 연구개발 역량":
+        render_capacity_view(data_version)
+
+    # 국가 쌍 비교
+    elif analysis_type == "🤼 국가 쌍 비교":
+        render_pair_view(data_version)
+
+    # 지표 상관 분석
+    elif analysis_type == "🔗 지표 상관 분석":
+        render_correlation_view(data_version)
+
+    # 계층 탐색
+    elif analysis_type == "🌳 계층 탐색":
+        render_hierarchy_view(data_version)
+
+    # 격차 해소 전망
+    elif analysis_type == "⏳ 격차 해소 전망":
+        render_projection_view(data_version)
+
+    # 피벗 탐색기
+    elif analysis_type == "🧮 피벗 탐색기":
+        render_pivot_view(data_version)
+
+    # 관리자 (프로파일 · 데이터 품질)
+    elif analysis_type == "🛠️ 관리자":
+        render_admin_view(data_version)
+
     # 사이드바 - 추가 정보
     st.sidebar.markdown("---")
     st.sidebar.subheader("📊 데이터 정보")
@@ -859,6 +2595,32 @@ def main():
     - 분석 국가: 5개국 (한국, 중국, 일본, 미국, EU)
     """)
 
+    # 변환 실패·미등록 중분류가 있으면 잘못된 수치가 보일 수 있으므로 모든 화면에서 알림
+    quality = get_data_quality(data_version)['summary']
+    if quality['coerced_cells'] or quality['unknown_categories']:
+        st.sidebar.warning(f"⚠️ 데이터 품질 확인 필요 — 숫자 변환 실패 {quality['coerced_cells']:,}셀, "
+                           f"미등록 중분류 {quality['unknown_categories']}개 (🛠️ 관리자 화면)")
+
+    render_payload_summary()
+
+    with st.sidebar.expander("🧰 캐시 진단", expanded=False):
+        render_cache_diagnostics()
+
+    sync_url_state(analysis_type)
+
+
+def _profile_context():
+    return {
+        'page': st.session_state.get('analysis_type'),
+        'query_params': st.query_params.to_dict(),
+        'widget_state': snapshot_state(st.session_state),
+    }
+
 
 if __name__ == "__main__":
-    main()
+    # 프로파일링은 켜진 세션만 main() 을 감쌈 (?profile=1 또는 관리자 화면 토글)
+    profile_engine = resolve_engine(st.query_params.get(PROFILE_QUERY_PARAM) or st.session_state.get('profile_engine'))
+    if profile_engine is None:
+        main()
+    else:
+        run_profiled(main, profile_engine, context=_profile_context)
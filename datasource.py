@@ -0,0 +1,368 @@
+"""조사 데이터 소스 계층 (Excel 워크북 · SQLite · DuckDB · Parquet)
+
+TRACKER_DATA_SOURCE 로 소스를 지정한다 (미지정 시 TRACKER_DATA_DIR 의 Excel 워크북).
+    xlsx:./data            sqlite:tracker.db#tracker
+    duckdb:tracker.duckdb  parquet:./tracker_parquet
+
+DB/Parquet 소스는 ingest 정규화 결과와 같은 영문 컬럼 스키마를 사용하며,
+기존 워크북에서 아래 명령으로 만들 수 있다.
+    python datasource.py export sqlite tracker.db
+"""
+import os
+import sys
+import abc
+import queue
+import hashlib
+import threading
+import contextlib
+
+import pandas as pd
+
+from ingest import (DATA_DIR, PARSER_VERSION, NUMERIC_COLUMNS, TEXT_COLUMNS, SOURCE_COLUMNS,
+                    load_tracker_dataset, current_dataset_version, file_signature)
+
+SCHEMA_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS + SOURCE_COLUMNS
+DEFAULT_TABLE = 'tracker'
+POOL_SIZE = int(os.environ.get('TRACKER_SOURCE_POOL_SIZE', '4'))
+
+# 스펙 문자열 → DataSource (프로세스 내 재사용, 커넥션 풀 유지)
+_SOURCES = {}
+_SOURCES_LOCK = threading.Lock()
+
+
+def _check_columns(columns):
+    # 컬럼명은 SQL 식별자로 쓰이므로 스키마 외 이름은 거부
+    unknown = [c for c in columns if c not in SCHEMA_COLUMNS]
+    if unknown:
+        raise ValueError(f"알 수 없는 컬럼: {', '.join(map(str, unknown))}")
+
+
+def conform_frame(df, columns=None):
+    """소스별 결과를 ingest 스키마 dtype으로 맞춤 (요청 컬럼만, 누락 컬럼은 결측)"""
+    columns = list(columns) if columns else SCHEMA_COLUMNS
+    out = df.reindex(columns=columns)
+    for col in columns:
+        if col in NUMERIC_COLUMNS:
+            out[col] = pd.to_numeric(out[col], errors='coerce').astype('float64')
+        elif col == 'survey_year':
+            out[col] = pd.to_numeric(out[col], errors='coerce').astype('Int64')
+        else:
+            out[col] = out[col].astype(object).where(out[col].notna(), None)
+    return out.reset_index(drop=True)
+
+
+def filter_frame(df, columns=None, filters=None):
+    """메모리 DF에 컬럼 선택 · 필터 적용 (푸시다운 미지원 소스용)
+
+    filters: ((컬럼, (값, ...)), ...) — 컬럼별 IN 조건의 AND
+    """
+    mask = pd.Series(True, index=df.index)
+    for col, values in filters or ():
+        mask &= df[col].isin(list(values))
+    out = df[mask]
+    return out[list(columns)].reset_index(drop=True) if columns else out.reset_index(drop=True)
+
+
+class ConnectionPool:
+    """스레드 공유 커넥션 풀 — 최대 max_size개까지 만들고 반납된 커넥션을 재사용"""
+
+    def __init__(self, connect, max_size=POOL_SIZE):
+        self._connect = connect
+        self.max_size = max_size
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @contextlib.contextmanager
+    def connection(self, timeout=30):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self.created < self.max_size
+                if can_create:
+                    self.created += 1
+            if can_create:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._lock:
+                        self.created -= 1
+                    raise
+            else:
+                conn = self._idle.get(timeout=timeout)
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close_all(self):
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self.created -= 1
+
+    def stats(self):
+        return {'created': self.created, 'idle': self._idle.qsize(), 'max_size': self.max_size}
+
+
+class DataSource(abc.ABC):
+    """조사 데이터 소스 기본 인터페이스"""
+    kind = None
+    supports_pushdown = False
+
+    @abc.abstractmethod
+    def version(self):
+        """원본이 바뀌면 달라지는 데이터 버전 문자열"""
+
+    @abc.abstractmethod
+    def load(self, columns=None, filters=None):
+        """ingest 스키마 DF (columns 선택 · filters 조건 적용)"""
+
+    def describe(self):
+        return self.kind
+
+    def close(self):
+        pass
+
+
+class ExcelSource(DataSource):
+    """데이터 디렉터리의 조사 워크북 (파싱 결과는 ingest 피클 캐시 사용)"""
+    kind = 'xlsx'
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+
+    def version(self):
+        return current_dataset_version(self.data_dir)
+
+    def load(self, columns=None, filters=None):
+        if columns:
+            _check_columns(columns)
+        df, _ = load_tracker_dataset(self.data_dir)
+        return filter_frame(df, columns, filters)
+
+    def describe(self):
+        return f"xlsx:{self.data_dir}"
+
+
+class SQLSource(DataSource):
+    """SQLite/DuckDB 단일 테이블 — SELECT 컬럼 · WHERE IN 조건을 DB에서 실행"""
+    supports_pushdown = True
+    placeholder = '?'
+
+    def __init__(self, path, table=DEFAULT_TABLE, pool_size=POOL_SIZE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"데이터베이스 파일이 없습니다: {path}")
+        if not table.replace('_', '').isalnum():
+            raise ValueError(f"잘못된 테이블 이름: {table}")
+        self.path = path
+        self.table = table
+        self.pool = ConnectionPool(self._connect, pool_size)
+
+    @abc.abstractmethod
+    def _connect(self):
+        """풀에 넣을 새 커넥션"""
+
+    @abc.abstractmethod
+    def _fetch(self, conn, sql, params):
+        """쿼리 실행 결과 DF"""
+
+    def version(self):
+        # 파일 서명 + 테이블명 (WAL 파일이 있으면 함께 반영)
+        parts = [file_signature(self.path), self.table, str(PARSER_VERSION)]
+        wal = f"{self.path}.wal" if self.kind == 'duckdb' else f"{self.path}-wal"
+        if os.path.exists(wal):
+            parts.append(file_signature(wal))
+        return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:12]
+
+    def build_query(self, columns=None, filters=None):
+        columns = list(columns) if columns else SCHEMA_COLUMNS
+        _check_columns(columns + [col for col, _ in filters or ()])
+        select = ', '.join(f'"{c}"' for c in columns)
+        sql = f"SELECT {select} FROM {self.table}"
+        clauses, params = [], []
+        for col, values in filters or ():
+            values = list(values)
+            if not values:
+                clauses.append('1 = 0')
+                continue
+            clauses.append(f'"{col}" IN ({", ".join(self.placeholder for _ in values)})')
+            params.extend(v.item() if hasattr(v, 'item') else v for v in values)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return sql, params, columns
+
+    def load(self, columns=None, filters=None):
+        sql, params, columns = self.build_query(columns, filters)
+        with self.pool.connection() as conn:
+            df = self._fetch(conn, sql, params)
+        return conform_frame(df, columns)
+
+    def describe(self):
+        return f"{self.kind}:{self.path}#{self.table}"
+
+    def close(self):
+        self.pool.close_all()
+
+
+class SQLiteSource(SQLSource):
+    kind = 'sqlite'
+
+    def _connect(self):
+        import sqlite3
+        uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+    def _fetch(self, conn, sql, params):
+        return pd.read_sql_query(sql, conn, params=params)
+
+
+class DuckDBSource(SQLSource):
+    kind = 'duckdb'
+
+    def __init__(self, path, table=DEFAULT_TABLE, pool_size=POOL_SIZE):
+        self._database = None
+        self._db_lock = threading.Lock()
+        super().__init__(path, table, pool_size)
+
+    def _connect(self):
+        import duckdb
+        # 같은 파일은 한 번만 열고, 풀에는 스레드별 커서를 둔다
+        with self._db_lock:
+            if self._database is None:
+                self._database = duckdb.connect(self.path, read_only=True)
+            return self._database.cursor()
+
+    def _fetch(self, conn, sql, params):
+        return conn.execute(sql, params).df()
+
+    def close(self):
+        super().close()
+        with self._db_lock:
+            if self._database is not None:
+                self._database.close()
+                self._database = None
+
+
+class ParquetSource(DataSource):
+    """Parquet 파일/디렉터리 (hive 파티션 포함) — pyarrow.dataset 컬럼 선택 · 필터 푸시다운"""
+    kind = 'parquet'
+    supports_pushdown = True
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Parquet 경로가 없습니다: {path}")
+        self.path = path
+
+    def _files(self):
+        if os.path.isfile(self.path):
+            return [self.path]
+        found = []
+        for root, _, names in os.walk(self.path):
+            found.extend(os.path.join(root, n) for n in names if n.endswith('.parquet'))
+        return sorted(found)
+
+    def version(self):
+        files = self._files()
+        if not files:
+            raise FileNotFoundError(f"'{self.path}' 경로에 Parquet 파일이 없습니다.")
+        joined = '|'.join(file_signature(p) for p in files)
+        return hashlib.sha1(joined.encode('utf-8')).hexdigest()[:12]
+
+    def load(self, columns=None, filters=None):
+        import pyarrow.dataset as ds
+
+        columns = list(columns) if columns else SCHEMA_COLUMNS
+        _check_columns(columns + [col for col, _ in filters or ()])
+        dataset = ds.dataset(self.path, format='parquet', partitioning='hive')
+        available = set(dataset.schema.names)
+        # 파일에 없는 컬럼의 조건을 건너뛰면 필터가 풀린 채 전체 행이 반환되므로 거부
+        missing = sorted({col for col, _ in filters or ()} - available)
+        if missing:
+            raise ValueError(f"Parquet 데이터에 필터 컬럼이 없습니다: {', '.join(missing)}")
+        expr = None
+        for col, values in filters or ():
+            cond = ds.field(col).isin([v.item() if hasattr(v, 'item') else v for v in values])
+            expr = cond if expr is None else expr & cond
+        table = dataset.to_table(columns=[c for c in columns if c in available], filter=expr)
+        return conform_frame(table.to_pandas(), columns)
+
+    def describe(self):
+        return f"parquet:{self.path}"
+
+
+SOURCE_TYPES = {'xlsx': ExcelSource, 'sqlite': SQLiteSource, 'duckdb': DuckDBSource, 'parquet': ParquetSource}
+
+
+def open_data_source(spec=None):
+    """'종류:경로[#테이블]' 스펙으로 소스 생성 (None 이면 Excel 데이터 디렉터리)"""
+    if not spec:
+        return ExcelSource(DATA_DIR)
+    kind, _, target = spec.partition(':')
+    kind = kind.strip().lower()
+    if kind not in SOURCE_TYPES or not target:
+        raise ValueError(f"지원하지 않는 데이터 소스: {spec} (예: {', '.join(f'{k}:경로' for k in SOURCE_TYPES)})")
+    if kind in ('sqlite', 'duckdb'):
+        path, _, table = target.partition('#')
+        return SOURCE_TYPES[kind](path, table or DEFAULT_TABLE)
+    return SOURCE_TYPES[kind](target)
+
+
+def get_data_source(spec=None):
+    """프로세스 공용 데이터 소스 (스펙별 1개 — 커넥션 풀 공유)"""
+    spec = spec if spec is not None else os.environ.get('TRACKER_DATA_SOURCE', '')
+    with _SOURCES_LOCK:
+        source = _SOURCES.get(spec)
+        if source is None:
+            source = _SOURCES[spec] = open_data_source(spec)
+        return source
+
+
+def export_dataset(df, kind, path, table=DEFAULT_TABLE):
+    """정규화된 조사 DF를 SQLite/DuckDB/Parquet 소스로 기록"""
+    df = conform_frame(df)
+    if kind == 'sqlite':
+        import sqlite3
+        with contextlib.closing(sqlite3.connect(path)) as conn:
+            df.astype({'survey_year': 'float64'}).to_sql(table, conn, if_exists='replace', index=False)
+            for col in ('tech_category', 'type', 'survey_year'):
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "ix_{table}_{col}" ON {table} ("{col}")')
+            conn.commit()
+    elif kind == 'duckdb':
+        import duckdb
+        with contextlib.closing(duckdb.connect(path)) as conn:
+            conn.register('export_frame', df)
+            conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM export_frame ORDER BY tech_category")
+    elif kind == 'parquet':
+        os.makedirs(path, exist_ok=True)
+        df.to_parquet(os.path.join(path, f"{table}.parquet"), index=False)
+    else:
+        raise ValueError(f"내보낼 수 없는 소스 종류: {kind}")
+    return path
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="조사 워크북을 SQLite/DuckDB/Parquet 데이터 소스로 변환")
+    sub = parser.add_subparsers(dest='command', required=True)
+    export = sub.add_parser('export', help="현재 데이터 디렉터리의 워크북을 내보내기")
+    export.add_argument('kind', choices=['sqlite', 'duckdb', 'parquet'])
+    export.add_argument('path')
+    export.add_argument('--table', default=DEFAULT_TABLE)
+    export.add_argument('--data-dir', default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    df, version = load_tracker_dataset(args.data_dir)
+    export_dataset(df, args.kind, args.path, args.table)
+    print(f"{len(df):,}행 → {args.kind}:{args.path} (원본 데이터 버전 {version})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import io
+
+import pandas as pd
+
+from ingest import COUNTRY_CODES
+
+# ===== 조사 회차(에디션) 비교 엔진 =====
+DIFF_KEYS = ['tech_category', 'tech_detail']
+DIFF_METRICS = ('tech_level', 'tech_gap')
+EDITION_COLUMNS = ['survey_year', 'source_file', 'source_sheet']
+
+
+def edition_key(year, source_file, source_sheet):
+    year_txt = '' if pd.isna(year) else str(int(year))
+    return f"{year_txt}|{source_file}|{source_sheet}"
+
+
+def list_editions(full_df):
+    """데이터셋에 포함된 조사 회차 목록 (연도 오름차순) — [(key, 표시명), ...]"""
+    editions = (full_df[EDITION_COLUMNS].drop_duplicates()
+                .sort_values(EDITION_COLUMNS, na_position='first'))
+    out = []
+    for year, source_file, source_sheet in editions.itertuples(index=False):
+        year_txt = "연도 미상" if pd.isna(year) else f"{int(year)}년"
+        out.append((edition_key(year, source_file, source_sheet), f"{year_txt} — {source_file} / {source_sheet}"))
+    return out
+
+
+def select_edition(full_df, key):
+    year_txt, source_file, source_sheet = key.split('|', 2)
+    mask = (full_df['source_file'] == source_file) & (full_df['source_sheet'] == source_sheet)
+    if year_txt:
+        mask &= full_df['survey_year'] == int(year_txt)
+    else:
+        mask &= full_df['survey_year'].isna()
+    return full_df[mask]
+
+
+def diff_editions(old_df, new_df):
+    """두 회차를 (중분류, 세부기술) 기준으로 결합해 변동 내역 계산
+
+    반환: {'changes', 'added', 'removed', 'category_summary', 'group_matrix'}
+    """
+    value_cols = [f'{code}_{metric}' for code in COUNTRY_CODES for metric in DIFF_METRICS]
+    cols = DIFF_KEYS + ['type', 'kr_tech_group', 'leading_country'] + value_cols
+
+    # 같은 회차 내 중복 키는 첫 행만 사용 (조인 폭증 방지)
+    old = old_df[cols].drop_duplicates(subset=DIFF_KEYS)
+    new = new_df[cols].drop_duplicates(subset=DIFF_KEYS)
+
+    merged = old.merge(new, on=DIFF_KEYS, how='outer', suffixes=('_old', '_new'), indicator=True)
+
+    added = merged.loc[merged['_merge'] == 'right_only', DIFF_KEYS + ['type_new', 'kr_tech_level_new',
+                                                                       'kr_tech_group_new', 'leading_country_new']]
+    removed = merged.loc[merged['_merge'] == 'left_only', DIFF_KEYS + ['type_old', 'kr_tech_level_old',
+                                                                        'kr_tech_group_old', 'leading_country_old']]
+
+    changes = merged[merged['_merge'] == 'both'].drop(columns='_merge').reset_index(drop=True)
+    for col in value_cols:
+        changes[f'{col}_delta'] = changes[f'{col}_new'] - changes[f'{col}_old']
+    changes['group_changed'] = changes['kr_tech_group_old'].fillna('') != changes['kr_tech_group_new'].fillna('')
+    changes['leader_changed'] = changes['leading_country_old'].fillna('') != changes['leading_country_new'].fillna('')
+
+    # 중분류별 평균 증감 + 전환 건수
+    delta_cols = [f'{col}_delta' for col in value_cols]
+    category_summary = changes.groupby('tech_category').agg(
+        **{col: (col, 'mean') for col in delta_cols},
+        matched=('tech_detail', 'count'),
+        group_changes=('group_changed', 'sum'),
+        leader_changes=('leader_changed', 'sum'),
+    )
+    category_summary['added'] = added.groupby('tech_category').size()
+    category_summary['removed'] = removed.groupby('tech_category').size()
+    category_summary = category_summary.reindex(
+        category_summary.index.union(added['tech_category']).union(removed['tech_category']))
+    category_summary[['matched', 'group_changes', 'leader_changes', 'added', 'removed']] = (
+        category_summary[['matched', 'group_changes', 'leader_changes', 'added', 'removed']].fillna(0).astype(int))
+
+    group_matrix = pd.crosstab(changes['kr_tech_group_old'].fillna('N/A'),
+                               changes['kr_tech_group_new'].fillna('N/A'))
+
+    return {
+        'changes': changes,
+        'added': added.reset_index(drop=True),
+        'removed': removed.reset_index(drop=True),
+        'category_summary': category_summary.reset_index(),
+        'group_matrix': group_matrix,
+    }
+
+
+def export_diff_xlsx(result):
+    """비교 결과를 시트별로 담은 Excel 바이트 반환"""
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        result['category_summary'].to_excel(writer, sheet_name='중분류 요약', index=False)
+        result['changes'].to_excel(writer, sheet_name='변동 상세', index=False)
+        result['added'].to_excel(writer, sheet_name='추가 기술', index=False)
+        result['removed'].to_excel(writer, sheet_name='삭제 기술', index=False)
+        result['group_matrix'].to_excel(writer, sheet_name='그룹 전환')
+    return buffer.getvalue()
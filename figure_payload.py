@@ -0,0 +1,138 @@
+import re
+import json
+import base64
+import threading
+import weakref
+import importlib.util
+
+import numpy as np
+
+# ===== 저대역폭용 그림 전송 모드 (전체 JSON / 라이트 JSON / 서버 렌더링 정적 이미지) =====
+HAS_KALEIDO = importlib.util.find_spec('kaleido') is not None
+# full: 원본 그대로 / lite: 숫자 반올림 · 텍스트 배열 → 템플릿 · 테마 템플릿 축소 / image: PNG (kaleido 필요)
+RENDER_MODES = ('full', 'lite', 'image') if HAS_KALEIDO else ('full', 'lite')
+LITE_DIGITS = 2
+
+# 반올림 대상 데이터 배열 (레이아웃 범위 · 색 척도 경계는 건드리지 않음)
+NUMERIC_KEYS = ('x', 'y', 'z', 'r', 'values', 'customdata', 'array', 'arrayminus')
+# 색 척도를 테마 템플릿에서 가져오는 트레이스 (colorscale 미지정 시 템플릿 layout 유지)
+COLORSCALE_TRACES = ('heatmap', 'histogram2d', 'contour', 'choropleth')
+_NUMBER_TEXT = re.compile(r'^(.*?)(-?\d+(?:\.(\d+))?)(.*)$', re.S)
+
+_lock = threading.Lock()
+_memo = {}  # id(그림) → {모드: (전송 객체, 바이트)} — 캐시된 그림은 변환 1회, 그림이 해제되면 함께 삭제
+
+
+def _spec_bytes(spec):
+    return len(spec.encode('utf-8'))
+
+
+def _decode_typed(value):
+    """plotly 이진 배열 {'dtype', 'bdata', 'shape'} → numpy 배열"""
+    arr = np.frombuffer(base64.b64decode(value['bdata']), dtype=value['dtype'])
+    if 'shape' in value:
+        arr = arr.reshape([int(n) for n in str(value['shape']).split(',')])
+    return arr
+
+
+def _round_values(value, digits):
+    if isinstance(value, dict) and 'bdata' in value:
+        value = _decode_typed(value)
+        if value.dtype.kind != 'f':
+            return value.tolist()
+        rounded = np.round(value, digits).astype(object)
+        rounded[np.isnan(value)] = None
+        return rounded.tolist()
+    if isinstance(value, list):
+        return [_round_values(v, digits) for v in value]
+    if isinstance(value, float):
+        return round(value, digits)
+    return value
+
+
+def _flatten(value):
+    if isinstance(value, dict) and 'bdata' in value:
+        return _decode_typed(value).ravel().tolist()
+    if isinstance(value, list) and value and isinstance(value[0], list):
+        return [v for row in value for v in row]
+    return value if isinstance(value, list) else None
+
+
+def _text_template(trace):
+    """값을 같은 형식으로 찍은 텍스트 배열이면 공통 texttemplate 로 대체 (예: '<b>93.2%</b>' → '<b>%{z:.1f}%</b>')"""
+    if trace.get('texttemplate', '%{text}') != '%{text}':
+        return None
+    axis = 'z' if trace.get('type') == 'heatmap' else 'x' if trace.get('orientation') == 'h' else 'y'
+    texts, values = _flatten(trace.get('text')), _flatten(trace.get(axis))
+    if not texts or values is None or len(texts) != len(values):
+        return None
+
+    pattern = None
+    for text, value in zip(texts, values):
+        match = _NUMBER_TEXT.match(text) if isinstance(text, str) else None
+        if match is None or value is None:
+            return None
+        prefix, number, decimals, suffix = match.groups()
+        digits = len(decimals or '')
+        if (prefix, digits, suffix) != (pattern or (prefix, digits, suffix)) or f"{value:.{digits}f}" != number:
+            return None
+        pattern = (prefix, digits, suffix)
+    prefix, digits, suffix = pattern
+    return f"{prefix}%{{{axis}:.{digits}f}}{suffix}"
+
+
+def _lite_template(template, traces):
+    """테마 템플릿 축소 — 트레이스 유형별 기본 스타일(data)은 제거, 색 순서와 필요한 색 척도만 유지"""
+    layout = (template or {}).get('layout', {})
+    keep = {'colorway': layout['colorway']} if 'colorway' in layout else {}
+    if any(t.get('type') in COLORSCALE_TRACES and 'colorscale' not in t for t in traces):
+        keep.update({k: layout[k] for k in ('colorscale', 'coloraxis') if k in layout})
+    return {'layout': keep}
+
+
+def lite_spec(fig, digits=LITE_DIGITS):
+    """그림 → 축소된 figure dict"""
+    spec = json.loads(fig.to_json())
+    traces = spec.get('data', [])
+    for trace in traces:
+        template = _text_template(trace)
+        if template is not None:
+            trace['texttemplate'] = template
+            trace.pop('text', None)
+        for key in NUMERIC_KEYS:
+            if key in trace:
+                trace[key] = _round_values(trace[key], digits)
+        for key in ('error_x', 'error_y'):
+            for sub in ('array', 'arrayminus'):
+                if sub in trace.get(key, {}):
+                    trace[key][sub] = _round_values(trace[key][sub], digits)
+    layout = spec.setdefault('layout', {})
+    layout['template'] = _lite_template(layout.get('template'), traces)
+    return spec
+
+
+def figure_payload(fig, mode):
+    """(전송 객체, 전송 바이트, 전체 모드 바이트) — 전송 객체는 mode 에 따라 Figure 또는 PNG bytes"""
+    import plotly.io as pio
+    import plotly.graph_objects as go
+
+    if mode not in RENDER_MODES:
+        mode = 'full'
+    with _lock:
+        cached = dict(_memo.get(id(fig), {}))
+    # 원본 그림은 메모에 담지 않음 (강한 참조가 남으면 해제 시 메모 정리가 일어나지 않음)
+    if 'full' not in cached:
+        cached['full'] = _spec_bytes(pio.to_json(fig, validate=False))
+    if mode == 'lite' and 'lite' not in cached:
+        lite = go.Figure(lite_spec(fig))
+        cached['lite'] = (lite, _spec_bytes(pio.to_json(lite, validate=False)))
+    elif mode == 'image' and 'image' not in cached:
+        png = fig.to_image(format='png')
+        cached['image'] = (png, len(png))
+    with _lock:
+        if id(fig) not in _memo:
+            weakref.finalize(fig, _memo.pop, id(fig), None)
+        _memo[id(fig)] = cached
+
+    payload, size = (fig, cached['full']) if mode == 'full' else cached[mode]
+    return payload, size, cached['full']
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+from ingest import NUMERIC_COLUMNS
+
+# ===== 구분 → 중분류 → 세부기술 집계 트리 =====
+HIERARCHY_LEVELS = ('전체', '구분', '중분류', '세부기술')
+ROOT_LABEL = '전체 기후기술'
+UNKNOWN_TYPE = '미분류'
+
+
+def count_column(col):
+    return f'{col}_count'
+
+
+def build_aggregation_tree(df):
+    """세부기술 DF → 전위 순회(DFS) 순서의 노드 DF (데이터 버전당 1회)
+
+    노드마다 전 국가·지표 평균과 유효 값 수, 세부기술 수를 담고, 'end' 는 하위 트리가 끝나는 위치라
+    임의 노드의 하위 트리는 tree.iloc[node:end] 슬라이스로 바로 얻는다.
+    """
+    data = df[['type', 'tech_category', 'tech_detail'] + NUMERIC_COLUMNS].reset_index(drop=True).copy()
+    data['type'] = data['type'].fillna(UNKNOWN_TYPE).astype(str)
+    data['tech_category'] = data['tech_category'].astype(str)
+    data['tech_detail'] = data['tech_detail'].astype(str)
+    data = data.sort_values(['type', 'tech_category', 'tech_detail'], kind='stable').reset_index(drop=True)
+
+    # 정렬 순위 키 (부모는 하위 키 -1 → 정렬 시 자식보다 앞)
+    t_rank = pd.factorize(data['type'], sort=True)[0]
+    c_rank = pd.factorize(data['type'] + '\x1f' + data['tech_category'], sort=True)[0]
+    d_rank = np.arange(len(data))
+    counts = {count_column(c): data[c].notna().astype('int64') for c in NUMERIC_COLUMNS}
+    annotated = data.assign(**counts, t_rank=t_rank, c_rank=c_rank)
+
+    def level_frame(keys, level):
+        if keys:
+            grouped = annotated.groupby(keys, sort=True)
+            frame = grouped[NUMERIC_COLUMNS].mean().join(grouped[list(counts)].sum()) \
+                .join(grouped[['t_rank', 'c_rank']].first()).reset_index()
+            frame['detail_count'] = grouped.size().to_numpy()
+        else:
+            frame = pd.concat([annotated[NUMERIC_COLUMNS].mean(), annotated[list(counts)].sum()]).to_frame().T
+            frame['t_rank'] = -1
+            frame['detail_count'] = len(annotated)
+        if level < 2:
+            frame['c_rank'] = -1
+        frame['level'] = level
+        frame['d_rank'] = -1
+        return frame
+
+    root = level_frame([], 0)
+    root['label'] = ROOT_LABEL
+    types = level_frame(['type'], 1)
+    types['label'] = types['type']
+    categories = level_frame(['type', 'tech_category'], 2)
+    categories['label'] = categories['tech_category']
+    details = annotated.assign(d_rank=d_rank, detail_count=1, level=3)
+    details['label'] = details['tech_detail']
+
+    tree = pd.concat([root, types, categories, details], ignore_index=True)
+    tree = tree.sort_values(['t_rank', 'c_rank', 'd_rank'], kind='stable').reset_index(drop=True)
+
+    # 부모 위치 · 하위 트리 끝 위치 (세부기술 수 + 하위 노드 수로 계산)
+    level = tree['level'].to_numpy()
+    position = np.arange(len(tree))
+    last_at_level = np.full(4, -1)
+    parent = np.full(len(tree), -1)
+    for i, lv in enumerate(level):
+        if lv > 0:
+            parent[i] = last_at_level[lv - 1]
+        last_at_level[lv] = i
+    n_categories = np.bincount(parent[level == 2], minlength=len(tree))
+    n_cat_total = np.zeros(len(tree), dtype='int64')
+    n_cat_total[level == 0] = (level == 2).sum()
+    n_cat_total[level == 1] = n_categories[level == 1]
+    size = 1 + np.where(level == 3, 0, tree['detail_count'].to_numpy()) + np.where(level <= 1, n_cat_total, 0) \
+        + np.where(level == 0, (level == 1).sum(), 0)
+
+    tree['node'] = position
+    tree['parent'] = parent
+    tree['end'] = position + size
+    tree.loc[tree['level'] < 2, 'tech_category'] = None
+    tree.loc[tree['level'] < 3, 'tech_detail'] = None
+    tree.loc[tree['level'] < 1, 'type'] = None
+    tree[list(counts)] = tree[list(counts)].astype('int64')
+    columns = ['node', 'parent', 'end', 'level', 'label', 'type', 'tech_category', 'tech_detail', 'detail_count']
+    return tree[columns + NUMERIC_COLUMNS + list(counts)]
+
+
+def subtree(tree, node, max_depth=None):
+    """node 를 루트로 하는 하위 트리 (max_depth: 루트 기준 포함할 깊이)"""
+    root = tree.iloc[node]
+    sub = tree.iloc[node:int(root['end'])]
+    if max_depth is not None:
+        sub = sub[sub['level'] <= root['level'] + max_depth]
+    return sub
+
+
+def node_path(tree, node):
+    """루트부터 node 까지 라벨 경로"""
+    labels = []
+    while node >= 0:
+        labels.append(tree.at[node, 'label'])
+        node = int(tree.at[node, 'parent'])
+    return ' › '.join(reversed(labels))
@@ -0,0 +1,108 @@
+import os
+import glob
+
+import pandas as pd
+
+from ingest import CACHE_DIR, COUNTRY_CODES, SCOPE_TYPES, build_category_data
+
+# ===== 연도 파티션 저장소 (year=YYYY/ 하위에 detail/category/scope 집계 저장) =====
+PARTITION_KINDS = ('detail', 'category', 'scope')
+TREND_METRICS = ('tech_level', 'tech_gap')
+
+
+def partition_root(data_version, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, 'partitions', str(data_version))
+
+
+def _partition_file(root, year, kind):
+    return os.path.join(root, f"year={int(year)}", f"{kind}.parquet")
+
+
+def build_scope_summary(category_data):
+    """범위(전체/감축/적응)별 국가 평균 기술수준·격차 (연도 파티션당 1회 계산)"""
+    value_cols = [f'{code}_{metric}' for code in COUNTRY_CODES for metric in TREND_METRICS]
+    rows = []
+    for scope, type_value in SCOPE_TYPES.items():
+        part = category_data if type_value is None else category_data[category_data['type'] == type_value]
+        row = part[value_cols].mean().to_dict()
+        row['scope'] = scope
+        row['category_count'] = int(len(part))
+        row['leading_count'] = int((part['kr_tech_group'] == '선도').sum())
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def write_year_partitions(full_df, data_version, cache_dir=CACHE_DIR):
+    """조사연도별 세부기술/중분류/범위 집계를 파티션으로 저장 — 이미 있으면 건너뜀
+
+    반환: 파티션이 존재하는 조사연도 목록 (오름차순)
+    """
+    root = partition_root(data_version, cache_dir)
+    dated = full_df[full_df['survey_year'].notna()]
+
+    for year, detail in dated.groupby('survey_year', sort=True):
+        if all(os.path.exists(_partition_file(root, year, kind)) for kind in PARTITION_KINDS):
+            continue
+        os.makedirs(os.path.dirname(_partition_file(root, year, 'detail')), exist_ok=True)
+        category = build_category_data(detail)
+        frames = {'detail': detail.reset_index(drop=True),
+                  'category': category,
+                  'scope': build_scope_summary(category)}
+        for kind, frame in frames.items():
+            frame = frame.copy()
+            frame['survey_year'] = int(year)
+            tmp_file = _partition_file(root, year, kind) + '.tmp'
+            frame.to_parquet(tmp_file, index=False)
+            os.replace(tmp_file, _partition_file(root, year, kind))
+
+    return available_years(data_version, cache_dir)
+
+
+def available_years(data_version, cache_dir=CACHE_DIR):
+    root = partition_root(data_version, cache_dir)
+    years = []
+    for path in glob.glob(os.path.join(root, 'year=*')):
+        try:
+            years.append(int(os.path.basename(path).split('=', 1)[1]))
+        except ValueError:
+            continue
+    return sorted(years)
+
+
+def read_year_partitions(data_version, years, kind='category', columns=None, cache_dir=CACHE_DIR):
+    """요청한 연도의 파티션만 읽어 결합 (columns 지정 시 해당 컬럼만 로드)"""
+    if kind not in PARTITION_KINDS:
+        raise ValueError(f"알 수 없는 파티션 종류: {kind}")
+    root = partition_root(data_version, cache_dir)
+    read_cols = None if columns is None else list(dict.fromkeys(list(columns) + ['survey_year']))
+
+    frames = []
+    for year in sorted(years):
+        path = _partition_file(root, year, kind)
+        if os.path.exists(path):
+            frames.append(pd.read_parquet(path, columns=read_cols))
+    if not frames:
+        return pd.DataFrame(columns=read_cols or [])
+    return pd.concat(frames, ignore_index=True)
+
+
+def build_trend_frame(part_df, keys, value_cols, country_labels):
+    """파티션 DF → (연도, 키, 국가, 값) long 형식 (라인차트용)"""
+    long_df = part_df.melt(id_vars=['survey_year'] + keys, value_vars=value_cols,
+                           var_name='column', value_name='value')
+    long_df['국가'] = long_df['column'].str.split('_', n=1).str[0].map(country_labels)
+    return long_df.drop(columns='column').dropna(subset=['value'])
+
+
+def build_yoy_table(part_df, keys, value_col):
+    """키별 연도 값 + 직전 회차 대비 증감(Δ) 테이블"""
+    wide = part_df.pivot_table(index=keys, columns='survey_year', values=value_col, aggfunc='mean')
+    wide = wide.reindex(sorted(wide.columns), axis=1)
+    years = list(wide.columns)
+
+    out = wide.copy()
+    out.columns = [str(y) for y in years]
+    deltas = wide.diff(axis=1).iloc[:, 1:]
+    for prev, cur in zip(years[:-1], years[1:]):
+        out[f"Δ {prev}→{cur}"] = deltas[cur].values
+    return out.reset_index()
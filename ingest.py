@@ -0,0 +1,414 @@
+import os
+import re
+import glob
+import pickle
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# ===== 데이터 경로 설정 =====
+DATA_DIR = os.environ.get('TRACKER_DATA_DIR', '.')
+CACHE_DIR = os.environ.get('TRACKER_CACHE_DIR', '.cache')
+WORKBOOK_PATTERNS = ('*.xlsx', '*.xlsm', '*.xls')
+PARSER_VERSION = 2  # 파싱 로직 변경 시 증가 → 파일별 캐시 무효화
+
+# 원본 컬럼명 → 내부 컬럼명
+COLUMN_MAPPING = {
+    '세부기술': 'tech_detail',
+    '중분류': 'tech_category',
+    '감축/적응': 'type',
+    '최고 기술 보유국': 'leading_country',
+    '한국-기술 수준 (%)': 'kr_tech_level',
+    '한국-기술 격차 (년)': 'kr_tech_gap',
+    '한국-기술 수준 그룹': 'kr_tech_group',
+    '중국-기술 수준 (%)': 'cn_tech_level',
+    '중국-기술 격차 (년)': 'cn_tech_gap',
+    '일본-기술 수준 (%)': 'jp_tech_level',
+    '일본-기술 격차 (년)': 'jp_tech_gap',
+    '미국-기술 수준 (%)': 'us_tech_level',
+    '미국-기술 격차 (년)': 'us_tech_gap',
+    'EU-기술 수준 (%)': 'eu_tech_level',
+    'EU-기술 격차 (년)': 'eu_tech_gap',
+    '한국-연구 개발 활동 경향': 'kr_rd_trend',
+    '한국-기초 연구 역량(점)': 'kr_basic_research',
+    '한국-응용 개발 연구 역량(점)': 'kr_applied_research',
+    '중국-연구 개발 활동 경향': 'cn_rd_trend',
+    '중국-기초 연구 역량(점)': 'cn_basic_research',
+    '중국-응용 개발 연구 역량(점)': 'cn_applied_research',
+    '일본-연구 개발 활동 경향': 'jp_rd_trend',
+    '일본-기초 연구 역량(점)': 'jp_basic_research',
+    '일본-응용 개발 연구 역량(점)': 'jp_applied_research',
+    '미국-연구 개발 활동 경향': 'us_rd_trend',
+    '미국-기초 연구 역량(점)': 'us_basic_research',
+    '미국-응용 개발 연구 역량(점)': 'us_applied_research',
+    'EU-연구 개발 활동 경향': 'eu_rd_trend',
+    'EU-기초 연구 역량(점)': 'eu_basic_research',
+    'EU-응용 개발 연구 역량(점)': 'eu_applied_research'
+}
+
+COUNTRY_CODES = ['kr', 'cn', 'jp', 'us', 'eu']
+NUMERIC_COLUMNS = [f'{code}_{metric}' for code in COUNTRY_CODES
+                   for metric in ('tech_level', 'tech_gap', 'basic_research', 'applied_research')]
+TEXT_COLUMNS = ['tech_detail', 'tech_category', 'type', 'leading_country', 'kr_tech_group'] + \
+               [f'{code}_rd_trend' for code in COUNTRY_CODES]
+SOURCE_COLUMNS = ['survey_year', 'source_file', 'source_sheet']
+# 숫자 변환 실패로 결측 처리된 셀 — 행별 비트마스크 (비트 i = NUMERIC_COLUMNS[i])
+COERCED_MASK_COLUMN = 'coerced_mask'
+
+# 분석 범위 → type 값 (None = 전체)
+SCOPE_TYPES = {'전체': None, '감축기술': '감축', '적응기술': '적응'}
+
+# 조사 시트 판별용 필수 컬럼 (맵핑표 등 보조 시트는 제외)
+REQUIRED_COLUMNS = ['세부기술', '중분류']
+
+_YEAR_RE = re.compile(r'(?<!\d)((?:19|20)\d{2})(?!\d)')
+
+
+def discover_workbooks(data_dir=DATA_DIR):
+    """데이터 디렉터리에서 조사 워크북 목록 탐색 (임시파일 ~$ 제외)"""
+    paths = set()
+    for pattern in WORKBOOK_PATTERNS:
+        paths.update(glob.glob(os.path.join(data_dir, pattern)))
+    return sorted(p for p in paths if not os.path.basename(p).startswith('~$'))
+
+
+def extract_survey_year(*names):
+    """파일명/시트명에서 조사연도(4자리) 추출, 없으면 None"""
+    for name in names:
+        match = _YEAR_RE.search(str(name))
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def file_signature(path):
+    """경로 + 수정시각 + 크기 기반 파일 서명 (캐시 키/데이터 버전용)"""
+    stat = os.stat(path)
+    raw = f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}|{PARSER_VERSION}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def dataset_version(paths):
+    """소스 파일 전체의 서명을 합친 데이터 버전 문자열"""
+    joined = '|'.join(file_signature(p) for p in sorted(paths))
+    return hashlib.sha1(joined.encode('utf-8')).hexdigest()[:12]
+
+
+def current_dataset_version(data_dir=DATA_DIR):
+    """데이터 디렉터리 현재 상태의 데이터 버전 (파일 stat만 사용, 파싱 없음)"""
+    paths = discover_workbooks(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"'{data_dir}' 경로에 조사 워크북(.xlsx)이 없습니다.")
+    return dataset_version(paths)
+
+
+def normalize_frame(df):
+    """컬럼명 정리 + 스키마 보정(누락 컬럼 추가) + 숫자형 변환"""
+    df = df.rename(columns=COLUMN_MAPPING)
+
+    for col in NUMERIC_COLUMNS + TEXT_COLUMNS:
+        if col not in df.columns:
+            df[col] = float('nan') if col in NUMERIC_COLUMNS else None
+
+    # 값이 있었는데 숫자 변환 후 결측이 된 셀을 비트마스크로 기록 (데이터 품질 보고서용)
+    raw_present = df[NUMERIC_COLUMNS].notna().to_numpy()
+    for col in NUMERIC_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+    coerced = raw_present & df[NUMERIC_COLUMNS].isna().to_numpy()
+    df[COERCED_MASK_COLUMN] = coerced.astype('int64') @ (1 << np.arange(len(NUMERIC_COLUMNS), dtype='int64'))
+
+    # 세부기술이 비어 있는 행(합계/공백 행)은 제외
+    df = df[df['tech_detail'].notna() & df['tech_category'].notna()]
+    return df.reset_index(drop=True)
+
+
+def parse_workbook(path):
+    """워크북 1개의 모든 조사 시트를 읽어 연도/시트 태그를 붙여 반환 (워커 프로세스에서 실행)"""
+    sheets = pd.read_excel(path, sheet_name=None)
+    file_name = os.path.basename(path)
+    frames = []
+    for sheet_name, raw in sheets.items():
+        if not all(col in raw.columns for col in REQUIRED_COLUMNS):
+            continue
+        frame = normalize_frame(raw)
+        frame['survey_year'] = extract_survey_year(file_name, sheet_name)
+        frame['source_file'] = file_name
+        frame['source_sheet'] = str(sheet_name)
+        frames.append(frame)
+
+    if not frames:
+        return pd.DataFrame(columns=TEXT_COLUMNS + NUMERIC_COLUMNS + SOURCE_COLUMNS + [COERCED_MASK_COLUMN])
+    return pd.concat(frames, ignore_index=True)
+
+
+def _cache_path(path, cache_dir):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, 'ingest', f"{stem}-{file_signature(path)}.pkl")
+
+
+def _read_cached(path, cache_dir):
+    cache_file = _cache_path(path, cache_dir)
+    if not os.path.exists(cache_file):
+        return None
+    try:
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return None
+
+
+def _write_cached(path, cache_dir, frame):
+    cache_file = _cache_path(path, cache_dir)
+    try:
+        os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+        tmp_file = cache_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(frame, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass  # 캐시 기록 실패는 무시 (다음 로드 시 재파싱)
+
+
+def parse_workbooks(paths, cache_dir=CACHE_DIR, max_workers=None):
+    """워크북별 파싱 결과 반환 — 캐시에 없는 파일만 병렬 워커 프로세스로 파싱"""
+    results = {}
+    pending = []
+    for path in paths:
+        cached = _read_cached(path, cache_dir)
+        if cached is not None:
+            results[path] = cached
+        else:
+            pending.append(path)
+
+    if len(pending) == 1:
+        # 1개 파일은 프로세스 풀 기동 비용 없이 현재 프로세스에서 처리
+        results[pending[0]] = parse_workbook(pending[0])
+    elif pending:
+        from concurrent.futures import ProcessPoolExecutor
+        workers = max_workers or min(len(pending), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, frame in zip(pending, pool.map(parse_workbook, pending)):
+                results[path] = frame
+
+    for path in pending:
+        _write_cached(path, cache_dir, results[path])
+
+    return [results[path] for path in paths]
+
+
+# 중분류별 데이터 집계 (평균값 사용)
+def build_category_data(df):
+    """세부기술 단위 DF → 중분류 단위 집계 DF"""
+    category_data = df.groupby('tech_category').agg({
+        'type': 'first',
+        'kr_tech_level': 'mean',
+        'kr_tech_gap': 'mean',
+        'kr_tech_group': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
+        'cn_tech_level': 'mean',
+        'cn_tech_gap': 'mean',
+        'jp_tech_level': 'mean',
+        'jp_tech_gap': 'mean',
+        'us_tech_level': 'mean',
+        'us_tech_gap': 'mean',
+        'eu_tech_level': 'mean',
+        'eu_tech_gap': 'mean',
+        'kr_rd_trend': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
+        'kr_basic_research': 'mean',
+        'kr_applied_research': 'mean',
+        'cn_basic_research': 'mean',
+        'cn_applied_research': 'mean',
+        'jp_basic_research': 'mean',
+        'jp_applied_research': 'mean',
+        'us_basic_research': 'mean',
+        'us_applied_research': 'mean',
+        'eu_basic_research': 'mean',
+        'eu_applied_research': 'mean',
+        'leading_country': lambda x: x.mode().iloc[0] if len(x.mode()) > 0 else 'N/A',
+        'tech_detail': 'count'
+    }).reset_index()
+
+    # 컬럼명 변경
+    return category_data.rename(columns={'tech_detail': 'detail_count'})
+
+
+def load_tracker_dataset(data_dir=DATA_DIR, cache_dir=CACHE_DIR):
+    """데이터 디렉터리의 전체 조사 데이터를 하나의 타입 고정 DataFrame으로 결합
+
+    반환: (df, data_version)
+    """
+    paths = discover_workbooks(data_dir)
+    if not paths:
+        raise FileNotFoundError(f"'{data_dir}' 경로에 조사 워크북(.xlsx)이 없습니다.")
+
+    frames = [frame for frame in parse_workbooks(paths, cache_dir) if not frame.empty]
+    if not frames:
+        raise ValueError(f"'{data_dir}' 경로의 워크북에서 조사 시트(세부기술/중분류 컬럼)를 찾지 못했습니다.")
+
+    df = pd.concat(frames, ignore_index=True)
+    df[NUMERIC_COLUMNS] = df[NUMERIC_COLUMNS].astype('float64')
+    df['survey_year'] = df['survey_year'].astype('Int64')
+    return df, dataset_version(paths)
+
+
+def data_quality_report(df, known_categories=None):
+    """조사 DF 데이터 품질 보고서 (결측 · 변환 실패 행렬을 한 번 만들어 모든 집계에 재사용)
+
+    반환: {'summary': 요약 dict, 'columns': 컬럼별 변환 실패·결측 DF, 'missing': 국가 × 지표 결측 DF,
+           'categories': 결측 세부기술이 있는 중분류 DF, 'unknown_categories': 기준 목록에 없는 중분류 DF,
+           'sources': 시트별 변환 실패 DF}
+    변환 실패 셀은 워크북(xlsx) 소스에서만 추적 — 이미 숫자형으로 저장된 소스는 'tracked' 가 False.
+    """
+    n_cols = len(NUMERIC_COLUMNS)
+    missing = df[NUMERIC_COLUMNS].isna().to_numpy()
+    tracked = COERCED_MASK_COLUMN in df.columns
+    if tracked:
+        mask = df[COERCED_MASK_COLUMN].fillna(0).to_numpy(dtype='int64')
+        coerced = ((mask[:, None] >> np.arange(n_cols, dtype='int64')) & 1).astype(bool)
+    else:
+        coerced = np.zeros_like(missing)
+
+    codes = [c.split('_', 1)[0] for c in NUMERIC_COLUMNS]
+    metrics = [c.split('_', 1)[1] for c in NUMERIC_COLUMNS]
+    columns = pd.DataFrame({
+        'column': NUMERIC_COLUMNS, 'country': codes, 'metric': metrics,
+        'coerced': coerced.sum(axis=0), 'missing': missing.sum(axis=0),
+    })
+    columns['missing_share'] = columns['missing'] / max(len(df), 1)
+    missing_table = columns.pivot(index='country', columns='metric', values='missing').reindex(COUNTRY_CODES)
+
+    keys = df[['survey_year', 'tech_category']].reset_index(drop=True)
+    per_row = keys.assign(detail_missing=missing.any(axis=1), missing_cells=missing.sum(axis=1),
+                          coerced_cells=coerced.sum(axis=1))
+    categories = per_row.groupby(['survey_year', 'tech_category'], dropna=False).agg(
+        details=('detail_missing', 'size'),
+        details_with_missing=('detail_missing', 'sum'),
+        missing_cells=('missing_cells', 'sum'),
+        coerced_cells=('coerced_cells', 'sum'),
+    ).reset_index()
+    categories = categories[categories['details_with_missing'] > 0].sort_values(
+        ['details_with_missing', 'missing_cells'], ascending=False).reset_index(drop=True)
+
+    if known_categories is not None:
+        known = set(known_categories)
+        unknown = per_row[~per_row['tech_category'].isin(known)]
+        unknown_categories = unknown.groupby(['tech_category', 'survey_year'], dropna=False).size() \
+            .rename('details').reset_index()
+    else:
+        unknown_categories = pd.DataFrame(columns=['tech_category', 'survey_year', 'details'])
+
+    source_keys = [c for c in ('source_file', 'source_sheet') if c in df.columns]
+    if source_keys:
+        sources = df[source_keys].reset_index(drop=True).assign(coerced_cells=coerced.sum(axis=1)) \
+            .groupby(source_keys, dropna=False)['coerced_cells'].sum().reset_index()
+        sources = sources[sources['coerced_cells'] > 0].reset_index(drop=True)
+    else:
+        sources = pd.DataFrame(columns=['coerced_cells'])
+
+    summary = {
+        'rows': len(df),
+        'tracked': tracked,
+        'coerced_cells': int(coerced.sum()),
+        'missing_cells': int(missing.sum()),
+        'details_with_missing': int(missing.any(axis=1).sum()),
+        'categories_with_missing': int(categories['tech_category'].nunique()),
+        'unknown_categories': int(unknown_categories['tech_category'].nunique()),
+    }
+    return {'summary': summary, 'columns': columns, 'missing': missing_table, 'categories': categories,
+            'unknown_categories': unknown_categories, 'sources': sources}
+
+
+# ===== 조사 행 이상치 · 불일치 탐지 (조사연도별 기준 — 회차마다 척도 · 응답 분포가 다를 수 있음) =====
+ROBUST_Z_THRESHOLD = 3.5       # 수정 z 점수 (Iglewicz–Hoaglin 권장 기준)
+RESIDUAL_Z_THRESHOLD = 3.5     # 수준 → 격차 회귀 잔차의 수정 z 점수
+TECH_GROUP_ORDER = ('후발', '추격', '선도')
+ANOMALY_LABELS = {'robust_z': '극단값', 'residual': '수준-격차 불일치', 'group_mismatch': '그룹-수준 불일치'}
+
+
+def _robust_z(frame, keys):
+    """그룹(keys)별 수정 z 점수 — 0.6745 · (x - 중앙값) / MAD
+
+    MAD 가 0인 그룹(값의 절반 이상이 같음 — 예: 최고기술국의 수준 100 · 격차 0)은 척도를 정할 수 없어 NaN.
+    """
+    median = frame.groupby(keys).transform('median')
+    mad = (frame - median).abs().groupby(keys).transform('median')
+    return 0.6745 * (frame - median) / mad.where(mad > 0)
+
+
+def _level_gap_residual_z(df, years):
+    """국가별 기술격차 ~ 기술수준 최소제곱 회귀 잔차의 수정 z 점수 (행, 국가) — 조사연도 · 국가별 적합"""
+    level = df[[f'{code}_tech_level' for code in COUNTRY_CODES]].to_numpy(dtype='float64')
+    gap = df[[f'{code}_tech_gap' for code in COUNTRY_CODES]].to_numpy(dtype='float64')
+    n, k = level.shape
+    long = pd.DataFrame({'year': np.repeat(years, k), 'country': np.tile(np.arange(k), n),
+                         'x': level.ravel(), 'y': gap.ravel()})
+    long = long[long['x'].notna() & long['y'].notna()]
+    keys = [long['year'], long['country']]
+    sums = long.assign(xx=long['x'] ** 2, xy=long['x'] * long['y'])[['x', 'y', 'xx', 'xy']] \
+        .groupby(keys).transform('mean')
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (sums['xy'] - sums['x'] * sums['y']) / (sums['xx'] - sums['x'] ** 2)
+    slope = slope.where(np.isfinite(slope), 0.0)
+    residual = long['y'] - (sums['y'] + slope * (long['x'] - sums['x']))
+    z = _robust_z(residual.to_frame('r'), keys)['r']
+
+    out = np.full(n * k, np.nan)
+    out[long.index.to_numpy()] = z.to_numpy()
+    return out.reshape(n, k)
+
+
+def detect_anomalies(df):
+    """조사 DF 이상치 · 불일치 탐지 (전 행 · 전 지표를 벡터 연산으로 한 번에 판정)
+
+    - robust_z: 조사연도별 수정 z 점수가 기준을 넘는 지표 값
+    - residual: 국가별 기술수준으로 예측한 기술격차와 크게 어긋나는 행
+    - group_mismatch: 한국 기술그룹(후발·추격·선도)과 기술수준이 인접 그룹 중앙값을 넘어 어긋나는 행
+    반환: {'summary': 요약 dict, 'flags': 판정 행 DF, 'categories': 조사연도 × 중분류별 건수 DF}
+    """
+    rows = df.reset_index(drop=True)
+    years = rows['survey_year'].fillna(-1).to_numpy() if 'survey_year' in rows.columns else np.zeros(len(rows))
+    year_key = pd.Series(years, index=rows.index)
+
+    z = _robust_z(rows[NUMERIC_COLUMNS].astype('float64'), year_key).to_numpy()
+    abs_z = np.abs(np.nan_to_num(z, nan=0.0))
+    z_col = abs_z.argmax(axis=1)
+    max_z = z[np.arange(len(rows)), z_col] if len(rows) else np.empty(0)
+    robust_flag = abs_z.max(axis=1, initial=0.0) > ROBUST_Z_THRESHOLD
+
+    residual_z = _level_gap_residual_z(rows, years)
+    abs_res = np.abs(np.nan_to_num(residual_z, nan=0.0))
+    res_country = abs_res.argmax(axis=1)
+    max_res = residual_z[np.arange(len(rows)), res_country] if len(rows) else np.empty(0)
+    residual_flag = abs_res.max(axis=1, initial=0.0) > RESIDUAL_Z_THRESHOLD
+
+    # 그룹 순위 r 인 행의 수준이 r-1 그룹 중앙값보다 낮거나 r+1 그룹 중앙값보다 높으면 불일치
+    rank = rows['kr_tech_group'].map({g: i for i, g in enumerate(TECH_GROUP_ORDER)}).to_numpy(dtype='float64')
+    level = rows['kr_tech_level'].to_numpy(dtype='float64')
+    medians = pd.DataFrame({'year': years, 'rank': rank, 'level': level}).dropna() \
+        .groupby(['year', 'rank'])['level'].median()
+    lookup = lambda r: medians.reindex(pd.MultiIndex.from_arrays([years, r])).to_numpy()
+    with np.errstate(invalid='ignore'):
+        group_flag = (level < lookup(rank - 1)) | (level > lookup(rank + 1))
+
+    flags = {'robust_z': robust_flag, 'residual': residual_flag, 'group_mismatch': group_flag}
+    any_flag = robust_flag | residual_flag | group_flag
+    reasons = pd.Series('', index=rows.index)
+    for kind, flag in flags.items():
+        reasons = reasons.where(~flag, reasons + np.where(reasons == '', '', ', ') + ANOMALY_LABELS[kind])
+
+    key_cols = [c for c in ('survey_year', 'type', 'tech_category', 'tech_detail', 'kr_tech_group',
+                            'kr_tech_level', 'kr_tech_gap') if c in rows.columns]
+    flagged = rows[key_cols].assign(
+        reasons=reasons, max_z=max_z, max_z_column=np.array(NUMERIC_COLUMNS)[z_col] if len(rows) else [],
+        residual_z=max_res, residual_country=np.array(COUNTRY_CODES)[res_country] if len(rows) else [],
+        **flags)[any_flag].reset_index(drop=True)
+
+    counts = rows[['tech_category']].assign(year=years, details=1, flagged=any_flag, **flags)
+    categories = counts.groupby(['year', 'tech_category'], dropna=False)[
+        ['details', 'flagged'] + list(flags)].sum().reset_index().rename(columns={'year': 'survey_year'})
+    categories = categories[categories['flagged'] > 0].sort_values(
+        ['flagged', 'details'], ascending=[False, True]).reset_index(drop=True)
+
+    summary = {'rows': len(rows), 'flagged_rows': int(any_flag.sum()),
+               **{kind: int(flag.sum()) for kind, flag in flags.items()}}
+    return {'summary': summary, 'flags': flagged, 'categories': categories}
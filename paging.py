@@ -0,0 +1,41 @@
+import math
+
+import numpy as np
+
+# ===== 서버 측 표 페이지 분할 (필터 · 정렬은 숫자 키 배열 연산, 화면에는 현재 페이지만 전송) =====
+PAGE_SIZES = (20, 50, 100)
+
+
+def numeric_range(frame, column):
+    """필터 슬라이더 범위 (결측 제외, 값이 없으면 None)"""
+    values = frame[column].to_numpy(dtype='float64')
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return None
+    return float(values.min()), float(values.max())
+
+
+def ordered_rows(frame, sort_col=None, ascending=True, filters=None):
+    """필터 통과 행 위치를 정렬 순서로 반환 — filters: {컬럼: (하한, 상한)}, 결측은 필터 시 제외 · 정렬 시 맨 뒤"""
+    mask = np.ones(len(frame), dtype=bool)
+    for col, (low, high) in (filters or {}).items():
+        values = frame[col].to_numpy(dtype='float64')
+        with np.errstate(invalid='ignore'):
+            mask &= (values >= low) & (values <= high)
+    rows = np.flatnonzero(mask)
+    if sort_col is not None:
+        keys = frame[sort_col].to_numpy(dtype='float64')[rows]
+        # 내림차순은 부호 반전 (NaN 은 그대로 NaN → 양방향 모두 맨 뒤, 동률은 원래 순서 유지)
+        rows = rows[np.argsort(keys if ascending else -keys, kind='stable')]
+    return rows
+
+
+def page_count(total, page_size):
+    return max(1, math.ceil(total / page_size))
+
+
+def page_rows(rows, page, page_size):
+    """1부터 시작하는 page 의 행 위치 (범위 밖이면 마지막 페이지로 보정)"""
+    page = min(max(1, int(page)), page_count(len(rows), page_size))
+    start = (page - 1) * page_size
+    return rows[start:start + page_size], start
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+
+from ingest import COUNTRY_CODES, SCOPE_TYPES
+
+# ===== 국가 쌍 비교 (전 순서쌍 차이 텐서) =====
+PAIR_METRICS = ('tech_level', 'tech_gap')
+# 유리한 방향: 기술수준은 높을수록(+1), 기술격차는 작을수록(-1)
+METRIC_DIRECTION = {'tech_level': 1.0, 'tech_gap': -1.0}
+
+
+def _outcome_counts(signed):
+    """(행, a, b, 지표) 유불리 값 → 승 · 패 · 동률 건수 (a, b, 지표), 결측 쌍은 제외"""
+    return (signed > 0).sum(axis=0), (signed < 0).sum(axis=0), (signed == 0).sum(axis=0)
+
+
+def build_pair_tensor(df):
+    """세부기술 DF → 5개국 전 순서쌍 차이 텐서 (데이터 버전당 1회)
+
+    diff[i, a, b, m] = 국가 a 값 - 국가 b 값 (세부기술 i, 지표 m), cat_diff 는 중분류 평균 기준.
+    counts[scope][level] = (승, 패, 동률) 배열 (a, b, 지표) — level 은 'detail' 또는 'category'.
+    """
+    values = np.stack([df[[f'{code}_{metric}' for code in COUNTRY_CODES]].to_numpy(dtype='float64')
+                       for metric in PAIR_METRICS], axis=2)               # (행, 국가, 지표)
+    diff = values[:, :, None, :] - values[:, None, :, :]                 # (행, a, b, 지표)
+    direction = np.array([METRIC_DIRECTION[m] for m in PAIR_METRICS])
+
+    details = df[['type', 'tech_category', 'tech_detail']].reset_index(drop=True).copy()
+    n, k, m = len(details), len(COUNTRY_CODES), len(PAIR_METRICS)
+    grouped = pd.DataFrame(diff.reshape(n, -1)).groupby(details['tech_category'].astype(str).to_numpy())
+    cat_means = grouped.mean()
+    categories = pd.DataFrame({'tech_category': cat_means.index.to_numpy()})
+    categories['type'] = details.groupby('tech_category')['type'].first().reindex(categories['tech_category']).to_numpy()
+    categories['detail_count'] = grouped.size().to_numpy()
+    cat_diff = cat_means.to_numpy().reshape(len(categories), k, k, m)
+
+    counts = {}
+    detail_type = details['type'].to_numpy()
+    category_type = categories['type'].to_numpy()
+    for scope, type_value in SCOPE_TYPES.items():
+        d_mask = np.ones(n, dtype=bool) if type_value is None else detail_type == type_value
+        c_mask = np.ones(len(categories), dtype=bool) if type_value is None else category_type == type_value
+        counts[scope] = {'detail': _outcome_counts(diff[d_mask] * direction),
+                         'category': _outcome_counts(cat_diff[c_mask] * direction)}
+
+    return {'details': details, 'categories': categories, 'diff': diff, 'cat_diff': cat_diff, 'counts': counts}
+
+
+def pair_comparison(tensor, a, b, scope='전체', top=10):
+    """국가 a 대 b 비교 (텐서 조회 + 범위 필터만 수행)
+
+    반환: {'details', 'categories': 지표별 차이 DF, 'counts': {level: {metric: (승, 패, 동률)}},
+           'advantages', 'deficits': 기술수준 차이 상·하위 세부기술 DF}
+    """
+    ia, ib = COUNTRY_CODES.index(a), COUNTRY_CODES.index(b)
+    type_value = SCOPE_TYPES[scope]
+
+    def frame(keys, diff):
+        out = keys.copy()
+        for j, metric in enumerate(PAIR_METRICS):
+            out[f'{metric}_diff'] = diff[:, ia, ib, j]
+        out['advantage'] = (np.sign(out['tech_level_diff']).fillna(0) - np.sign(out['tech_gap_diff']).fillna(0)) / 2
+        return out if type_value is None else out[out['type'] == type_value].reset_index(drop=True)
+
+    details = frame(tensor['details'], tensor['diff'])
+    categories = frame(tensor['categories'], tensor['cat_diff'])
+    counts = {level: {metric: tuple(int(c[ia, ib, j]) for c in outcome) for j, metric in enumerate(PAIR_METRICS)}
+              for level, outcome in tensor['counts'][scope].items()}
+
+    ranked = details.dropna(subset=['tech_level_diff'])
+    return {'details': details, 'categories': categories, 'counts': counts,
+            'advantages': ranked.nlargest(top, 'tech_level_diff').reset_index(drop=True),
+            'deficits': ranked.nsmallest(top, 'tech_level_diff').reset_index(drop=True)}
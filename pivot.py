@@ -0,0 +1,134 @@
+import importlib.util
+
+import pandas as pd
+
+from ingest import COUNTRY_CODES
+
+# ===== 임의 피벗 탐색기 (DuckDB 인프로세스 엔진, 미설치 시 pandas) =====
+COUNTRY_NAMES = {'kr': '한국', 'cn': '중국', 'jp': '일본', 'us': '미국', 'eu': 'EU'}
+METRIC_NAMES = {'tech_level': '기술수준', 'tech_gap': '기술격차',
+                'basic_research': '기초연구역량', 'applied_research': '응용연구역량'}
+
+PIVOT_DIMENSIONS = {
+    'type': '구분',
+    'tech_category': '중분류',
+    'leading_country': '최고보유국',
+    'kr_tech_group': '한국 기술그룹',
+    **{f'{code}_rd_trend': f'{COUNTRY_NAMES[code]} R&D 경향' for code in COUNTRY_CODES},
+    'survey_year': '조사연도',
+}
+PIVOT_METRICS = {f'{code}_{metric}': f'{COUNTRY_NAMES[code]} {name}'
+                 for code in COUNTRY_CODES for metric, name in METRIC_NAMES.items()}
+# 집계명 → (DuckDB 함수, pandas 집계명)
+PIVOT_AGGREGATIONS = {
+    'mean': ('avg', 'mean'),
+    'median': ('median', 'median'),
+    'min': ('min', 'min'),
+    'max': ('max', 'max'),
+    'sum': ('sum', 'sum'),
+    'count': ('count', 'count'),
+    'std': ('stddev_samp', 'std'),
+}
+AGGREGATION_NAMES = {'mean': '평균', 'median': '중앙값', 'min': '최솟값', 'max': '최댓값',
+                     'sum': '합계', 'count': '건수', 'std': '표준편차'}
+
+HAS_DUCKDB = importlib.util.find_spec('duckdb') is not None
+PIVOT_ENGINES = ('duckdb', 'pandas') if HAS_DUCKDB else ('pandas',)
+
+
+def query_signature(rows, metrics, aggregations, years=None, column=None):
+    """피벗 조건 → 정규화된 캐시 키 (선택 순서와 무관한 부분은 정렬)"""
+    return (tuple(rows), tuple(metrics), tuple(sorted(aggregations, key=list(PIVOT_AGGREGATIONS).index)),
+            tuple(sorted(years)) if years else None, column)
+
+
+def _validate(rows, metrics, aggregations, column):
+    # 컬럼명은 SQL 식별자로 그대로 쓰이므로 허용 목록 외 값은 거부
+    unknown = [c for c in list(rows) + ([column] if column else []) if c not in PIVOT_DIMENSIONS]
+    unknown += [m for m in metrics if m not in PIVOT_METRICS]
+    unknown += [a for a in aggregations if a not in PIVOT_AGGREGATIONS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 피벗 항목: {', '.join(map(str, unknown))}")
+    if not metrics or not aggregations:
+        raise ValueError("지표와 집계 방법을 1개 이상 선택하세요.")
+
+
+def result_column(metric, aggregation):
+    return f'{metric}__{aggregation}'
+
+
+def _group_duckdb(df, keys, metrics, aggregations, years):
+    import duckdb
+
+    select = [f'"{k}"' for k in keys]
+    select += [f'{PIVOT_AGGREGATIONS[a][0]}("{m}") AS "{result_column(m, a)}"' for m in metrics for a in aggregations]
+    select.append('count(*) AS "rows"')
+    sql = f"SELECT {', '.join(select)} FROM details"
+    params = []
+    if years:
+        sql += f" WHERE survey_year IN ({', '.join('?' for _ in years)})"
+        params = list(years)
+    if keys:
+        group = ', '.join(f'"{k}"' for k in keys)
+        sql += f" GROUP BY {group} ORDER BY {group}"
+
+    columns = list(dict.fromkeys(list(keys) + list(metrics) + ['survey_year']))
+    con = duckdb.connect()
+    try:
+        con.register('details', df[columns])
+        return con.execute(sql, params).df()
+    finally:
+        con.close()
+
+
+def _group_pandas(df, keys, metrics, aggregations, years):
+    data = df[list(dict.fromkeys(list(keys) + list(metrics) + ['survey_year']))]
+    if years:
+        data = data[data['survey_year'].isin(years)]
+    spec = {result_column(m, a): (m, PIVOT_AGGREGATIONS[a][1]) for m in metrics for a in aggregations}
+    if not keys:
+        row = {name: data[m].agg(func) for name, (m, func) in spec.items()}
+        row['rows'] = len(data)
+        return pd.DataFrame([row])
+    grouped = data.groupby(list(keys), dropna=False, sort=True)
+    out = grouped.agg(**spec)
+    out['rows'] = grouped.size()
+    return out.reset_index()
+
+
+def run_pivot(df, rows, metrics, aggregations, years=None, column=None, engine=None):
+    """세부기술 DF 피벗 실행
+
+    rows: 행 차원 목록, column: 열로 펼칠 차원(선택), metrics × aggregations 조합을 집계.
+    반환: {'table': 결과 DF, 'engine': 실제 사용 엔진}
+    """
+    _validate(rows, metrics, aggregations, column)
+    engine = engine or PIVOT_ENGINES[0]
+    if engine not in PIVOT_ENGINES:
+        raise ValueError(f"사용할 수 없는 쿼리 엔진: {engine}")
+
+    keys = list(dict.fromkeys(list(rows) + ([column] if column else [])))
+    group = _group_duckdb if engine == 'duckdb' else _group_pandas
+    table = group(df, keys, list(metrics), list(aggregations), list(years) if years else None)
+
+    if column and rows:
+        value_cols = [c for c in table.columns if c not in keys]
+        table = table.pivot_table(index=list(rows), columns=column, values=value_cols, aggfunc='first', dropna=False)
+        table.columns = [f'{value} | {col}' for value, col in table.columns]
+        table = table.reset_index()
+    return {'table': table, 'engine': engine}
+
+
+def label_columns(table):
+    """결과 컬럼명 → 화면 표시명"""
+    def label(col):
+        base, _, suffix = str(col).partition(' | ')
+        if base == 'rows':
+            text = '행 수'
+        elif '__' in base:
+            metric, agg = base.split('__', 1)
+            text = f"{PIVOT_METRICS.get(metric, metric)} {AGGREGATION_NAMES.get(agg, agg)}"
+        else:
+            text = PIVOT_DIMENSIONS.get(base, base)
+        return f"{text} | {suffix}" if suffix else text
+    return table.rename(columns={c: label(c) for c in table.columns})
@@ -0,0 +1,163 @@
+import os
+import io
+import json
+import time
+import pstats
+import cProfile
+import threading
+import importlib.util
+from datetime import datetime
+
+import pandas as pd
+
+# ===== 세션 단위 rerun 프로파일 캡처 (켜진 세션의 main() 만 감쌈 — 꺼져 있으면 호출 경로 그대로) =====
+PROFILE_DIR = os.environ.get('TRACKER_PROFILE_DIR', 'profiles')
+PROFILE_KEEP = int(os.environ.get('TRACKER_PROFILE_KEEP', '50'))  # 초과분은 오래된 것부터 삭제
+PROFILE_QUERY_PARAM = 'profile'
+
+HAS_PYINSTRUMENT = importlib.util.find_spec('pyinstrument') is not None
+# cprofile: 결정적 호출 트리 (pstats) / pyinstrument: 샘플링 (speedscope JSON)
+PROFILER_ENGINES = ('cprofile', 'pyinstrument') if HAS_PYINSTRUMENT else ('cprofile',)
+PROFILE_SUFFIX = {'cprofile': '.prof', 'pyinstrument': '.speedscope.json'}
+META_SUFFIX = '.meta.json'
+
+# Python 3.12+ cProfile 은 프로세스 전체에서 동시에 1개만 활성화 가능 → 다른 세션이 측정 중이면 건너뜀
+_cprofile_lock = threading.Lock()
+
+
+def resolve_engine(value):
+    """쿼리 파라미터/토글 값 → 엔진명 (끄기 값·미지원 엔진이면 None)"""
+    if value is None:
+        return None
+    value = str(value).strip().lower()
+    if value in ('', '0', 'off', 'false', 'none'):
+        return None
+    if value in ('1', 'on', 'true'):
+        return PROFILER_ENGINES[0]
+    return value if value in PROFILER_ENGINES else None
+
+
+def _jsonable(value, limit=200):
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value if not isinstance(value, str) else value[:limit]
+    if isinstance(value, (list, tuple, set)):
+        return [_jsonable(v, limit) for v in list(value)[:50]]
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v, limit) for k, v in list(value.items())[:50]}
+    if isinstance(value, pd.DataFrame):
+        return f"<DataFrame {value.shape[0]}x{value.shape[1]}>"
+    return str(value)[:limit]
+
+
+def snapshot_state(state):
+    """세션 상태(위젯 값) → JSON 저장 가능한 dict"""
+    return {str(k): _jsonable(v) for k, v in sorted(state.items(), key=lambda kv: str(kv[0]))}
+
+
+def _prune(directory, keep):
+    metas = sorted(f for f in os.listdir(directory) if f.endswith(META_SUFFIX))
+    for meta_name in metas[:max(0, len(metas) - keep)]:
+        stem = meta_name[:-len(META_SUFFIX)]
+        for name in os.listdir(directory):
+            if name.startswith(stem):
+                try:
+                    os.remove(os.path.join(directory, name))
+                except OSError:
+                    pass
+
+
+def run_profiled(func, engine, context=None, directory=PROFILE_DIR, keep=PROFILE_KEEP):
+    """func 1회 실행을 프로파일링해 directory 에 저장
+
+    context: 실행 후 호출해 메타 파일에 함께 기록할 dict 를 돌려주는 함수 (위젯 상태 등).
+    st.stop()/st.rerun() 같은 제어 예외도 기록 후 그대로 전파.
+    반환: 메타 dict (동시 cProfile 측정 중이라 건너뛴 경우 None)
+    """
+    if engine not in PROFILER_ENGINES:
+        raise ValueError(f"사용할 수 없는 프로파일러: {engine}")
+
+    if engine == 'cprofile':
+        if not _cprofile_lock.acquire(blocking=False):
+            func()
+            return None
+        profiler = cProfile.Profile()
+    else:
+        from pyinstrument import Profiler
+        profiler = Profiler(interval=0.001, async_mode='disabled')
+
+    started_at = datetime.now()
+    outcome = '완료'
+    started = time.perf_counter()
+    try:
+        if engine == 'cprofile':
+            profiler.enable()
+        else:
+            profiler.start()
+        func()
+    except BaseException as e:
+        outcome = type(e).__name__
+        raise
+    finally:
+        if engine == 'cprofile':
+            profiler.disable()
+            _cprofile_lock.release()
+        else:
+            profiler.stop()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        meta = _save_profile(profiler, engine, started_at, elapsed_ms, outcome, context, directory, keep)
+    return meta
+
+
+def _save_profile(profiler, engine, started_at, elapsed_ms, outcome, context, directory, keep):
+    os.makedirs(directory, exist_ok=True)
+    stem = f"{started_at:%Y%m%d-%H%M%S-%f}-{engine}"
+    file_name = stem + PROFILE_SUFFIX[engine]
+    path = os.path.join(directory, file_name)
+    if engine == 'cprofile':
+        profiler.dump_stats(path)
+    else:
+        from pyinstrument.renderers import SpeedscopeRenderer
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(profiler.output(renderer=SpeedscopeRenderer()))
+
+    try:
+        extra = context() if context else {}
+    except Exception as e:
+        extra = {'context_error': f"{type(e).__name__}: {e}"}
+    meta = {'file': file_name, 'engine': engine, 'started_at': started_at.isoformat(timespec='seconds'),
+            'elapsed_ms': round(elapsed_ms, 1), 'outcome': outcome, **extra}
+    with open(os.path.join(directory, stem + META_SUFFIX), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    _prune(directory, keep)
+    return meta
+
+
+def list_profiles(directory=PROFILE_DIR):
+    """저장된 프로파일 메타 목록 (최신순, 'path'·'size' 포함)"""
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(META_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                meta = json.load(f)
+            path = os.path.join(directory, meta['file'])
+            meta.update(path=path, size=os.path.getsize(path))
+        except (OSError, ValueError, KeyError):
+            continue
+        profiles.append(meta)
+    return profiles
+
+
+def top_functions(path, sort='cumulative', limit=30):
+    """pstats 파일 → 상위 함수 DF (호출 수 · 자체/누적 시간 ms)"""
+    stats = pstats.Stats(path, stream=io.StringIO())
+    rows = []
+    for (file_name, line, func), (cc, nc, tt, ct, _) in stats.stats.items():
+        rows.append({'function': func, 'location': f"{os.path.basename(file_name)}:{line}",
+                     'calls': nc, 'tottime_ms': tt * 1000, 'cumtime_ms': ct * 1000})
+    key = 'cumtime_ms' if sort == 'cumulative' else 'tottime_ms'
+    frame = pd.DataFrame(rows, columns=['function', 'location', 'calls', 'tottime_ms', 'cumtime_ms'])
+    return frame.sort_values(key, ascending=False).head(limit).reset_index(drop=True)
@@ -0,0 +1,81 @@
+import numpy as np
+
+from ingest import COUNTRY_CODES
+
+# ===== 기술격차 해소(동등 수준 도달) 전망 =====
+# 연구개발 활동 경향 → 연간 기술 진척 속도 (년/년, 1.0 = 1년에 1년치 진척) 기본 가정
+TREND_LABELS = ('급상승', '상승', '유지', '하강')
+DEFAULT_TREND_PACE = {'급상승': 1.5, '상승': 1.2, '유지': 1.0, '하강': 0.8}
+UNKNOWN_TREND = '유지'   # 경향 미기재·기타 값은 '유지'로 간주
+# 뒤처진 국가가 선행 기술을 흡수해 얻는 추가 속도 (년/년) — 경향이 같아도 격차가 줄어드는 효과
+DEFAULT_CATCHUP = 0.1
+HORIZON_CAP = 50.0       # 이 기간을 넘기면 '도달 불가'로 표시
+
+RIVALS = [code for code in COUNTRY_CODES if code != 'kr']
+
+
+def assumption_key(paces, catchup=DEFAULT_CATCHUP, cap=HORIZON_CAP):
+    """가정 집합 → 해시 가능한 캐시 키 (project_gap_closure 인자 순서)"""
+    pace_items = tuple((label, float(paces.get(label, DEFAULT_TREND_PACE[label]))) for label in TREND_LABELS)
+    return pace_items, float(catchup), float(cap)
+
+
+def trend_paces(df, paces):
+    """(행, 국가) 진척 속도 배열 — rd_trend 값을 가정 속도로 일괄 매핑"""
+    lookup = {label: float(paces.get(label, DEFAULT_TREND_PACE[label])) for label in TREND_LABELS}
+    default = lookup[UNKNOWN_TREND]
+    trends = df[[f'{code}_rd_trend' for code in COUNTRY_CODES]].to_numpy(dtype=object)
+    labels, codes = np.unique(trends.astype(str), return_inverse=True)
+    table = np.array([lookup.get(label, default) for label in labels])
+    return table[codes].reshape(trends.shape)
+
+
+def project_gap_closure(df, paces=DEFAULT_TREND_PACE, catchup=DEFAULT_CATCHUP, cap=HORIZON_CAP):
+    """세부기술 × 국가 격차 해소 기간을 한 번의 배열 연산으로 계산
+
+    기술격차(년)는 최고기술국 대비 뒤처진 기간이므로, 한국이 상대국 r과 같아지는 기간은
+    (한국 격차 - r 격차) / (한국 속도 - r 속도 + 추격 효과). 이미 앞서면 0, 따라잡는 속도가 0 이하면 도달 불가(inf).
+    최고 수준 동등 도달 기간은 모든 상대국과의 도달 기간 중 최댓값.
+
+    반환: {'details': 세부기술별 DF, 'categories': 중분류별 DF}
+    """
+    paces = dict(paces)
+    gaps = df[[f'{code}_tech_gap' for code in COUNTRY_CODES]].to_numpy(dtype='float64')
+    pace = trend_paces(df, paces)
+
+    diff = gaps[:, :1] - gaps[:, 1:]          # (행, 상대국) — 양수면 한국이 뒤처짐
+    rate = pace[:, :1] - pace[:, 1:] + catchup  # 한국이 따라잡는 속도
+    with np.errstate(divide='ignore', invalid='ignore'):
+        horizon = np.where(diff <= 0, 0.0, np.where(rate > 0, diff / rate, np.inf))
+    horizon[np.isnan(diff)] = np.nan          # 격차 미기재 상대국은 판단 제외
+    horizon[horizon > cap] = np.inf
+
+    with np.errstate(invalid='ignore'):
+        has_value = ~np.isnan(horizon).all(axis=1)
+        parity = np.where(has_value, np.nanmax(np.where(np.isnan(horizon), -np.inf, horizon), axis=1), np.nan)
+        bottleneck = np.where(has_value, np.argmax(np.where(np.isnan(horizon), -np.inf, horizon), axis=1), -1)
+
+    details = df[['type', 'tech_category', 'tech_detail', 'kr_tech_gap', 'kr_rd_trend']].reset_index(drop=True).copy()
+    details['kr_pace'] = pace[:, 0]
+    for j, code in enumerate(RIVALS):
+        details[f'horizon_{code}'] = horizon[:, j]
+    details['horizon'] = parity
+    details['bottleneck'] = np.where(bottleneck >= 0, np.array(RIVALS, dtype=object)[np.maximum(bottleneck, 0)], None)
+    details.loc[details['horizon'] == 0, 'bottleneck'] = None
+    details['reachable'] = np.isfinite(parity)
+
+    # 중분류: 유한 기간 중앙값 · 최장 기간(전 세부기술 도달) · 도달 불가 건수
+    finite = details['horizon'].where(details['reachable'])
+    grouped = details.assign(finite=finite).groupby('tech_category')
+    categories = grouped.agg(
+        type=('type', 'first'),
+        detail_count=('tech_detail', 'count'),
+        kr_tech_gap=('kr_tech_gap', 'mean'),
+        median_horizon=('finite', 'median'),
+        max_horizon=('horizon', 'max'),
+        reached_now=('horizon', lambda h: int((h == 0).sum())),
+        unreachable=('reachable', lambda r: int((~r).sum())),
+    ).reset_index()
+    categories['reachable_share'] = 1 - categories['unreachable'] / categories['detail_count']
+
+    return {'details': details, 'categories': categories}
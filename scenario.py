@@ -0,0 +1,245 @@
+import os
+import re
+import json
+from itertools import combinations
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ingest import COUNTRY_CODES, SCOPE_TYPES
+
+# ===== What-if 시나리오 시뮬레이터 =====
+SCENARIO_DIR = os.environ.get('TRACKER_SCENARIO_DIR', 'scenarios')
+
+COUNTRY_NAMES = ['한국', '중국', '일본', '미국', 'EU']  # COUNTRY_CODES 순서
+GROUP_LABELS = ['선도', '추격', '후발']  # pandas mode 동률 시 정렬 순서와 동일
+# 공동 최고보유국 표기 (COUNTRY_NAMES 순서, 공백 구분 — 예: '미국 EU')
+TIE_LABELS = [' '.join(combo) for r in range(1, len(COUNTRY_NAMES) + 1)
+              for combo in combinations(COUNTRY_NAMES, r)]
+
+TARGET_SCOPE = '범위'
+TARGET_CATEGORY = '중분류'
+TARGET_DETAIL = '세부기술'
+
+
+def build_scenario_base(df):
+    """세부기술 DF → 시나리오 계산용 배열 묶음 (데이터 버전당 1회)"""
+    categories, cat_idx = np.unique(df['tech_category'].astype(str).to_numpy(), return_inverse=True)
+    level = np.column_stack([df[f'{c}_tech_level'].to_numpy(dtype='float64') for c in COUNTRY_CODES])
+    gap = np.column_stack([df[f'{c}_tech_gap'].to_numpy(dtype='float64') for c in COUNTRY_CODES])
+
+    group_map = {g: i for i, g in enumerate(GROUP_LABELS)}
+    group = df['kr_tech_group'].map(group_map).fillna(-1).to_numpy(dtype='int64')
+
+    # 그룹 재판정 기준: 조사연도별 원래 그룹의 한국 기술수준 중앙값 (행마다 GROUP_LABELS 순서 (n, 3))
+    years = df['survey_year'].fillna(-1).to_numpy() if 'survey_year' in df.columns else np.zeros(len(df))
+    medians = pd.DataFrame({'year': years, 'group': group, 'level': level[:, 0]})
+    medians = medians[medians['group'] >= 0].groupby(['year', 'group'])['level'].median()
+    group_medians = np.column_stack([
+        medians.reindex(pd.MultiIndex.from_arrays([years, np.full(len(df), g)])).to_numpy(dtype='float64')
+        for g in range(len(GROUP_LABELS))])
+
+    leader_labels = sorted(set(df['leading_country'].dropna().astype(str)) | set(TIE_LABELS))
+    leader_map = {name: i for i, name in enumerate(leader_labels)}
+    leader = df['leading_country'].map(leader_map).fillna(-1).to_numpy(dtype='int64')
+
+    detail_type = df['type'].astype(str).to_numpy()
+    # 중분류 구분은 첫 행 기준 (category_data 의 'first' 집계와 동일)
+    first_rows = np.unique(cat_idx, return_index=True)[1]
+
+    return {
+        'categories': categories,
+        'cat_idx': cat_idx,
+        'details': (df['tech_category'].astype(str) + ' / ' + df['tech_detail'].astype(str)).to_numpy(),
+        'detail_type': detail_type,
+        'category_type': detail_type[first_rows],
+        'level': level,
+        'gap': gap,
+        'group': group,
+        'group_medians': group_medians,
+        'leader': leader,
+        'leader_labels': np.array(leader_labels, dtype=object),
+        # 최고 수준 국가 집합(비트마스크, COUNTRY_NAMES 순서) → 공동 보유국 표기 코드
+        'tie_leader_idx': np.array([-1] + [leader_map[' '.join(n for j, n in enumerate(COUNTRY_NAMES) if bits >> j & 1)]
+                                           for bits in range(1, 2 ** len(COUNTRY_NAMES))]),
+    }
+
+
+def target_options(base):
+    """조정 대상 선택지 — '[범위] 감축기술', '[중분류] 수소제조', '[세부기술] 중분류 / 세부기술'"""
+    return ([f"[{TARGET_SCOPE}] {s}" for s in SCOPE_TYPES] +
+            [f"[{TARGET_CATEGORY}] {c}" for c in base['categories']] +
+            [f"[{TARGET_DETAIL}] {d}" for d in base['details']])
+
+
+def _target_mask(base, target):
+    match = re.match(r'^\[(.+?)\] (.+)$', str(target))
+    if not match:
+        raise ValueError(f"알 수 없는 조정 대상: {target}")
+    kind, name = match.groups()
+    if kind == TARGET_SCOPE:
+        if name not in SCOPE_TYPES:
+            raise ValueError(f"알 수 없는 범위: {name}")
+        type_value = SCOPE_TYPES[name]
+        return np.ones(len(base['cat_idx']), dtype=bool) if type_value is None else base['detail_type'] == type_value
+    if kind == TARGET_CATEGORY:
+        hit = np.flatnonzero(base['categories'] == name)
+        return base['cat_idx'] == hit[0] if len(hit) else np.zeros(len(base['cat_idx']), dtype=bool)
+    if kind == TARGET_DETAIL:
+        return base['details'] == name
+    raise ValueError(f"알 수 없는 조정 대상 종류: {kind}")
+
+
+def _group_mean(values, cat_idx, n_cat):
+    """(n, k) 배열의 중분류별 평균 (NaN 제외) — bincount 기반 벡터 집계"""
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    out = np.empty((n_cat, values.shape[1]))
+    for j in range(values.shape[1]):
+        sums = np.bincount(cat_idx, weights=filled[:, j], minlength=n_cat)
+        counts = np.bincount(cat_idx, weights=valid[:, j], minlength=n_cat)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out[:, j] = sums / counts
+    return out
+
+
+def _group_mode(codes, cat_idx, n_cat, n_labels):
+    """중분류별 최빈 코드 (동률 시 작은 코드, 값 없으면 -1)"""
+    valid = codes >= 0
+    counts = np.zeros((n_cat, n_labels), dtype=np.int64)
+    np.add.at(counts, (cat_idx[valid], codes[valid]), 1)
+    mode = counts.argmax(axis=1)
+    mode[counts.sum(axis=1) == 0] = -1
+    return mode
+
+
+def _top_mask(level):
+    """(행, 국가) 기술수준 → 최고 수준 국가 집합 비트마스크 (값이 모두 없으면 0)"""
+    filled = np.where(np.isnan(level), -np.inf, level)
+    top = (filled == filled.max(axis=1, keepdims=True)) & np.isfinite(filled)
+    return (top * (1 << np.arange(level.shape[1]))).sum(axis=1)
+
+
+def _regroup(group, old_level, new_level, medians):
+    """수준이 바뀐 행의 한국 그룹 재판정 (코드는 GROUP_LABELS 순서 — 0 선도, 1 추격, 2 후발)
+
+    올린 행은 더 높은 그룹의 중앙값을 넘으면 그 그룹으로, 내린 행은 더 낮은 그룹의 중앙값 아래로
+    내려가면 그 그룹으로 옮기고, 그 밖에는 원래 그룹을 유지 (ingest.detect_anomalies 의 불일치 기준과 동일).
+    """
+    out = group.copy()
+    valid = group >= 0
+    codes = np.arange(len(GROUP_LABELS))
+    with np.errstate(invalid='ignore'):
+        above = (codes[None, :] < group[:, None]) & (new_level[:, None] > medians)
+        below = (codes[None, :] > group[:, None]) & (new_level[:, None] < medians)
+    up = valid & (new_level > old_level) & above.any(axis=1)
+    down = valid & (new_level < old_level) & below.any(axis=1)
+    out[up] = np.argmax(above[up], axis=1)                                    # 넘은 그룹 중 가장 높은 그룹
+    out[down] = len(codes) - 1 - np.argmax(below[down][:, ::-1], axis=1)      # 내려간 그룹 중 가장 낮은 그룹
+    return out
+
+
+def apply_scenario(base, adjustments):
+    """조정 목록을 적용해 세부기술 배열과 중분류 집계를 재계산
+
+    adjustments: [{'target': '[중분류] 수소제조', 'country': 'kr', 'level_delta': 0.0, 'gap_delta': -1.0}, ...]
+    반환: (중분류 DF, 세부기술 배열 dict)
+    """
+    level = base['level'].copy()
+    gap = base['gap'].copy()
+    touched = np.zeros(len(base['cat_idx']), dtype=bool)
+
+    for adj in adjustments:
+        mask = _target_mask(base, adj['target'])
+        col = COUNTRY_CODES.index(adj.get('country', 'kr'))
+        level[mask, col] += float(adj.get('level_delta') or 0.0)
+        gap[mask, col] += float(adj.get('gap_delta') or 0.0)
+        touched |= mask
+
+    np.clip(level, 0.0, 100.0, out=level)
+    np.maximum(gap, 0.0, out=gap)
+
+    # 기술수준이 실제로 바뀐 행만 한국 그룹 · 최고보유국 재판정 (격차만 조정하거나 0 조정이면 원래 표기 유지)
+    group = base['group'].copy()
+    leader = base['leader'].copy()
+    moved = touched & ~np.all((level == base['level']) | (np.isnan(level) & np.isnan(base['level'])), axis=1)
+    if moved.any():
+        group[moved] = _regroup(base['group'][moved], base['level'][moved, 0], level[moved, 0],
+                                base['group_medians'][moved])
+        # 최고 수준 국가 구성이 바뀐 행만 새 표기 (공동 보유는 '미국 EU' 형식)
+        old_top, new_top = _top_mask(base['level'][moved]), _top_mask(level[moved])
+        changed = np.flatnonzero(moved)[old_top != new_top]
+        leader[changed] = base['tie_leader_idx'][new_top[old_top != new_top]]
+
+    n_cat = len(base['categories'])
+    cat_level = _group_mean(level, base['cat_idx'], n_cat)
+    cat_gap = _group_mean(gap, base['cat_idx'], n_cat)
+    cat_group = _group_mode(group, base['cat_idx'], n_cat, len(GROUP_LABELS))
+    cat_leader = _group_mode(leader, base['cat_idx'], n_cat, len(base['leader_labels']))
+
+    frame = {'tech_category': base['categories'], 'type': base['category_type']}
+    for j, code in enumerate(COUNTRY_CODES):
+        frame[f'{code}_tech_level'] = cat_level[:, j]
+        frame[f'{code}_tech_gap'] = cat_gap[:, j]
+    frame['kr_tech_group'] = np.where(cat_group >= 0, np.array(GROUP_LABELS, dtype=object)[cat_group], 'N/A')
+    frame['leading_country'] = np.where(cat_leader >= 0, base['leader_labels'][cat_leader], 'N/A')
+    frame['detail_count'] = np.bincount(base['cat_idx'], minlength=n_cat)
+    # 중분류별 한국 순위 (5개국 중, 기술수준 기준)
+    frame['kr_rank'] = 1 + (np.nan_to_num(cat_level[:, 1:], nan=-np.inf) > cat_level[:, [0]]).sum(axis=1)
+
+    return pd.DataFrame(frame), {'level': level, 'gap': gap, 'group': group, 'leader': leader, 'touched': touched}
+
+
+def scenario_kpis(category_frame, scope):
+    """메인 대시보드 핵심지표를 범위 기준으로 계산"""
+    type_value = SCOPE_TYPES[scope]
+    data = category_frame if type_value is None else category_frame[category_frame['type'] == type_value]
+    levels = np.array([data[f'{c}_tech_level'].mean() for c in COUNTRY_CODES])
+    gaps = np.array([data[f'{c}_tech_gap'].mean() for c in COUNTRY_CODES])
+    return {
+        'avg_levels': levels,
+        'avg_gaps': gaps,
+        'avg_kr_level': float(levels[0]),
+        'avg_kr_gap': float(gaps[0]),
+        'kr_rank': int(1 + (np.nan_to_num(levels[1:], nan=-np.inf) > levels[0]).sum()),
+        'leading_count': int((data['kr_tech_group'] == '선도').sum()),
+        'total_count': int(len(data)),
+        'best_category': data.loc[data['kr_tech_level'].idxmax(), 'tech_category'] if len(data) else '–',
+    }
+
+
+# ----- 시나리오 저장/불러오기 (로컬 JSON 파일) -----
+def _scenario_file(name, directory):
+    safe = re.sub(r'[\\/:*?"<>|\s]+', '_', name.strip()) or 'scenario'
+    return os.path.join(directory, f"{safe}.json")
+
+
+def save_scenario(name, adjustments, directory=SCENARIO_DIR):
+    os.makedirs(directory, exist_ok=True)
+    path = _scenario_file(name, directory)
+    payload = {'name': name.strip(), 'saved_at': datetime.now().isoformat(timespec='seconds'),
+               'adjustments': adjustments}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def list_scenarios(directory=SCENARIO_DIR):
+    if not os.path.isdir(directory):
+        return []
+    names = []
+    for file_name in sorted(os.listdir(directory)):
+        if not file_name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, file_name), encoding='utf-8') as f:
+                names.append(json.load(f).get('name') or file_name[:-5])
+        except (OSError, ValueError):
+            continue
+    return names
+
+
+def load_scenario(name, directory=SCENARIO_DIR):
+    with open(_scenario_file(name, directory), encoding='utf-8') as f:
+        return json.load(f).get('adjustments', [])
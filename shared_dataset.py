@@ -0,0 +1,103 @@
+import os
+import time
+import shutil
+
+import numpy as np
+
+from ingest import CACHE_DIR
+
+# ===== 워커 프로세스 간 공유 데이터셋 (메모리 매핑 Arrow IPC 파일) =====
+# 한 프로세스가 데이터 버전별로 1회 기록하면, 나머지 워커는 파싱 없이 읽기 전용으로 매핑해 사용.
+# 숫자/문자열 컬럼은 매핑된 페이지를 그대로 참조하므로 워커당 추가 메모리가 거의 없음.
+SHARED_DIR = os.environ.get('TRACKER_SHARED_DIR', os.path.join(CACHE_DIR, 'shared'))
+# 이 시간(초) 동안 기록 · 매핑이 없던 버전만 정리 — 배포 · 데이터 교체 중 구/신 버전 워커가 서로의 파일을 지우지 않도록
+PRUNE_GRACE_SECONDS = float(os.environ.get('TRACKER_SHARED_PRUNE_GRACE', '3600'))
+
+
+def shared_path(data_version, name, shared_dir=SHARED_DIR):
+    return os.path.join(shared_dir, str(data_version), f"{name}.arrow")
+
+
+def _to_arrow_table(df):
+    """DataFrame → Arrow Table (float 컬럼은 NaN을 null로 바꾸지 않아 zero-copy 복원 가능)"""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, name in enumerate(table.column_names):
+        if df[name].dtype == np.float64:
+            table = table.set_column(i, name, pa.array(df[name].to_numpy(), from_pandas=False))
+    return table
+
+
+def publish_frame(df, data_version, name, shared_dir=SHARED_DIR):
+    """DataFrame을 공유 Arrow 파일로 기록 (임시 파일 → rename 으로 원자적 교체)"""
+    import pyarrow as pa
+
+    path = shared_path(data_version, name, shared_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = _to_arrow_table(df)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    return path
+
+
+def attach_frame(data_version, name, shared_dir=SHARED_DIR):
+    """공유 Arrow 파일을 메모리 매핑해 읽기 전용 DataFrame으로 반환 (없으면 None)"""
+    import pyarrow as pa
+
+    path = shared_path(data_version, name, shared_dir)
+    if not os.path.exists(path):
+        return None
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    # split_blocks: 컬럼별 블록 유지 → 결측 없는 숫자 컬럼은 복사 없이 매핑 메모리 참조
+    df = table.to_pandas(split_blocks=True)
+    df.attrs['shared_path'] = path
+    _touch(os.path.dirname(path))
+    return df
+
+
+def _touch(path):
+    # 버전 디렉터리 mtime = 마지막 기록 · 매핑 시각 (정리 대상 판단용)
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_versions(data_version, shared_dir=SHARED_DIR, grace=PRUNE_GRACE_SECONDS):
+    """현재 버전 외에 grace 초 넘게 기록 · 매핑이 없던 공유 디렉터리 삭제
+
+    이미 매핑한 워커는 (POSIX) 삭제 후에도 기존 매핑을 계속 사용한다.
+    """
+    try:
+        names = os.listdir(shared_dir)
+    except OSError:
+        return []
+    cutoff = time.time() - grace
+    removed = []
+    for name in names:
+        path = os.path.join(shared_dir, name)
+        if name == str(data_version) or not os.path.isdir(path):
+            continue
+        try:
+            stale = os.path.getmtime(path) < cutoff
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(name)
+    return removed
+
+
+def attach_or_publish(data_version, name, build, shared_dir=SHARED_DIR):
+    """공유 파일이 있으면 매핑, 없으면 build()로 만든 뒤 기록하고 매핑해 반환 (기록 후 오래된 버전 정리)"""
+    df = attach_frame(data_version, name, shared_dir)
+    if df is not None:
+        return df
+    publish_frame(build(), data_version, name, shared_dir)
+    prune_versions(data_version, shared_dir)
+    return attach_frame(data_version, name, shared_dir)
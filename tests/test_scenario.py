@@ -0,0 +1,85 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import COUNTRY_CODES
+from scenario import build_scenario_base, apply_scenario
+
+
+def _survey_frame():
+    # 조사 라벨은 고정 기준(90/70)과 맞지 않음: 97.5 추격, 80 후발, 공동 보유국 표기 포함
+    rows = [
+        ('감축', '수소', 'a', 97.5, '추격', '미국 EU', [100, 100]),
+        ('감축', '수소', 'b', 80.0, '후발', '미국', [100, 95]),
+        ('감축', '수소', 'c', 69.0, '추격', '일본 미국', [100, 90]),
+        ('적응', '물', 'd', 95.0, '선도', '미국\nEU', [100, 100]),
+        ('적응', '물', 'e', 70.0, '후발', 'EU', [98, 100]),
+        ('적응', '물', 'f', 82.0, '추격', '미국', [100, 97]),
+    ]
+    records = []
+    for type_, category, detail, kr, group, leader, (us, eu) in rows:
+        record = {'type': type_, 'tech_category': category, 'tech_detail': detail, 'survey_year': 2020,
+                  'kr_tech_group': group, 'leading_country': leader}
+        levels = {'kr': kr, 'cn': 75.0, 'jp': 88.0, 'us': us, 'eu': eu}
+        for code in COUNTRY_CODES:
+            record[f'{code}_tech_level'] = levels[code]
+            record[f'{code}_tech_gap'] = round((100 - levels[code]) / 10, 1)
+        records.append(record)
+    return pd.DataFrame(records)
+
+
+@pytest.fixture
+def base():
+    return build_scenario_base(_survey_frame())
+
+
+@pytest.mark.parametrize('adjustments', [
+    [],
+    [{'target': '[범위] 전체', 'country': 'kr', 'level_delta': 0.0, 'gap_delta': 0.0}],
+    [{'target': '[범위] 전체', 'country': 'us', 'level_delta': None, 'gap_delta': None}],
+])
+def test_noop_adjustment_reproduces_baseline(base, adjustments):
+    frame, details = apply_scenario(base, adjustments)
+    baseline, _ = apply_scenario(base, [])
+    pd.testing.assert_frame_equal(frame, baseline)
+    np.testing.assert_array_equal(details['group'], base['group'])
+    np.testing.assert_array_equal(details['level'], base['level'])
+    np.testing.assert_array_equal(details['gap'], base['gap'])
+
+
+def test_gap_only_adjustment_keeps_labels(base):
+    frame, details = apply_scenario(base, [{'target': '[범위] 전체', 'country': 'kr', 'gap_delta': -1.0}])
+    baseline, _ = apply_scenario(base, [])
+    np.testing.assert_array_equal(details['group'], base['group'])
+    pd.testing.assert_series_equal(frame['kr_tech_group'], baseline['kr_tech_group'])
+    pd.testing.assert_series_equal(frame['leading_country'], baseline['leading_country'])
+
+
+def test_level_change_regroups_against_group_medians(base):
+    # 후발 80 → 96: 선도 중앙값(95) 초과 → 선도, 다른 행은 원래 그룹 유지
+    _, details = apply_scenario(base, [{'target': '[세부기술] 수소 / b', 'country': 'kr', 'level_delta': 16.0}])
+    assert details['group'][1] == 0
+    assert (details['group'][[0, 2, 3, 4, 5]] == base['group'][[0, 2, 3, 4, 5]]).all()
+
+    # 추격 82 → 81: 후발 중앙값(75) 위 → 추격 유지
+    _, details = apply_scenario(base, [{'target': '[세부기술] 물 / f', 'country': 'kr', 'level_delta': -1.0}])
+    assert details['group'][5] == base['group'][5]
+
+
+def test_leader_keeps_tie_labels(base):
+    # 한국 수준만 조금 올려도 최고 수준 국가 구성이 같으면 원래 공동 보유국 표기 유지
+    frame, _ = apply_scenario(base, [{'target': '[중분류] 물', 'country': 'kr', 'level_delta': 1.0}])
+    baseline, _ = apply_scenario(base, [])
+    pd.testing.assert_series_equal(frame['leading_country'], baseline['leading_country'])
+
+    # EU 를 미국과 같은 수준으로 올리면 공동 표기, 미국을 내리면 EU 단독
+    labels = base['leader_labels']
+    _, details = apply_scenario(base, [{'target': '[세부기술] 수소 / b', 'country': 'eu', 'level_delta': 5.0}])
+    assert labels[details['leader'][1]] == '미국 EU'
+    _, details = apply_scenario(base, [{'target': '[세부기술] 물 / d', 'country': 'us', 'level_delta': -1.0}])
+    assert labels[details['leader'][3]] == 'EU'
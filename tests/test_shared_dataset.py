@@ -0,0 +1,49 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_dataset import attach_or_publish, shared_path
+
+
+FRAME = pd.DataFrame({'tech_category': ['태양광', '수소'], 'kr_tech_level': [90.0, float('nan')]})
+
+
+class CountingBuild:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return FRAME
+
+
+def test_alternating_versions_keep_each_others_files(tmp_path):
+    # 배포 중 구/신 버전 워커가 번갈아 호출해도 서로의 파일을 지우지 않음 → 두 번째 호출부터 매핑만
+    shared_dir = str(tmp_path)
+    builds = {'v1': CountingBuild(), 'v2': CountingBuild()}
+    for _ in range(3):
+        for version, build in builds.items():
+            df = attach_or_publish(version, 'dataset', build, shared_dir)
+            assert df.attrs['shared_path'] == shared_path(version, 'dataset', shared_dir)
+            pd.testing.assert_frame_equal(df, FRAME)
+
+    assert {v: b.calls for v, b in builds.items()} == {'v1': 1, 'v2': 1}
+    assert sorted(os.listdir(shared_dir)) == ['v1', 'v2']
+
+
+def test_publish_prunes_stale_versions(tmp_path):
+    shared_dir = str(tmp_path)
+    old = attach_or_publish('v1', 'dataset', CountingBuild(), shared_dir)
+    stale = time.time() - 2 * 24 * 3600
+    os.utime(os.path.join(shared_dir, 'v1'), (stale, stale))
+
+    df = attach_or_publish('v2', 'dataset', CountingBuild(), shared_dir)
+
+    assert sorted(os.listdir(shared_dir)) == ['v2']
+    pd.testing.assert_frame_equal(df, FRAME)
+    # 이전 버전을 매핑해 둔 DF 는 디렉터리 삭제 후에도 읽을 수 있음
+    pd.testing.assert_frame_equal(old, FRAME)
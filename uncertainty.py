@@ -0,0 +1,107 @@
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from ingest import COUNTRY_CODES, SCOPE_TYPES
+
+# ===== 중분류 평균의 부트스트랩 신뢰구간 =====
+BOOTSTRAP_RESAMPLES = int(os.environ.get('TRACKER_BOOTSTRAP_RESAMPLES', '2000'))
+CI_LEVEL = 0.95
+CI_METRICS = ('tech_level', 'tech_gap')
+
+# 재표본 블록 크기 (원소 수 기준) — 블록 단위로 시드를 나눠 워커 수와 무관하게 같은 결과
+CHUNK_ELEMENTS = 4_000_000
+# 전체 재표본 원소 수가 이 값 이상이면 프로세스 병렬 처리
+PARALLEL_MIN_ELEMENTS = 40_000_000
+
+
+def ci_columns(code, metric):
+    return f'{code}_{metric}_ci_low', f'{code}_{metric}_ci_high'
+
+
+def _resample_means(values, row_start, row_size, starts, n_resamples, seed):
+    """중분류 내 복원추출 n_resamples회 → (B, 중분류, 지표) 평균 배열
+
+    values 는 중분류 순으로 정렬된 (행, 지표) 배열, starts 는 중분류별 시작 행.
+    모든 중분류·국가·지표를 한 번의 인덱싱 + reduceat 으로 계산한다.
+    """
+    rng = np.random.default_rng(seed)
+    picks = row_start + (rng.random((n_resamples, len(row_start))) * row_size).astype(np.int64)
+    sample = values[picks]                      # (B, 행, 지표)
+    valid = ~np.isnan(sample)
+    sums = np.add.reduceat(np.where(valid, sample, 0.0), starts, axis=1)
+    counts = np.add.reduceat(valid, starts, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def bootstrap_category_ci(df, n_resamples=BOOTSTRAP_RESAMPLES, level=CI_LEVEL, seed=0, max_workers=None):
+    """세부기술 DF → 중분류 × 국가 × 지표 부트스트랩 신뢰구간
+
+    반환: {'category': 중분류별 DF, 'scope': 범위(전체/감축기술/적응기술)별 DF,
+           'n_resamples', 'level'}
+    범위 구간은 재표본별 중분류 평균을 다시 평균내어 계산 (막대그래프 값과 같은 정의).
+    유효 세부기술이 2개 미만인 중분류·지표는 구간을 계산하지 않는다(NaN).
+    """
+    value_cols = [f'{code}_{metric}' for code in COUNTRY_CODES for metric in CI_METRICS]
+    categories, cat_idx = np.unique(df['tech_category'].astype(str).to_numpy(), return_inverse=True)
+    order = np.argsort(cat_idx, kind='stable')
+    values = df[value_cols].to_numpy(dtype='float64')[order]
+    sorted_idx = cat_idx[order]
+
+    sizes = np.bincount(sorted_idx, minlength=len(categories))
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    row_start, row_size = starts[sorted_idx], sizes[sorted_idx]
+    category_type = df['type'].astype(str).to_numpy()[order][starts]
+
+    # 고정 크기 블록으로 분할 — 블록별 독립 시드
+    per_chunk = max(1, CHUNK_ELEMENTS // max(1, values.size))
+    chunk_sizes = [min(per_chunk, n_resamples - i) for i in range(0, n_resamples, per_chunk)]
+    seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    jobs = [(values, row_start, row_size, starts, n, s) for n, s in zip(chunk_sizes, seeds)]
+
+    workers = max_workers or os.cpu_count() or 1
+    if len(jobs) > 1 and workers > 1 and n_resamples * values.size >= PARALLEL_MIN_ELEMENTS:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            parts = list(pool.map(_resample_means, *zip(*jobs)))
+    else:
+        parts = [_resample_means(*job) for job in jobs]
+    means = np.concatenate(parts, axis=0)        # (B, 중분류, 지표)
+
+    alpha = (1 - level) / 2
+    with warnings.catch_warnings():
+        # 값이 전혀 없는 중분류·지표(All-NaN)는 NaN 구간으로 둠
+        warnings.simplefilter('ignore', RuntimeWarning)
+        low, high = np.nanquantile(means, [alpha, 1 - alpha], axis=0)
+    valid_counts = np.add.reduceat(~np.isnan(values), starts, axis=0)
+    low[valid_counts < 2] = np.nan
+    high[valid_counts < 2] = np.nan
+
+    category = {'tech_category': categories, 'type': category_type, 'detail_count': sizes}
+    for j, col in enumerate(value_cols):
+        category[f'{col}_ci_low'] = low[:, j]
+        category[f'{col}_ci_high'] = high[:, j]
+
+    scope_rows = {}
+    for scope, type_value in SCOPE_TYPES.items():
+        mask = np.ones(len(categories), dtype=bool) if type_value is None else category_type == type_value
+        row = {}
+        if mask.any():
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                scope_means = np.nanmean(means[:, mask, :], axis=1)
+                scope_low, scope_high = np.nanquantile(scope_means, [alpha, 1 - alpha], axis=0)
+            for j, col in enumerate(value_cols):
+                row[f'{col}_ci_low'] = scope_low[j]
+                row[f'{col}_ci_high'] = scope_high[j]
+        scope_rows[scope] = row
+
+    return {
+        'category': pd.DataFrame(category),
+        'scope': pd.DataFrame.from_dict(scope_rows, orient='index'),
+        'n_resamples': n_resamples,
+        'level': level,
+    }